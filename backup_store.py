@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Backup-Speicher für das Flashcard-Projekt.
+Speichert Sicherungen inhaltsadressiert (SHA-256) und gzip-komprimiert, überspringt
+unveränderte Stände und dünnt alte Sicherungen nach einer gestaffelten
+Aufbewahrungsrichtlinie aus. Sicherungen laufen in einem eigenen Hintergrund-Thread.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import logging
+import queue
+import shutil
+import threading
+import datetime
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
+
+MANIFEST_FILE = 'manifest.json'
+OBJECTS_DIR = 'objects'
+
+# Quelle einer Sicherung: Dateipfad oder Funktion, die den Inhalt als Bytes liefert
+BackupSource = Union[str, Callable[[], bytes]]
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Gestaffelte Aufbewahrung: die letzten N Sicherungen, danach je eine pro Stunde,
+    pro Tag und pro Woche für die angegebene Anzahl Zeiträume. Angeheftete Sicherungen
+    werden je Name bis zur Obergrenze keep_pinned (die neuesten) zusätzlich behalten.
+    """
+    keep_last: int = 10
+    hourly: int = 24
+    daily: int = 14
+    weekly: int = 8
+    keep_pinned: int = 20
+
+
+class BackupStore:
+    """
+    Inhaltsadressierter Backup-Speicher.
+
+    Jeder Stand wird einmal als objects/<sha256>.gz abgelegt; das Manifest enthält
+    die Einträge (Name, Zeitpunkt, Grund, Hash). Identische Inhalte teilen sich ein Objekt.
+    """
+
+    def __init__(self, root_dir: str, policy: Optional[RetentionPolicy] = None):
+        """
+        Initialisiert den Backup-Speicher.
+
+        Args:
+            root_dir (str): Verzeichnis des Speichers.
+            policy (Optional[RetentionPolicy]): Aufbewahrungsrichtlinie.
+        """
+        self.root_dir = root_dir
+        self.objects_dir = os.path.join(root_dir, OBJECTS_DIR)
+        self.manifest_path = os.path.join(root_dir, MANIFEST_FILE)
+        self.policy = policy or RetentionPolicy()
+        self.lock = threading.RLock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.entries: List[Dict] = self._load_manifest()
+
+        # Hintergrund-Worker; mehrfach angeforderte Sicherungen desselben Namens werden zusammengefasst
+        self._queue: "queue.Queue" = queue.Queue()
+        self._pending: Dict[str, tuple] = {}
+        self._pending_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    # -------------------------------------------------------------------------
+    # MANIFEST
+    # -------------------------------------------------------------------------
+
+    def _load_manifest(self) -> List[Dict]:
+        if not os.path.exists(self.manifest_path):
+            return []
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error(f"Backup-Manifest {self.manifest_path} konnte nicht gelesen werden: {e}")
+            return []
+
+    def _save_manifest(self):
+        temp_file_path = self.manifest_path + ".tmp"
+        with open(temp_file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        shutil.move(temp_file_path, self.manifest_path)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, f"{digest}.gz")
+
+    # -------------------------------------------------------------------------
+    # SICHERN
+    # -------------------------------------------------------------------------
+
+    def add(self, name: str, content: bytes, reason: str = "auto", pinned: bool = False) -> Optional[Dict]:
+        """
+        Legt einen Stand synchron ab.
+
+        Args:
+            name (str): Art der Sicherung (z.B. "flashcards", "themes").
+            content (bytes): Der zu sichernde Inhalt.
+            reason (str): Anlass der Sicherung.
+            pinned (bool): Angeheftete Sicherungen werden beim Ausdünnen bis zur Obergrenze
+                keep_pinned der Richtlinie behalten.
+
+        Returns:
+            Optional[Dict]: Der neue Manifest-Eintrag oder None, wenn sich der Inhalt
+            seit der letzten Sicherung dieses Namens nicht geändert hat bzw. (angeheftet)
+            bereits angeheftet gesichert ist.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        with self.lock:
+            latest = self.latest(name)
+            if pinned:
+                if any(e['name'] == name and e['hash'] == digest and e.get('pinned') for e in self.entries):
+                    logging.debug(f"Backup '{name}': Inhalt bereits angeheftet gesichert ({digest[:12]}), übersprungen.")
+                    return None
+                if latest and latest['hash'] == digest:
+                    # Unveränderter Stand: die vorhandene Sicherung anheften statt einen neuen Eintrag anzulegen
+                    latest['pinned'] = True
+                    latest['reason'] = reason
+                    self._save_manifest()
+                    logging.info(f"Backup '{name}' ({reason}): vorhandene Sicherung {latest['id']} angeheftet.")
+                    return None
+            elif latest and latest['hash'] == digest:
+                logging.debug(f"Backup '{name}': Inhalt unverändert ({digest[:12]}), übersprungen.")
+                return None
+
+            object_path = self._object_path(digest)
+            if not os.path.exists(object_path):
+                temp_file_path = object_path + ".tmp"
+                with gzip.open(temp_file_path, 'wb', compresslevel=6) as f:
+                    f.write(content)
+                shutil.move(temp_file_path, object_path)
+
+            now = datetime.datetime.now()
+            entry = {
+                'id': f"{name}_{now.strftime('%Y%m%d_%H%M%S_%f')}",
+                'name': name,
+                'timestamp': now.isoformat(),
+                'reason': reason,
+                'hash': digest,
+                'size': len(content),
+                'compressed_size': os.path.getsize(object_path),
+                'pinned': pinned,
+            }
+            self.entries.append(entry)
+            self._prune_locked(now)
+            self._save_manifest()
+        logging.info(f"Backup '{name}' ({reason}) gespeichert: {digest[:12]}, {len(content)} Bytes.")
+        return entry
+
+    def add_file(self, name: str, file_path: str, reason: str = "auto", pinned: bool = False) -> Optional[Dict]:
+        """Legt den aktuellen Inhalt einer Datei synchron ab."""
+        if not os.path.exists(file_path):
+            logging.debug(f"Backup '{name}': Datei {file_path} existiert nicht, kein Backup erstellt.")
+            return None
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        return self.add(name, content, reason, pinned)
+
+    def submit(self, name: str, source: BackupSource, reason: str = "auto", pinned: bool = False):
+        """
+        Plant eine Sicherung im Hintergrund-Thread ein.
+
+        Die Quelle wird erst im Worker gelesen. Liegt für denselben Namen bereits
+        eine Anforderung in der Warteschlange, wird sie durch die neue ersetzt.
+
+        Args:
+            name (str): Art der Sicherung.
+            source (BackupSource): Dateipfad oder Funktion, die den Inhalt liefert.
+            reason (str): Anlass der Sicherung.
+            pinned (bool): Ob die Sicherung angeheftet wird.
+        """
+        with self._pending_lock:
+            already_queued = name in self._pending
+            previous = self._pending.get(name)
+            # Ein angehefteter Auftrag bleibt angeheftet, auch wenn er ersetzt wird
+            if previous and previous[2]:
+                pinned, reason = True, previous[1]
+            self._pending[name] = (source, reason, pinned)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="BackupWorker", daemon=True)
+                self._worker.start()
+        if not already_queued:
+            self._queue.put(name)
+
+    def _run_worker(self):
+        while True:
+            name = self._queue.get()
+            try:
+                with self._pending_lock:
+                    job = self._pending.pop(name, None)
+                if job is None:
+                    continue
+                source, reason, pinned = job
+                if callable(source):
+                    self.add(name, source(), reason, pinned)
+                else:
+                    self.add_file(name, source, reason, pinned)
+            except Exception as e:
+                logging.error(f"Hintergrund-Backup '{name}' fehlgeschlagen: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    def wait(self):
+        """Wartet, bis alle eingeplanten Sicherungen geschrieben sind."""
+        self._queue.join()
+
+    # -------------------------------------------------------------------------
+    # DURCHSUCHEN / WIEDERHERSTELLEN
+    # -------------------------------------------------------------------------
+
+    def list_snapshots(self, name: Optional[str] = None) -> List[Dict]:
+        """Gibt die Manifest-Einträge (neueste zuerst) zurück, optional nach Name gefiltert."""
+        with self.lock:
+            entries = [dict(e) for e in self.entries if name is None or e['name'] == name]
+        return sorted(entries, key=lambda e: e['timestamp'], reverse=True)
+
+    def latest(self, name: str) -> Optional[Dict]:
+        """Gibt den neuesten Eintrag eines Namens zurück."""
+        with self.lock:
+            for entry in reversed(self.entries):
+                if entry['name'] == name:
+                    return entry
+        return None
+
+    def get(self, snapshot_id: str) -> Optional[Dict]:
+        with self.lock:
+            for entry in self.entries:
+                if entry['id'] == snapshot_id:
+                    return dict(entry)
+        return None
+
+    def read(self, snapshot_id: str) -> bytes:
+        """
+        Liest den Inhalt einer Sicherung.
+
+        Raises:
+            KeyError: Wenn die Sicherung nicht existiert.
+        """
+        entry = self.get(snapshot_id)
+        if entry is None:
+            raise KeyError(snapshot_id)
+        with gzip.open(self._object_path(entry['hash']), 'rb') as f:
+            return f.read()
+
+    def delete(self, snapshot_id: str) -> bool:
+        """Entfernt eine Sicherung aus dem Manifest (und das Objekt, falls nicht mehr referenziert)."""
+        with self.lock:
+            remaining = [e for e in self.entries if e['id'] != snapshot_id]
+            if len(remaining) == len(self.entries):
+                return False
+            self.entries = remaining
+            self._remove_unreferenced_objects()
+            self._save_manifest()
+        return True
+
+    # -------------------------------------------------------------------------
+    # AUFBEWAHRUNG
+    # -------------------------------------------------------------------------
+
+    def prune(self) -> int:
+        """Dünnt alle Sicherungen nach der Aufbewahrungsrichtlinie aus. Gibt die Anzahl entfernter Einträge zurück."""
+        with self.lock:
+            removed = self._prune_locked(datetime.datetime.now())
+            self._save_manifest()
+        return removed
+
+    def _prune_locked(self, now: datetime.datetime) -> int:
+        keep_ids = set()
+        names = {e['name'] for e in self.entries}
+        for name in names:
+            entries = sorted((e for e in self.entries if e['name'] == name),
+                             key=lambda e: e['timestamp'], reverse=True)
+            keep_ids.update(e['id'] for e in entries[:self.policy.keep_last])
+            pinned_entries = [e for e in entries if e.get('pinned')]
+            keep_ids.update(e['id'] for e in pinned_entries[:self.policy.keep_pinned])
+
+            tiers = (
+                (self.policy.hourly, datetime.timedelta(hours=1), lambda ts: ts.strftime('%Y%m%d%H')),
+                (self.policy.daily, datetime.timedelta(days=1), lambda ts: ts.strftime('%Y%m%d')),
+                (self.policy.weekly, datetime.timedelta(weeks=1), lambda ts: '%d-%02d' % ts.isocalendar()[:2]),
+            )
+            for count, span, bucket_of in tiers:
+                cutoff = now - span * count
+                seen_buckets = set()
+                for entry in entries:
+                    ts = datetime.datetime.fromisoformat(entry['timestamp'])
+                    if ts < cutoff:
+                        break
+                    bucket = bucket_of(ts)
+                    if bucket not in seen_buckets:
+                        # neueste Sicherung je Zeitraum behalten
+                        seen_buckets.add(bucket)
+                        keep_ids.add(entry['id'])
+
+        removed = len(self.entries) - len(keep_ids)
+        if removed:
+            self.entries = [e for e in self.entries if e['id'] in keep_ids]
+            self._remove_unreferenced_objects()
+            logging.info(f"Backup-Aufbewahrung: {removed} alte Sicherungen entfernt.")
+        return removed
+
+    def _remove_unreferenced_objects(self):
+        referenced = {e['hash'] for e in self.entries}
+        for file_name in os.listdir(self.objects_dir):
+            digest = file_name.split('.', 1)[0]
+            if file_name.endswith('.gz') and digest not in referenced:
+                try:
+                    os.remove(os.path.join(self.objects_dir, file_name))
+                except OSError as e:
+                    logging.warning(f"Backup-Objekt {file_name} konnte nicht entfernt werden: {e}")
@@ -16,6 +16,22 @@ from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 import uuid
 
+from leitner_system import level_for_points
+from plan_solver import (PLAN_SOLVER_FLOW, PLAN_SOLVER_GREEDY, flow_session_cards, session_capacities,
+                         solve_day_assignment, typical_session_cards)
+
+# Sammlungen, von denen Scores und Empfehlungen abhängen (Versionszähler des DataManagers)
+SCORE_DEPENDENCIES = ('flashcards', 'stats', 'weekly_plan', 'algorithm_settings')
+
+
+def _clock_key() -> str:
+    """Aktuelle Stunde: Fälligkeiten und Tage seit der letzten Session hängen auch von der Uhrzeit ab."""
+    return datetime.datetime.now().strftime('%Y-%m-%d %H')
+
+
+def _weights_key(weights: Optional[Dict]):
+    return tuple(sorted(weights.items())) if weights is not None else None
+
 
 class CategoryScorer:
     """
@@ -63,6 +79,13 @@ class CategoryScorer:
                 }
             }
         """
+        return self.data_manager.memoize(
+            'category_score', (category, subcategory, date, _weights_key(weights), _clock_key()),
+            SCORE_DEPENDENCIES, lambda: self._calculate_score(category, subcategory, date, weights))
+
+    def _calculate_score(self, category: str, subcategory: str,
+                         date: datetime.date, weights: Optional[Dict] = None) -> Dict:
+        """Berechnet den Score ohne Cache (siehe calculate_score)."""
         # Hole Gewichtungen
         if weights is None:
             weights = self.data_manager.get_algorithm_weights()
@@ -73,7 +96,81 @@ class CategoryScorer:
         rhythm_score = self.calculate_rhythm_score(category, subcategory)
         balance_score = self.calculate_balance_score(category, date)
 
-        # Gewichtete Gesamt-Score
+        # Details sammeln
+        details = self._get_category_details(category, subcategory)
+
+        return self._score_result(weights, urgency_score, efficiency_score, rhythm_score, balance_score, details)
+
+    def score_all(self, pairs, date: datetime.date,
+                  weights: Optional[Dict] = None) -> Dict[Tuple[str, str], Dict]:
+        """
+        Berechnet die Scores vieler Kategorie/Unterkategorie-Paare auf einmal.
+        Liefert dieselben Ergebnisse wie calculate_score je Paar, liest aber Karten, Fälligkeits-Index,
+        Gewichtungen und Wochenplan nur einmal statt einmal pro Paar und Faktor.
+
+        Args:
+            pairs: Iterable von (Kategorie, Unterkategorie)
+            date: Das Datum für die Bewertung
+            weights: Optionale Gewichtungen (sonst aus algorithm_settings)
+
+        Returns:
+            Dict[Tuple[str, str], Dict]: Paar -> Ergebnis wie bei calculate_score. Paare, deren
+            Berechnung fehlschlägt, werden protokolliert und ausgelassen.
+        """
+        if weights is None:
+            weights = self.data_manager.get_algorithm_weights()
+
+        # Ein Durchlauf über die Karten: Anzahl und Level-Summe je Kategorie-Bucket
+        card_counts = defaultdict(int)
+        level_sums = defaultdict(int)
+        for flashcard in list(self.data_manager.flashcards):
+            key = self.data_manager.get_category_key(flashcard.id) if flashcard.id else None
+            if key is None:
+                continue
+            card_counts[key] += 1
+            level_sums[key] += level_for_points(flashcard.leitner_points)
+
+        # Fällige Karten je Bucket (je ein Durchlauf über den Fälligkeits-Index)
+        now = datetime.datetime.now()
+        overdue_by_key = self.leitner_system.count_due_cards_by_key(now - datetime.timedelta(days=1))
+        due_by_key = self.leitner_system.count_due_cards_by_key(now)
+
+        # Geplante Sessions je Kategorie in der Woche des Datums (7 Plan-Abfragen insgesamt)
+        week_counts = self._week_plan_counts(date)
+
+        has_stats = hasattr(self.data_manager, 'stats')
+        rollup = self.data_manager.stats_rollup
+        results = {}
+        for category, subcategory in pairs:
+            if (category, subcategory) in results:
+                continue
+            try:
+                keys = self.data_manager.get_category_keys(category, subcategory)
+                total_cards = sum(card_counts.get(key, 0) for key in keys)
+                overdue = sum(overdue_by_key.get(key, 0) for key in keys)
+                today_due = sum(due_by_key.get(key, 0) for key in keys) - overdue
+                avg_level = sum(level_sums.get(key, 0) for key in keys) / total_cards if total_cards else 1.0
+
+                totals = rollup.totals(category, subcategory)
+                success_rate = totals.success_rate if totals.attempts else 100.0
+                last_session = rollup.last_day(category, subcategory)
+
+                urgency_score = self._urgency_from_counts(total_cards, overdue, today_due)
+                efficiency_score = self._efficiency_from(success_rate, avg_level) if has_stats else 50.0
+                rhythm_score = self._rhythm_from(last_session)
+                balance_score = self._balance_from(week_counts.get(category.lower(), 0))
+
+                details = self._details_from(today_due, overdue, success_rate, avg_level, last_session)
+                results[(category, subcategory)] = self._score_result(
+                    weights, urgency_score, efficiency_score, rhythm_score, balance_score, details)
+            except Exception as e:
+                logging.error(f"Fehler beim Berechnen des Scores für {category}/{subcategory}: {e}")
+        return results
+
+    @staticmethod
+    def _score_result(weights: Dict, urgency_score: float, efficiency_score: float,
+                      rhythm_score: float, balance_score: float, details: Dict) -> Dict:
+        """Gewichteter Gesamt-Score mit Aufschlüsselung."""
         total_score = (
             urgency_score * (weights['dringlichkeit'] / 100) +
             efficiency_score * (weights['effizienz'] / 100) +
@@ -81,9 +178,6 @@ class CategoryScorer:
             balance_score * (weights['ausgeglichenheit'] / 100)
         )
 
-        # Details sammeln
-        details = self._get_category_details(category, subcategory)
-
         return {
             'total_score': round(total_score, 2),
             'breakdown': {
@@ -103,27 +197,17 @@ class CategoryScorer:
             float: Score 0-100
         """
         today = datetime.datetime.now()
-        today_due = 0
-        overdue = 0
-        total_cards = 0
+        total_cards = len(self.data_manager.get_flashcards_in_category(category, subcategory))
 
-        # Filtere Karten nach Kategorie/Unterkategorie
-        for card_id, leitner_card in self.leitner_system.cards.items():
-            if leitner_card.category.lower() != category.lower():
-                continue
-            if leitner_card.subcategory.lower() != subcategory.lower():
-                continue
+        # Fällige und (mindestens einen Tag) überfällige Karten über den Fälligkeits-Index
+        overdue = self.leitner_system.count_due_cards(today - datetime.timedelta(days=1), category, subcategory)
+        today_due = self.leitner_system.count_due_cards(today, category, subcategory) - overdue
 
-            total_cards += 1
-
-            # Prüfe ob fällig oder überfällig
-            if leitner_card.next_review_date <= today:
-                days_overdue = (today - leitner_card.next_review_date).days
-                if days_overdue > 0:
-                    overdue += 1
-                else:
-                    today_due += 1
+        return self._urgency_from_counts(total_cards, overdue, today_due)
 
+    @staticmethod
+    def _urgency_from_counts(total_cards: int, overdue: int, today_due: int) -> float:
+        """Dringlichkeits-Score aus Kartenzahl, überfälligen und heute fälligen Karten."""
         if total_cards == 0:
             return 0.0
 
@@ -149,7 +233,11 @@ class CategoryScorer:
 
         success_rate = self._get_success_rate(category, subcategory)
         avg_level = self._get_average_level(category, subcategory)
+        return self._efficiency_from(success_rate, avg_level)
 
+    @staticmethod
+    def _efficiency_from(success_rate: float, avg_level: float) -> float:
+        """Effizienz-Score aus Erfolgsquote und durchschnittlichem Level."""
         # Erfolgsquoten-basierter Score (invers: niedrig = mehr Übung nötig)
         if success_rate < 60:
             success_score = 100
@@ -178,8 +266,11 @@ class CategoryScorer:
         Returns:
             float: Score 0-100
         """
-        last_session_date = self._get_last_session_date(category, subcategory)
+        return self._rhythm_from(self._get_last_session_date(category, subcategory))
 
+    @staticmethod
+    def _rhythm_from(last_session_date: Optional[datetime.date]) -> float:
+        """Lernrhythmus-Score aus dem Datum der letzten Session."""
         if last_session_date is None:
             return 100  # Noch nie gelernt = höchste Priorität
 
@@ -209,18 +300,23 @@ class CategoryScorer:
         Returns:
             float: Score 0-100
         """
+        return self._balance_from(self._week_plan_counts(date).get(category.lower(), 0))
+
+    def _week_plan_counts(self, date: datetime.date) -> Dict[str, int]:
+        """Zählt, wie oft jede Kategorie (kleingeschrieben) in der Woche des Datums geplant ist."""
         # Hole Wochenstart (Montag)
         week_start = date - datetime.timedelta(days=date.weekday())
 
-        # Zähle, wie oft diese Kategorie in dieser Woche geplant wurde
-        count_this_week = 0
+        counts = defaultdict(int)
         for i in range(7):
             day = week_start + datetime.timedelta(days=i)
-            entries = self.data_manager.get_plan_for_date(day)
-            for entry in entries:
-                if entry['kategorie'].lower() == category.lower():
-                    count_this_week += 1
+            for entry in self.data_manager.get_plan_for_date(day):
+                counts[entry['kategorie'].lower()] += 1
+        return counts
 
+    @staticmethod
+    def _balance_from(count_this_week: int) -> float:
+        """Ausgeglichenheits-Score aus der Anzahl geplanter Sessions dieser Woche."""
         # Weniger = höherer Score (Rotation fördern)
         if count_this_week == 0:
             return 100
@@ -233,40 +329,18 @@ class CategoryScorer:
 
     def _get_success_rate(self, category: str, subcategory: str) -> float:
         """Berechnet die Erfolgsquote für eine Kategorie/Unterkategorie."""
-        stats = self.data_manager.stats
-        if not stats:
-            return 100.0  # Neutral wenn keine Daten
-
-        total_attempts = 0
-        correct_attempts = 0
-
-        for stat in stats:
-            if not isinstance(stat, dict) or 'details' not in stat:
-                continue
-
-            for detail in stat['details']:
-                if not isinstance(detail, dict):
-                    continue
+        totals = self.data_manager.stats_rollup.totals(category, subcategory)
+        if totals.attempts == 0:
+            return 100.0  # Noch keine Versuche (neutral)
 
-                if (detail.get('category', '').lower() == category.lower() and
-                    detail.get('subcategory', '').lower() == subcategory.lower()):
-                    total_attempts += 1
-                    if detail.get('correct', False):
-                        correct_attempts += 1
-
-        if total_attempts == 0:
-            return 100.0  # Noch keine Versuche
-
-        return (correct_attempts / total_attempts * 100)
+        return totals.success_rate
 
     def _get_average_level(self, category: str, subcategory: str) -> float:
         """Berechnet das durchschnittliche Leitner-Level für eine Kategorie/Unterkategorie."""
         levels = []
 
-        for card_id, leitner_card in self.leitner_system.cards.items():
-            if (leitner_card.category.lower() == category.lower() and
-                leitner_card.subcategory.lower() == subcategory.lower()):
-                levels.append(leitner_card.level)
+        for leitner_card in self.leitner_system.get_cards_in_category(category, subcategory):
+            levels.append(leitner_card.level)
 
         if not levels:
             return 1.0  # Default Level 1
@@ -275,59 +349,23 @@ class CategoryScorer:
 
     def _get_last_session_date(self, category: str, subcategory: str) -> Optional[datetime.date]:
         """Findet das Datum der letzten Lernsession für eine Kategorie/Unterkategorie."""
-        stats = self.data_manager.stats
-        if not stats:
-            return None
-
-        last_date = None
-
-        for stat in stats:
-            if not isinstance(stat, dict) or 'details' not in stat or 'date' not in stat:
-                continue
-
-            # Prüfe ob diese Session die Kategorie enthält
-            has_category = False
-            for detail in stat['details']:
-                if not isinstance(detail, dict):
-                    continue
-                if (detail.get('category', '').lower() == category.lower() and
-                    detail.get('subcategory', '').lower() == subcategory.lower()):
-                    has_category = True
-                    break
-
-            if has_category:
-                try:
-                    # Parse Datum (Format: "DD.MM.YYYY")
-                    stat_date = datetime.datetime.strptime(stat['date'], "%d.%m.%Y").date()
-                    if last_date is None or stat_date > last_date:
-                        last_date = stat_date
-                except ValueError:
-                    continue
-
-        return last_date
+        return self.data_manager.stats_rollup.last_day(category, subcategory)
 
     def _get_category_details(self, category: str, subcategory: str) -> Dict:
         """Sammelt detaillierte Informationen über eine Kategorie/Unterkategorie."""
         today = datetime.datetime.now()
-        today_due = 0
-        overdue = 0
-
-        for card_id, leitner_card in self.leitner_system.cards.items():
-            if (leitner_card.category.lower() != category.lower() or
-                leitner_card.subcategory.lower() != subcategory.lower()):
-                continue
-
-            if leitner_card.next_review_date <= today:
-                days_overdue = (today - leitner_card.next_review_date).days
-                if days_overdue > 0:
-                    overdue += 1
-                else:
-                    today_due += 1
+        overdue = self.leitner_system.count_due_cards(today - datetime.timedelta(days=1), category, subcategory)
+        today_due = self.leitner_system.count_due_cards(today, category, subcategory) - overdue
 
         success_rate = self._get_success_rate(category, subcategory)
         avg_level = self._get_average_level(category, subcategory)
         last_session = self._get_last_session_date(category, subcategory)
+        return self._details_from(today_due, overdue, success_rate, avg_level, last_session)
 
+    @staticmethod
+    def _details_from(today_due: int, overdue: int, success_rate: float, avg_level: float,
+                      last_session: Optional[datetime.date]) -> Dict:
+        """Detail-Informationen für das Score-Ergebnis."""
         days_since = None
         if last_session:
             days_since = (datetime.date.today() - last_session).days
@@ -353,6 +391,17 @@ class CategoryScorer:
         Returns:
             List[Dict]: Sortierte Liste mit Empfehlungen
         """
+        learning_set_key = None
+        if learning_set and 'kategorien' in learning_set:
+            learning_set_key = tuple((kat_entry['kategorie'], tuple(kat_entry.get('unterkategorien', [])))
+                                     for kat_entry in learning_set['kategorien'])
+        return self.data_manager.memoize(
+            'top_recommendations', (date, n, learning_set_key, _clock_key()),
+            SCORE_DEPENDENCIES, lambda: self._compute_top_recommendations(date, n, learning_set))
+
+    def _compute_top_recommendations(self, date: datetime.date, n: int,
+                                     learning_set: Optional[Dict]) -> List[Dict]:
+        """Berechnet die Empfehlungen ohne Cache (siehe get_top_recommendations)."""
         scores = []
 
         # Bestimme relevante Kategorien
@@ -369,16 +418,11 @@ class CategoryScorer:
             for card in self.data_manager.flashcards:
                 categories_to_check.add((card.category, card.subcategory))
 
-        # Berechne Scores für alle Kategorien
-        for category, subcategory in categories_to_check:
-            try:
-                score_result = self.calculate_score(category, subcategory, date)
-                score_result['kategorie'] = category
-                score_result['unterkategorie'] = subcategory
-                scores.append(score_result)
-            except Exception as e:
-                logging.error(f"Fehler beim Berechnen des Scores für {category}/{subcategory}: {e}")
-                continue
+        # Berechne Scores für alle Kategorien in einem Durchlauf
+        for (category, subcategory), score_result in self.score_all(categories_to_check, date).items():
+            score_result['kategorie'] = category
+            score_result['unterkategorie'] = subcategory
+            scores.append(score_result)
 
         # Sortiere nach total_score (absteigend)
         scores.sort(key=lambda x: x['total_score'], reverse=True)
@@ -409,7 +453,8 @@ class WeeklyPlanner:
     def auto_plan_week(self, start_date: datetime.date,
                       active_learning_set: Optional[Dict] = None,
                       daily_target: int = 20,
-                      all_learning_sets: Optional[List[Dict]] = None) -> bool:
+                      all_learning_sets: Optional[List[Dict]] = None,
+                      solver: str = PLAN_SOLVER_GREEDY) -> bool:
         """
         Verteilt Sessions intelligent über 7 Tage mit verbesserter Logik.
 
@@ -418,6 +463,8 @@ class WeeklyPlanner:
             active_learning_set: Das primäre Lernset (deprecated, nutze all_learning_sets)
             daily_target: Ziel-Anzahl Karten pro Tag
             all_learning_sets: Liste aller Lernsets des Planers
+            solver: PLAN_SOLVER_GREEDY (Tag für Tag je Kategorie) oder PLAN_SOLVER_FLOW
+                (kostenminimale Zuordnung aller Kategorien, siehe plan_solver)
 
         Returns:
             bool: True wenn erfolgreich
@@ -449,11 +496,8 @@ class WeeklyPlanner:
                 logging.warning("Keine Kategorien in Lernsets gefunden")
                 return False
 
-            # Berechne Scores für alle Kategorien einmalig
-            category_scores = {}
-            for cat, subcat in all_categories:
-                score_result = self.category_scorer.calculate_score(cat, subcat, start_date)
-                category_scores[(cat, subcat)] = score_result
+            # Berechne Scores für alle Kategorien einmalig (ein Durchlauf)
+            category_scores = self.category_scorer.score_all(all_categories, start_date)
 
             # Sortiere Kategorien nach Score
             sorted_categories = sorted(
@@ -470,15 +514,26 @@ class WeeklyPlanner:
             total_daily_goals = sum(ls.get('taegliches_ziel', 20) for ls in learning_sets)
             avg_cards_per_day = total_daily_goals // len(learning_sets) if learning_sets else 20
 
+            # Flow-Modus: alle Tage auf einmal zuordnen (maximal 4 Sessions pro Tag)
+            flow_days = None
+            if solver == PLAN_SOLVER_FLOW:
+                flow_days = solve_day_assignment(
+                    [(pair, pair[0], score_data['total_score']) for pair, score_data in sorted_categories],
+                    [4] * 7
+                )
+
             # Verteile High-Priority Kategorien zuerst
             for (cat, subcat), score_data in sorted_categories:
                 # Finde besten Tag für diese Kategorie
-                best_day = self._find_best_day_for_category(
-                    cat,
-                    used_categories_per_day,
-                    sessions_per_day,
-                    score_data
-                )
+                if flow_days is not None:
+                    best_day = flow_days.get((cat, subcat))
+                else:
+                    best_day = self._find_best_day_for_category(
+                        cat,
+                        used_categories_per_day,
+                        sessions_per_day,
+                        score_data
+                    )
 
                 if best_day is not None:
                     used_categories_per_day[best_day].add(cat)
@@ -508,25 +563,27 @@ class WeeklyPlanner:
                     }
                     sessions_per_day[best_day].append(session)
 
-            # Erstelle tatsächliche Plan-Einträge
+            # Erstelle tatsächliche Plan-Einträge (ein Speichervorgang für die ganze Woche)
+            plan_adds = []
             for day_offset in range(7):
                 date = start_date + datetime.timedelta(days=day_offset)
 
                 for session in sessions_per_day[day_offset]:
-                    self.data_manager.add_plan_entry(
-                        date=date,
-                        kategorie=session['kategorie'],
-                        unterkategorie=session['unterkategorie'],
-                        aktion='lernen',
-                        erwartete_karten=session['erwartete_karten'],
-                        prioritaet=session['prioritaet'],
-                        auto_generiert=True
-                    )
+                    plan_adds.append({
+                        'date': date,
+                        'kategorie': session['kategorie'],
+                        'unterkategorie': session['unterkategorie'],
+                        'aktion': 'lernen',
+                        'erwartete_karten': session['erwartete_karten'],
+                        'prioritaet': session['prioritaet'],
+                        'auto_generiert': True
+                    })
 
                     logging.info(
                         f"Session geplant: {session['kategorie']}/{session['unterkategorie']} "
                         f"am {date} (Score: {session['score']:.1f}, Karten: {session['erwartete_karten']})"
                     )
+            self.data_manager.apply_plan_changes(adds=plan_adds)
 
             logging.info("Intelligente Auto-Planung erfolgreich abgeschlossen.")
             return True
@@ -575,19 +632,21 @@ class WeeklyPlanner:
         return best_day
 
     def _clear_auto_generated_entries(self, start_date: datetime.date):
-        """Löscht alle auto-generierten Einträge für eine Woche."""
+        """Löscht alle auto-generierten Einträge für eine Woche (ein Speichervorgang)."""
+        auto_generated_ids = []
         for day_offset in range(7):
             date = start_date + datetime.timedelta(days=day_offset)
             entries = self.data_manager.get_plan_for_date(date)
+            auto_generated_ids.extend(entry['id'] for entry in entries if entry.get('auto_generiert', False))
 
-            for entry in entries:
-                if entry.get('auto_generiert', False):
-                    self.data_manager.delete_plan_entry(entry['id'])
+        if auto_generated_ids:
+            self.data_manager.apply_plan_changes(deletes=auto_generated_ids)
 
     def auto_plan_week_with_preferences(self, start_date: datetime.date,
                                        all_learning_sets: List[Dict],
                                        preferences: Dict,
-                                       day_weights: List[float]) -> bool:
+                                       day_weights: List[float],
+                                       solver: str = PLAN_SOLVER_GREEDY) -> bool:
         """
         Verteilt Sessions intelligent über 7 Tage mit Berücksichtigung der Nutzerpräferenzen.
 
@@ -600,6 +659,8 @@ class WeeklyPlanner:
                 - priority_category: Priorisierte Kategorie (optional)
                 - daily_distribution: Dict mit Tagesverteilung
             day_weights: Liste von 7 Gewichten für jeden Tag (Montag-Sonntag)
+            solver: PLAN_SOLVER_GREEDY (Tag für Tag je Kategorie) oder PLAN_SOLVER_FLOW
+                (kostenminimale Zuordnung aller Kategorien, siehe plan_solver)
 
         Returns:
             bool: True wenn erfolgreich
@@ -632,9 +693,8 @@ class WeeklyPlanner:
 
             # Berechne Scores für alle Kategorien mit angepassten Gewichten
             category_scores = {}
-            for cat, subcat in all_categories:
-                score_result = self.category_scorer.calculate_score(cat, subcat, start_date)
-
+            all_scores = self.category_scorer.score_all(all_categories, start_date)
+            for (cat, subcat), score_result in all_scores.items():
                 # Prüfe ob dies eine neue Kategorie ist
                 is_new_category = self._is_new_category(cat, subcat, start_date)
 
@@ -672,17 +732,38 @@ class WeeklyPlanner:
             total_cards = preferences['total_cards']
             target_cards_per_day = [total_cards * (w / 7.0) for w in day_weights]
 
+            # Flow-Modus: alle Tage auf einmal zuordnen (maximal 5 Sessions je Tag, so viele wie
+            # Sessions durchschnittlicher Größe in die Tagesgrenze passen, keine Kategorie zweimal am selben Tag)
+            flow_days = None
+            if solver == PLAN_SOLVER_FLOW:
+                session_cards = typical_session_cards([
+                    score_data['details']['fällige_karten'] + score_data['details']['überfällige_karten']
+                    for _, score_data in sorted_categories
+                ])
+                flow_days = solve_day_assignment(
+                    [(pair, pair[0], score_data['adjusted_score']) for pair, score_data in sorted_categories],
+                    session_capacities(preferences.get('day_card_limits', [999] * 7), 5, session_cards),
+                    day_weights,
+                    allow_repeats=False
+                )
+                flow_sessions_per_day = defaultdict(int)
+                for day in flow_days.values():
+                    flow_sessions_per_day[day] += 1
+
             # Verteile High-Priority Kategorien zuerst
             for (cat, subcat), score_data in sorted_categories:
                 # Finde besten Tag für diese Kategorie basierend auf Gewichten und aktueller Auslastung
-                best_day = self._find_best_day_with_weights(
-                    cat,
-                    used_categories_per_day,
-                    cards_per_day,
-                    target_cards_per_day,
-                    score_data,
-                    preferences
-                )
+                if flow_days is not None:
+                    best_day = flow_days.get((cat, subcat))
+                else:
+                    best_day = self._find_best_day_with_weights(
+                        cat,
+                        used_categories_per_day,
+                        cards_per_day,
+                        target_cards_per_day,
+                        score_data,
+                        preferences
+                    )
 
                 if best_day is not None:
                     used_categories_per_day[best_day].add(cat)
@@ -698,15 +779,24 @@ class WeeklyPlanner:
                     remaining_budget = target_cards_per_day[best_day] - cards_per_day[best_day]
                     day_limit_remaining = day_card_limits[best_day] - cards_per_day[best_day]
 
-                    expected_cards = min(
-                        due_cards + overdue_cards,
-                        int(remaining_budget),
-                        int(day_limit_remaining),  # Berücksichtige Tages-Limit
-                        50  # Maximale Session-Größe
-                    )
+                    if flow_days is not None:
+                        # Tagesbudget gleichmäßig auf die zugeordneten Sessions des Tages aufteilen;
+                        # die Tageskapazität des Solvers hält so die Tagesgrenze ein
+                        expected_cards = flow_session_cards(
+                            due_cards + overdue_cards,
+                            min(target_cards_per_day[best_day], day_card_limits[best_day]),
+                            flow_sessions_per_day[best_day]
+                        )
+                    else:
+                        expected_cards = min(
+                            due_cards + overdue_cards,
+                            int(remaining_budget),
+                            int(day_limit_remaining),  # Berücksichtige Tages-Limit
+                            50  # Maximale Session-Größe
+                        )
 
-                    if expected_cards < 5:
-                        expected_cards = 5  # Mindestens 5 Karten
+                        if expected_cards < 5:
+                            expected_cards = 5  # Mindestens 5 Karten
 
                     cards_per_day[best_day] += expected_cards
 
@@ -729,7 +819,8 @@ class WeeklyPlanner:
 
                     sessions_per_day[best_day].append(session)
 
-            # Speichere Sessions
+            # Speichere Sessions (ein Speichervorgang für die ganze Woche)
+            plan_adds = []
             for day_offset, day_sessions in sessions_per_day.items():
                 date = start_date + datetime.timedelta(days=day_offset)
 
@@ -739,22 +830,23 @@ class WeeklyPlanner:
                     if session.get('is_new', False):
                         notiz = "🆕 Neue Kategorie - Optimal zum Einstieg!"
 
-                    self.data_manager.add_plan_entry(
-                        date=date,
-                        kategorie=session['kategorie'],
-                        unterkategorie=session['unterkategorie'],
-                        aktion='lernen',
-                        erwartete_karten=session['erwartete_karten'],
-                        prioritaet=session['prioritaet'],
-                        auto_generiert=True,
-                        notiz=notiz
-                    )
+                    plan_adds.append({
+                        'date': date,
+                        'kategorie': session['kategorie'],
+                        'unterkategorie': session['unterkategorie'],
+                        'aktion': 'lernen',
+                        'erwartete_karten': session['erwartete_karten'],
+                        'prioritaet': session['prioritaet'],
+                        'auto_generiert': True,
+                        'notiz': notiz
+                    })
 
                     new_marker = " [NEU]" if session.get('is_new', False) else ""
                     logging.info(
                         f"Session geplant: {session['kategorie']}/{session['unterkategorie']}{new_marker} "
                         f"am {date} (Score: {session['score']:.1f}, Karten: {session['erwartete_karten']})"
                     )
+            self.data_manager.apply_plan_changes(adds=plan_adds)
 
             logging.info("Intelligente Auto-Planung mit Präferenzen erfolgreich abgeschlossen.")
             return True
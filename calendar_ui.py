@@ -427,14 +427,8 @@ class WeeklyCalendarView(ttk.Frame):
 
     def _count_due_cards_for_date(self, date: datetime.date) -> int:
         """Zählt fällige Karten für ein bestimmtes Datum."""
-        count = 0
         target_datetime = datetime.datetime.combine(date, datetime.time.max)
-
-        for card_id, leitner_card in self.leitner_system.cards.items():
-            if leitner_card.next_review_date <= target_datetime:
-                count += 1
-
-        return count
+        return self.leitner_system.count_due_cards(target_datetime)
 
     def _update_week_statistics(self):
         """Aktualisiert die Wochenstatistik."""
@@ -1031,12 +1025,7 @@ class DayPlanningDialog(tk.Toplevel):
             return
 
         # Zähle fällige Karten
-        due_count = sum(
-            1 for card_id, leitner_card in self.leitner_system.cards.items()
-            if leitner_card.category.lower() == category.lower() and
-               leitner_card.subcategory.lower() == subcategory.lower() and
-               leitner_card.next_review_date <= datetime.datetime.now()
-        )
+        due_count = self.leitner_system.count_due_cards(None, category, subcategory)
 
         # Dauer
         try:
@@ -1619,10 +1608,7 @@ class TodayViewDialog(tk.Toplevel):
         completed_cards = sum(e.get('tatsaechliche_karten', 0) for e in completed_sessions)
 
         # Fällige Karten insgesamt (aus Leitner-System)
-        due_cards_total = sum(
-            1 for card in self.leitner_system.cards.values()
-            if card.next_review_date <= datetime.datetime.now()
-        )
+        due_cards_total = self.leitner_system.count_due_cards()
 
         # Statistik-Grid
         stats_grid = ttk.Frame(stats_frame)
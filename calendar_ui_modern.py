@@ -947,21 +947,14 @@ class ModernWeeklyCalendarView(ctk.CTkFrame):
 
     def _count_due_cards_for_date(self, date: datetime.date) -> int:
         """Zählt fällige Karten für ein Datum."""
-        count = 0
         target_datetime = datetime.datetime.combine(date, datetime.time.max)
 
-        # Filtere nach Planer-Kategorien
-        planner_categories = set(self.planner_manager.get_planner_categories(self.planner_id))
+        # Nur Planer-Kategorien, gezählt über den Fälligkeits-Index
+        planner_categories = {(category.lower(), subcategory.lower()) for category, subcategory
+                              in self.planner_manager.get_planner_categories(self.planner_id)}
 
-        for card_id, leitner_card in self.leitner_system.cards.items():
-            # Prüfe ob Karte im Planer ist
-            if (leitner_card.category, leitner_card.subcategory) not in planner_categories:
-                continue
-
-            if leitner_card.next_review_date <= target_datetime:
-                count += 1
-
-        return count
+        return sum(self.leitner_system.count_due_cards(target_datetime, category, subcategory)
+                   for category, subcategory in planner_categories)
 
     def _update_week_statistics(self):
         """Aktualisiert die Wochenstatistik."""
@@ -1585,6 +1578,8 @@ class ModernWeeklyCalendarView(ctk.CTkFrame):
 
         # Füge Kartengrenzen zu den Präferenzen hinzu
         preferences['day_card_limits'] = day_card_limits
+        # Am Planer merken (z.B. für die Neuplanung der Fälligkeiten)
+        self.planner_manager.update_planner(self.planner_id, day_card_limits=day_card_limits)
 
         # Rufe die erweiterte auto_plan_week Methode mit Präferenzen auf
         success = self.weekly_planner.auto_plan_week_with_preferences(
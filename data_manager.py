@@ -14,14 +14,30 @@ import shutil
 import sys
 import uuid
 import random
+import atexit
 import platformdirs
 from dataclasses import dataclass, asdict, field, fields # 'fields' hier hinzufügen
-from typing import List, Optional, Dict, Tuple
+from typing import Callable, List, Optional, Dict, Set, Tuple
 from collections import defaultdict
+from contextlib import contextmanager
 import datetime
 from tkinter import messagebox
 from threading import Lock
 from logging.handlers import RotatingFileHandler
+from journal import AppendOnlyJournal
+from json_stream import iter_json_array
+from snapshot_cache import read_snapshot, write_snapshot, rebuild_snapshot
+from backup_store import BackupStore
+from save_scheduler import SaveScheduler
+from search_index import SearchIndex
+from duplicate_index import MinHashIndex, duplicate_key, normalize_card_text
+from stats_rollup import StatsRollup
+from memo_cache import VersionedLRUCache
+import day_numbers
+from storage_backend import (
+    StorageBackend, SQLiteStorageBackend,
+    DOCUMENT_CATEGORIES, DOCUMENT_ALGORITHM_SETTINGS
+)
 
 # ------------------------------------------------------------------------------
 # KONFIGURATION
@@ -31,8 +47,50 @@ DEFAULT_FLASHCARDS_FILE = 'flashcards.json'
 DEFAULT_CATEGORIES_FILE = 'categories.json'
 DEFAULT_STATS_FILE = 'stats.json'
 DEFAULT_BACKUP_DIR = 'karten_backups'
+DEFAULT_BACKUP_STORE_DIR = 'snapshots'  # Unterordner von DEFAULT_BACKUP_DIR
 DEFAULT_THEME_FILE = 'themes.json'
 DEFAULT_IMAGES_DIR = 'images'
+DEFAULT_REVIEW_JOURNAL_FILE = 'flashcards_journal.jsonl'
+DEFAULT_STATS_LOG_FILE = 'stats_sessions.jsonl'
+DEFAULT_SQLITE_DB_FILE = 'flashcards.db'
+
+# Review-Journal: Nach so vielen Einträgen wird das Journal in flashcards.json kompaktiert
+REVIEW_JOURNAL_COMPACT_THRESHOLD = 500
+
+# Sitzungs-Log: Ab so vielen Sitzungen wird das Log im Hintergrund in stats.json kompaktiert
+STATS_LOG_COMPACT_THRESHOLD = 50
+
+# Flashcards werden in Blöcken dieser Größe geladen (Fortschrittsanzeige, frühe Verfügbarkeit)
+FLASHCARD_LOAD_CHUNK_SIZE = 500
+
+# Standard-Höchstzahl an Suchergebnissen (nur die besten Treffer werden sortiert)
+SEARCH_RESULT_LIMIT = 500
+
+# Sammlungen, die über den SaveScheduler im Hintergrund geschrieben werden
+SAVE_COLLECTIONS = (
+    'flashcards',
+    'categories',
+    'stats',
+    'weekly_plan',
+    'learning_sets',
+    'algorithm_settings',
+    'planners',
+)
+
+# Leitner-Felder einer Flashcard, die pro Antwort im Review-Journal festgehalten werden
+LEITNER_STATE_FIELDS = (
+    'leitner_points',
+    'leitner_level',
+    'leitner_positive_streak',
+    'leitner_negative_streak',
+    'leitner_last_reviewed',
+    'leitner_next_review_date',
+    'leitner_in_recovery_mode',
+    'leitner_recovery_interval',
+    'leitner_success_history',
+    'leitner_total_incorrect_count',
+    'leitner_consecutive_incorrect_sessions',
+)
 
 # SM2 Algorithmus Parameter (optional anpassbar)
 SM2_EASE_FACTOR_INCREMENT = 0.1
@@ -93,7 +151,11 @@ def get_persistent_path(filename: str) -> str:
 # FLASHCARD DATACLASS
 # ------------------------------------------------------------------------------
 
-@dataclass
+# Flashcards ohne __dict__ (deutlich kleiner bei großen Decks); slots=True gibt es ab Python 3.10
+_FLASHCARD_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_FLASHCARD_DATACLASS_OPTIONS)
 class Flashcard:
     """
     Erweiterte Flashcard-Klasse mit Unterstützung für Bilder bei Frage UND Antwort.
@@ -138,6 +200,7 @@ class Flashcard:
     leitner_recovery_interval: int = 1
     leitner_success_history: List[bool] = field(default_factory=list)
     leitner_total_incorrect_count: int = 0  # NEU für Leitner
+    leitner_consecutive_incorrect_sessions: int = 0
 
     def to_dict(self) -> Dict:
         """
@@ -174,7 +237,8 @@ class Flashcard:
             'leitner_in_recovery_mode': self.leitner_in_recovery_mode,
             'leitner_recovery_interval': self.leitner_recovery_interval,
             'leitner_success_history': self.leitner_success_history,
-            'leitner_total_incorrect_count': self.leitner_total_incorrect_count
+            'leitner_total_incorrect_count': self.leitner_total_incorrect_count,
+            'leitner_consecutive_incorrect_sessions': self.leitner_consecutive_incorrect_sessions
         }
 
     @classmethod
@@ -183,39 +247,11 @@ class Flashcard:
         Erstellt ein Flashcard-Objekt aus einem Dictionary.
         Mit Abwärtskompatibilität für alte Daten ohne question_image_path.
         """
-        # Extrahiere alle bekannten Felder mit Fallback-Werten
-        return cls(
-            id=data.get('id', f"card_{datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')}_{random.randint(1000, 9999)}"),
-            question=data.get('question', ''),
-            answer=data.get('answer', ''),
-            category=data.get('category', ''),
-            subcategory=data.get('subcategory', ''),
-            tags=data.get('tags', []),
-            interval=data.get('interval', 1),
-            ease_factor=data.get('ease_factor', 2.5),
-            repetitions=data.get('repetitions', 0),
-            last_reviewed=data.get('last_reviewed', ''),
-            next_review=data.get('next_review', ''),
-            consecutive_correct=data.get('consecutive_correct', 0),
-            success_count=data.get('success_count', 0),
-            hint=data.get('hint', ''),
-            source=data.get('source', ''),
-            question_image_path=data.get('question_image_path'),  # ÃÂ¢Ã¢â¬Â ÃÂ NEU! (None wenn nicht vorhanden)
-            image_path=data.get('image_path'),
-            difficulty_rating=data.get('difficulty_rating', 3.0),
-            difficulty_history=data.get('difficulty_history', []),
-            # Leitner-Felder
-            leitner_points=data.get('leitner_points', 0),
-            leitner_level=data.get('leitner_level', 1),
-            leitner_positive_streak=data.get('leitner_positive_streak', 0),
-            leitner_negative_streak=data.get('leitner_negative_streak', 0),
-            leitner_last_reviewed=data.get('leitner_last_reviewed'),
-            leitner_next_review_date=data.get('leitner_next_review_date'),
-            leitner_in_recovery_mode=data.get('leitner_in_recovery_mode', False),
-            leitner_recovery_interval=data.get('leitner_recovery_interval', 1),
-            leitner_success_history=data.get('leitner_success_history', []),
-            leitner_total_incorrect_count=data.get('leitner_total_incorrect_count', 0)
-        )
+        # Bekannte Felder direkt übernehmen; fehlende Felder erhalten die Dataclass-Standardwerte
+        kwargs = {name: data[name] for name in _FLASHCARD_FIELD_NAMES if name in data}
+        for name in _FLASHCARD_REQUIRED_FIELDS:
+            kwargs.setdefault(name, '')
+        return cls(**kwargs)
 
     def update_difficulty_rating(self):
         """
@@ -233,6 +269,12 @@ class Flashcard:
                 self.difficulty_rating = 3.0
         else:
             self.difficulty_rating = 3.0
+
+
+# Feldnamen für Flashcard.from_dict (einmalig ermittelt statt pro Karte)
+_FLASHCARD_FIELD_NAMES = tuple(f.name for f in fields(Flashcard))
+_FLASHCARD_REQUIRED_FIELDS = ('question', 'answer', 'category', 'subcategory')
+
 # ------------------------------------------------------------------------------
 # THEME MANAGER
 # ------------------------------------------------------------------------------
@@ -402,7 +444,7 @@ class StatisticsManager:
         try:
             with self.data_manager.stats_lock: # Korrigiertes Lock
                 self.data_manager.stats.append(session_summary)
-                self.data_manager.save_stats()
+                self.data_manager.persist_session_summary(session_summary)
                 logging.info("Sitzungszusammenfassung hinzugefügt und gespeichert.")
             return True
         except Exception as e:
@@ -442,12 +484,16 @@ class StatisticsManager:
         Returns:
             List[Dict]: Liste der gefilterten Statistiken.
         """
+        if not category or category.lower() == "alle":
+            category = None
+        if not subcategory or subcategory.lower() == "alle":
+            subcategory = None
+
         filtered_stats = []
-        
-        for stat in self.data_manager.stats:
-            if not isinstance(stat, dict) or 'details' not in stat:
-                continue
-                
+        stats = self.data_manager.stats
+        # Nur Sitzungen durchsuchen, in denen die Kategorie laut Statistik-Summen vorkommt
+        for index in self.data_manager.stats_rollup.session_indices(category, subcategory):
+            stat = stats[index]
             filtered_details = []
             for detail in stat['details']:
                 if not isinstance(detail, dict):
@@ -455,12 +501,12 @@ class StatisticsManager:
                     
                 # Kategorie-Filter
                 matches_category = True
-                if category and category.lower() != "alle":
+                if category:
                     matches_category = detail.get('category', '').lower() == category.lower()
                     
                 # Unterkategorie-Filter
                 matches_subcategory = True
-                if matches_category and subcategory and subcategory.lower() != "alle":
+                if matches_category and subcategory:
                     matches_subcategory = detail.get('subcategory', '').lower() == subcategory.lower()
                     
                 if matches_category and matches_subcategory:
@@ -475,6 +521,20 @@ class StatisticsManager:
         
         return filtered_stats
 
+    def _rollup_statistics(self, category: str, subcategory: Optional[str]) -> Dict:
+        """Statistiken einer Kategorie/Subkategorie aus den Statistik-Summen."""
+        rollup = self.data_manager.stats_rollup
+        totals = rollup.totals(category, subcategory)
+        return {
+            # Anzahl der eindeutigen Sitzungsdaten
+            "total_sessions": len(rollup.session_dates(category, subcategory)),
+            "total_correct": totals.correct,
+            "total_attempts": totals.attempts,
+            "success_rate": totals.success_rate,
+            # Anteilige Lernzeit basierend auf dem Verhältnis der Kategorie-Karten je Sitzung
+            "total_learning_time": totals.learning_time
+        }
+
     def get_category_statistics(self, category: str) -> Dict:
         """
         Gibt die Statistiken für eine bestimmte Kategorie zurück.
@@ -485,57 +545,7 @@ class StatisticsManager:
         Returns:
             Dict: Die Statistiken für die Kategorie.
         """
-        category_stats = {
-            "total_sessions": 0,
-            "total_correct": 0,
-            "total_attempts": 0,
-            "success_rate": 0,
-            "total_learning_time": 0
-        }
-        
-        unique_sessions = set()  # Set für eindeutige Sitzungen
-        
-        for stat in self.data_manager.stats:
-            if isinstance(stat, dict) and 'details' in stat:
-                category_found = False
-                session_correct = 0
-                session_attempts = 0
-                
-                for detail in stat['details']:
-                    if isinstance(detail, dict) and detail.get('category', '').lower() == category.lower():
-                        category_found = True
-                        session_correct += detail.get('correct', 0)
-                        session_attempts += 1
-
-                if category_found:
-                    # Nur wenn die Kategorie in dieser Sitzung vorkam
-                    category_stats["total_correct"] += session_correct
-                    category_stats["total_attempts"] += session_attempts
-                    
-                    # Füge das Datum zur Menge der eindeutigen Sitzungen hinzu
-                    if 'date' in stat:
-                        unique_sessions.add(stat['date'])
-                        
-                    # Anteilige Lernzeit basierend auf dem Verhältnis der Kategorie-Karten
-                    if 'total_time' in stat and 'details' in stat:
-                        total_cards_in_session = len(stat['details'])
-                        category_cards_in_session = sum(1 for d in stat['details'] 
-                                                    if d.get('category', '').lower() == category.lower())
-                        
-                        # Berechne den anteiligen Zeitaufwand
-                        if total_cards_in_session > 0:
-                            time_ratio = category_cards_in_session / total_cards_in_session
-                            category_stats["total_learning_time"] += stat['total_time'] * time_ratio
-
-        # Setze die Anzahl der Sitzungen auf die Anzahl der eindeutigen Daten
-        category_stats["total_sessions"] = len(unique_sessions)
-        
-        # Berechne die Erfolgsquote
-        if category_stats["total_attempts"] > 0:
-            category_stats["success_rate"] = (category_stats["total_correct"] / 
-                                            category_stats["total_attempts"] * 100)
-
-        return category_stats
+        return self._rollup_statistics(category, None)
 
     def get_subcategory_statistics(self, category: str, subcategory: str) -> Dict:
         """
@@ -548,58 +558,7 @@ class StatisticsManager:
         Returns:
             Dict: Die Statistiken für die Subkategorie.
         """
-        subcategory_stats = {
-            "total_sessions": 0,
-            "total_correct": 0,
-            "total_attempts": 0,
-            "success_rate": 0,
-            "total_learning_time": 0
-        }
-
-        unique_sessions = set()  # Set für eindeutige Sitzungen
-
-        for stat in self.data_manager.stats:
-            if isinstance(stat, dict) and 'details' in stat:
-                subcategory_found = False
-                session_correct = 0
-                session_attempts = 0
-                
-                subcategory_cards = 0  # Zähler für Karten dieser Subkategorie
-                total_cards = len(stat['details'])  # Gesamtzahl der Karten in dieser Sitzung
-                
-                # Zähle erst die relevanten Karten
-                for detail in stat['details']:
-                    if (isinstance(detail, dict) and 
-                        detail.get('category', '').lower() == category.lower() and 
-                        detail.get('subcategory', '').lower() == subcategory.lower()):
-                        subcategory_found = True
-                        session_correct += detail.get('correct', 0)
-                        session_attempts += 1
-                        subcategory_cards += 1
-
-                if subcategory_found:
-                    # Nur wenn die Subkategorie in dieser Sitzung vorkam
-                    subcategory_stats["total_correct"] += session_correct
-                    subcategory_stats["total_attempts"] += session_attempts
-                    
-                    # Füge das Datum zur Menge der eindeutigen Sitzungen hinzu
-                    if 'date' in stat:
-                        unique_sessions.add(stat['date'])
-                    
-                    # Berechne die anteilige Lernzeit
-                    if 'total_time' in stat and total_cards > 0:
-                        time_ratio = subcategory_cards / total_cards
-                        subcategory_stats["total_learning_time"] += stat['total_time'] * time_ratio
-
-        # Setze die Anzahl der Sitzungen auf die Anzahl der eindeutigen Daten
-        subcategory_stats["total_sessions"] = len(unique_sessions)
-
-        # Berechne die Erfolgsquote
-        if subcategory_stats["total_attempts"] > 0:
-            subcategory_stats["success_rate"] = (subcategory_stats["total_correct"] / 
-                                            subcategory_stats["total_attempts"] * 100)
-
-        return subcategory_stats
+        return self._rollup_statistics(category, subcategory)
 
     def get_daily_statistics(self, date: datetime.date) -> Dict:
         """
@@ -620,25 +579,16 @@ class StatisticsManager:
             "details": []  # Hinzufügen von Details für diesen Tag
         }
 
-        for stat in self.data_manager.stats:
-            if isinstance(stat, dict) and 'date' in stat:
-                stat_date_str = stat['date']
-                try:
-                    stat_date = datetime.datetime.strptime(stat_date_str, "%d.%m.%Y").date()
-                except ValueError:
-                    logging.error(f"Ungültiges Datumsformat in Statistik: {stat_date_str}")
-                    continue
-
-                if stat_date == date:
-                    day_stats["total_sessions"] += 1
-                    day_stats["total_learning_time"] += stat.get('total_time', 0)
-                    if 'details' in stat:  # Stelle sicher, dass 'details' existiert
-                        for detail in stat['details']:
-                            if isinstance(detail, dict):
-                                day_stats["total_attempts"] += 1
-                                if detail.get('correct', False):
-                                    day_stats["total_correct"] += 1
-                                day_stats["details"].append(detail)  # Detail-Informationen hinzufügen
+        for stat in self.data_manager.stats_rollup.sessions_on(date):
+            day_stats["total_sessions"] += 1
+            day_stats["total_learning_time"] += stat.get('total_time', 0)
+            if 'details' in stat:  # Stelle sicher, dass 'details' existiert
+                for detail in stat['details']:
+                    if isinstance(detail, dict):
+                        day_stats["total_attempts"] += 1
+                        if detail.get('correct', False):
+                            day_stats["total_correct"] += 1
+                        day_stats["details"].append(detail)  # Detail-Informationen hinzufügen
 
         day_stats["success_rate"] = (day_stats["total_correct"] / day_stats["total_attempts"] * 100) if day_stats["total_attempts"] > 0 else 0
 
@@ -664,25 +614,19 @@ class StatisticsManager:
             "days": defaultdict(lambda: {"total_correct": 0, "total_attempts": 0})
         }
 
-        for stat in self.data_manager.stats:
-            if isinstance(stat, dict) and 'date' in stat and 'details' in stat:
-                try:
-                    stat_date = datetime.datetime.strptime(stat['date'], "%d.%m.%Y").date()
-                    if stat_date.year == year and stat_date.month == month:
-                        month_stats["total_sessions"] += 1
-                        month_stats["total_learning_time"] += stat.get('total_time', 0)
-                        for detail in stat['details']:
-                            if isinstance(detail, dict):
-                                month_stats["total_attempts"] += 1
-                                if detail.get('correct', False):
-                                    month_stats["total_correct"] += 1
-                                
-                                day_str = stat_date.strftime("%d.%m.%Y")
-                                month_stats["days"][day_str]["total_attempts"] += 1
-                                if detail.get('correct', False):
-                                    month_stats["days"][day_str]["total_correct"] += 1
-                except ValueError:
-                    logging.error(f"Ungültiges Datumsformat in Statistik: {stat.get('date')}")
+        day = datetime.date(year, month, 1)
+        while day.month == month:
+            totals = self.data_manager.stats_rollup.day_totals(day)
+            if totals.sessions:
+                month_stats["total_sessions"] += totals.sessions
+                month_stats["total_learning_time"] += totals.learning_time
+                month_stats["total_attempts"] += totals.attempts
+                month_stats["total_correct"] += totals.correct
+                if totals.attempts:
+                    day_str = day.strftime("%d.%m.%Y")
+                    month_stats["days"][day_str]["total_attempts"] += totals.attempts
+                    month_stats["days"][day_str]["total_correct"] += totals.correct
+            day += datetime.timedelta(days=1)
 
         month_stats["success_rate"] = (month_stats["total_correct"] / month_stats["total_attempts"] * 100) if month_stats["total_attempts"] > 0 else 0
 
@@ -748,6 +692,8 @@ class DataManager:
     """
     _instance = None
     _lock = threading.Lock()
+    # True: Flashcards werden nicht im Konstruktor geladen, sondern per load_flashcards_async
+    defer_flashcard_loading = False
 
     def __new__(cls):
         with cls._lock:
@@ -772,6 +718,9 @@ class DataManager:
         self.learning_sets_file = get_persistent_path('learning_sets.json')
         self.algorithm_settings_file = get_persistent_path('algorithm_settings.json')
         self.planners_file = get_persistent_path('planners.json')
+        self.review_journal_file = get_persistent_path(DEFAULT_REVIEW_JOURNAL_FILE)
+        self.stats_log_file = get_persistent_path(DEFAULT_STATS_LOG_FILE)
+        self.sqlite_db_file = get_persistent_path(DEFAULT_SQLITE_DB_FILE)
 
         # Stelle sicher, dass alle Verzeichnisse existieren
         os.makedirs(os.path.dirname(self.flashcards_file), exist_ok=True)
@@ -788,9 +737,24 @@ class DataManager:
         logging.info(f"Backup-Verzeichnis: {self.backup_dir}")
         logging.info(f"Themes: {self.theme_file}")
 
+        # Versionszähler je Sammlung (siehe data_versions) und Cache für davon abhängige Ergebnisse
+        self._data_versions: Dict[str, int] = {}
+        self._data_versions_lock = threading.Lock()
+        self.memo_cache = VersionedLRUCache()
+
         # Datenstrukturen
+        # Kategorie-/Subkategorienamen -> kleine Ganzzahlen (für den Kategorie-Index)
+        self._category_ids: Dict[str, int] = {}
+        self._subcategory_ids: Dict[str, int] = {}
+        # Volltext-Index für die Kartensuche (wird nach dem Laden im Hintergrund aufgebaut)
+        self.search_index = SearchIndex()
+        self._search_index_thread: Optional[threading.Thread] = None
+        # Bericht des letzten CSV-Imports (siehe add_flashcards)
+        self.last_import_report: Dict = {'added': [], 'duplicates': [], 'similar': []}
         self.flashcards: List[Flashcard] = []
         self.categories: Dict[str, Dict[str, List[str]]] = defaultdict(dict)  # category -> subcategory -> list of tags
+        # Summen je (Tag, Kategorie, Subkategorie) über self.stats
+        self.stats_rollup = StatsRollup()
         self.stats: List[Dict] = []
         self.theme_manager = ThemeManager(self.theme_file)
 
@@ -802,6 +766,8 @@ class DataManager:
 
         # Locks für Thread-Sicherheit
         self.flashcards_lock = threading.RLock()
+        # Serialisiert das Schreiben von flashcards.json (ohne den Karten-Lock zu halten)
+        self._flashcards_write_lock = threading.Lock()
         self.categories_lock = threading.RLock()
         self.stats_lock = threading.RLock()
         self.weekly_plan_lock = threading.RLock()
@@ -809,8 +775,40 @@ class DataManager:
         self.algorithm_settings_lock = threading.RLock()
         self.planners_lock = threading.RLock()
 
-        # Daten laden
-        self.load_flashcards()
+        # Verschachtelbare Wochenplan-Batches (siehe plan_batch)
+        self._plan_batch_depth = 0
+        self._plan_batch_dirty = False
+
+        # Write-behind: save_*() markiert nur als geändert, geschrieben wird im Hintergrund
+        self.save_scheduler = SaveScheduler()
+        for collection in SAVE_COLLECTIONS:
+            self.save_scheduler.register(collection, getattr(self, f"_write_{collection}"))
+        atexit.register(self.flush)
+
+        # Inhaltsadressierter Backup-Speicher (Sicherungen laufen im Hintergrund)
+        self.backup_store = BackupStore(os.path.join(self.backup_dir, DEFAULT_BACKUP_STORE_DIR))
+
+        # Append-only Journal für einzelne Antworten (wird beim Laden wieder eingespielt)
+        self.review_journal = AppendOnlyJournal(self.review_journal_file)
+
+        # Append-only Log für neue Sitzungen (stats.json wird nur beim Kompaktieren geschrieben)
+        self.stats_log = AppendOnlyJournal(self.stats_log_file)
+
+        # Speicher-Backend: None = klassische JSON-Dateien, sonst z.B. SQLite.
+        # SQLite wird verwendet, sobald die Datenbank existiert (siehe migrate_to_sqlite,
+        # Aufruf: python storage_backend.py migrate-sqlite).
+        self.storage: Optional[StorageBackend] = None
+        if os.path.exists(self.sqlite_db_file):
+            try:
+                self.storage = SQLiteStorageBackend(self.sqlite_db_file)
+            except Exception as e:
+                logging.error(f"SQLite-Datenbank {self.sqlite_db_file} konnte nicht geöffnet werden, verwende JSON: {e}")
+                self.storage = None
+
+        # Daten laden (Flashcards ggf. später im Hintergrund, siehe load_flashcards_async)
+        self.flashcards_loaded = threading.Event()
+        if not self.defer_flashcard_loading:
+            self.load_flashcards()
         self.load_categories()
         self.load_stats()
         self.theme_manager.load_themes()
@@ -835,80 +833,294 @@ class DataManager:
 
 # In data_manager.py -> DataManager.save_flashcards
 
-    def get_flashcard_by_id(self, card_id: str) -> Optional[Flashcard]:
+    @property
+    def flashcards(self) -> List[Flashcard]:
+        """Liste aller Flashcards (Reihenfolge wie in der Datei)."""
+        return self._flashcards
+
+    @flashcards.setter
+    def flashcards(self, cards: List[Flashcard]):
+        # Jede Neuzuweisung der Liste baut den ID-Index neu auf
+        self._flashcards = cards
+        self._rebuild_card_indexes()
+
+    @property
+    def stats(self) -> List[Dict]:
+        """Liste der Sitzungszusammenfassungen."""
+        return self._stats
+
+    @stats.setter
+    def stats(self, sessions: List[Dict]):
+        # Jede Neuzuweisung baut die Statistik-Summen neu auf; angehängte Sitzungen
+        # übernimmt stats_rollup selbst (StatsRollup.sync)
+        self._stats = sessions
+        self.stats_rollup.rebuild(sessions)
+        self.bump_data_version('stats')
+
+    def _rebuild_card_indexes(self):
+        """Baut den ID-Index (id -> Flashcard) und den Kategorie-Index aus self.flashcards neu auf."""
+        self._bump_card_index_version()
+        self._cards_by_id: Dict[str, Flashcard] = {}
+        # Kategorie-Index: (Kategorie-Nr., Subkategorie-Nr.) -> {id: Flashcard}
+        self._cards_by_category: Dict[Tuple[int, int], Dict[str, Flashcard]] = {}
+        self._category_key_by_id: Dict[str, Tuple[int, int]] = {}
+        # Tag-Index: Tag (kleingeschrieben) -> {id: Flashcard}
+        self._cards_by_tag: Dict[str, Dict[str, Flashcard]] = {}
+        self._tags_by_id: Dict[str, Tuple[str, ...]] = {}
+        # Duplikat-Index: normalisierte (Frage, Antwort) -> {id: Flashcard}
+        self._cards_by_duplicate_key: Dict[Tuple[str, str], Dict[str, Flashcard]] = {}
+        self._duplicate_key_by_id: Dict[str, Tuple[str, str]] = {}
+        # Ein schon aufgebauter Suchindex wird im Hintergrund neu erstellt (nicht während des Ladens)
+        rebuild_search_index = self.search_index.built and self.flashcards_loaded.is_set()
+        self.search_index.clear()
+        for card in self._flashcards:
+            self._index_add_card(card)
+        if rebuild_search_index:
+            self.build_search_index_async()
+
+    def _category_key(self, category: str, subcategory: str) -> Tuple[int, int]:
+        """
+        Normalisierter Schlüssel für Kategorie/Subkategorie.
+        Die Namen werden einmalig (kleingeschrieben) auf kleine Ganzzahlen abgebildet.
+        """
+        category_id = self._category_ids.setdefault((category or '').lower(), len(self._category_ids))
+        subcategory_id = self._subcategory_ids.setdefault((subcategory or '').lower(), len(self._subcategory_ids))
+        return category_id, subcategory_id
+
+    def _bump_card_index_version(self):
+        """
+        Erhöht card_index_version. Abgeleitete Indizes (z.B. der Fälligkeits-Index im
+        LeitnerSystem) bauen sich neu auf, sobald sich die Version geändert hat.
+        """
+        self.card_index_version = getattr(self, 'card_index_version', 0) + 1
+        self.bump_data_version('flashcards')
+
+    @staticmethod
+    def _normalized_tags(tags: Optional[List[str]]) -> Tuple[str, ...]:
+        """Tags einer Karte kleingeschrieben, ohne Leerraum und ohne Duplikate."""
+        return tuple(dict.fromkeys(tag.strip().lower() for tag in tags or () if tag and tag.strip()))
+
+    def _index_add_card(self, card: Flashcard):
+        """
+        Nimmt eine Karte in den ID-, Kategorie-, Tag- und (falls aufgebaut) Suchindex auf.
+        card_index_version erhöht der Aufrufer einmal je Änderung, nicht je Karte.
+        """
+        card_id = getattr(card, 'id', None)
+        if card_id:
+            self._cards_by_id[card_id] = card
+            key = self._category_key(card.category, card.subcategory)
+            self._category_key_by_id[card_id] = key
+            self._cards_by_category.setdefault(key, {})[card_id] = card
+            tags = self._normalized_tags(card.tags)
+            self._tags_by_id[card_id] = tags
+            for tag in tags:
+                self._cards_by_tag.setdefault(tag, {})[card_id] = card
+            duplicate = duplicate_key(card.question, card.answer)
+            self._duplicate_key_by_id[card_id] = duplicate
+            self._cards_by_duplicate_key.setdefault(duplicate, {})[card_id] = card
+            if self.search_index.built:
+                self.search_index.add(card_id, self._search_fields(card))
+
+    def _index_remove_card(self, card: Flashcard):
+        """Entfernt eine Karte aus allen Indizes (card_index_version erhöht der Aufrufer)."""
+        card_id = getattr(card, 'id', None)
+        if card_id and self._cards_by_id.get(card_id) is card:
+            del self._cards_by_id[card_id]
+            key = self._category_key_by_id.pop(card_id, None)
+            bucket = self._cards_by_category.get(key)
+            if bucket is not None:
+                bucket.pop(card_id, None)
+                if not bucket:
+                    del self._cards_by_category[key]
+            for tag in self._tags_by_id.pop(card_id, ()):
+                tagged = self._cards_by_tag.get(tag)
+                if tagged is not None:
+                    tagged.pop(card_id, None)
+                    if not tagged:
+                        del self._cards_by_tag[tag]
+            duplicate = self._duplicate_key_by_id.pop(card_id, None)
+            same_text = self._cards_by_duplicate_key.get(duplicate)
+            if same_text is not None:
+                same_text.pop(card_id, None)
+                if not same_text:
+                    del self._cards_by_duplicate_key[duplicate]
+            self.search_index.remove(card_id)
+
+    def reindex_flashcard(self, card: Flashcard):
+        """
+        Aktualisiert die Indizes nach dem Bearbeiten einer Karte
+        (muss nach Änderungen an category/subcategory, tags oder den Texten aufgerufen werden).
+        """
+        with self.flashcards_lock:
+            self._bump_card_index_version()
+            self._index_remove_card(card)
+            if card in self._flashcards:
+                self._index_add_card(card)
+
+    def get_flashcards_in_category(self, category: Optional[str] = None,
+                                   subcategory: Optional[str] = None) -> List[Flashcard]:
         """
-        Sucht eine Flashcard anhand ihrer ID in der Liste der Flashcard-Objekte.
+        Gibt die Karten einer Kategorie und/oder Subkategorie über den Kategorie-Index zurück.
 
         Args:
-            card_id: Die ID der gesuchten Flashcard.
+            category (Optional[str]): Kategorie (Groß-/Kleinschreibung egal); None = alle.
+            subcategory (Optional[str]): Subkategorie; None = alle.
 
         Returns:
-            Das gefundene Flashcard-Objekt oder None, wenn nicht gefunden.
+            List[Flashcard]: Die Karten der passenden Buckets.
         """
-        # Verwende das Lock für thread-sicheren Lesezugriff (wichtig!)
         with self.flashcards_lock:
-            # Sicherheitscheck: Ist self.flashcards wirklich eine Liste?
-            if not isinstance(self.flashcards, list):
-                 logging.error(f"get_flashcard_by_id: self.flashcards ist keine Liste (Typ: {type(self.flashcards)})")
-                 return None
-
-            # Gehe die Liste der Flashcard-Objekte durch
-            for card_obj in self.flashcards:
-                 # Stelle sicher, dass es ein Flashcard-Objekt ist und 'id' hat
-                 # Verwende getattr für sicheren Attributzugriff
-                if isinstance(card_obj, Flashcard) and getattr(card_obj, 'id', None) == card_id:
-                    # Gefunden! Gib das Objekt zurück.
-                    return card_obj
-                elif not isinstance(card_obj, Flashcard):
-                    # Logge eine Warnung, falls unerwartete Elemente in der Liste sind
-                    logging.warning(f"get_flashcard_by_id: Unerwartetes Element in self.flashcards gefunden (Typ: {type(card_obj)}) bei Suche nach ID {card_id}")
-
-            # Wenn die Schleife durchläuft, ohne die ID zu finden
-            logging.debug(f"get_flashcard_by_id: Keine Karte mit ID '{card_id}' in self.flashcards gefunden.")
-            return None # Nicht gefunden
-    def _backup_file(self, file_path: str, backup_prefix: str) -> Optional[str]:
-        """
-        Erstellt ein Backup einer Datei im Backup-Verzeichnis.
+            if not category and not subcategory:
+                return list(self._flashcards)
+            cards = []
+            for key in self.get_category_keys(category, subcategory):
+                cards.extend(self._cards_by_category[key].values())
+            return cards
+
+    def get_category_keys(self, category: Optional[str] = None,
+                          subcategory: Optional[str] = None) -> List[Tuple[int, int]]:
+        """
+        Gibt die Schlüssel der nicht leeren Kategorie-Buckets zurück, die zu den Filtern passen.
 
         Args:
-            file_path (str): Der Pfad zur Originaldatei.
-            backup_prefix (str): Ein Präfix für den Backup-Dateinamen (z.B. "flashcards", "themes").
+            category (Optional[str]): Kategorie (Groß-/Kleinschreibung egal); None = alle.
+            subcategory (Optional[str]): Subkategorie; None = alle.
+        """
+        with self.flashcards_lock:
+            category_id = self._category_ids.get(category.lower()) if category else None
+            subcategory_id = self._subcategory_ids.get(subcategory.lower()) if subcategory else None
+            if (category and category_id is None) or (subcategory and subcategory_id is None):
+                return []
+            if category and subcategory:
+                key = (category_id, subcategory_id)
+                return [key] if key in self._cards_by_category else []
+            return [key for key in self._cards_by_category
+                    if (category_id is None or key[0] == category_id)
+                    and (subcategory_id is None or key[1] == subcategory_id)]
+
+    @staticmethod
+    def _search_fields(card: Flashcard) -> Dict:
+        """Die durchsuchbaren Felder einer Karte für den Suchindex."""
+        return {
+            'question': card.question,
+            'answer': card.answer,
+            'tags': card.tags,
+            'hint': card.hint,
+            'source': card.source,
+        }
+
+    def build_search_index_async(self) -> threading.Thread:
+        """Baut den Suchindex in einem Hintergrund-Thread auf (ein laufender Aufbau wird weiterverwendet)."""
+        with self.flashcards_lock:
+            thread = self._search_index_thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=self._build_search_index, name="SearchIndexBuilder", daemon=True)
+                self._search_index_thread = thread
+                thread.start()
+            return thread
+
+    def _build_search_index(self):
+        """
+        Baut den Suchindex ohne den Karten-Lock auf. Der neue Index wird nur übernommen,
+        wenn sich die Karten währenddessen nicht geändert haben, sonst wird neu aufgebaut.
+        """
+        while True:
+            with self.flashcards_lock:
+                if self.search_index.built:
+                    return
+                version = self.card_index_version
+                documents = [(card.id, self._search_fields(card)) for card in self._cards_by_id.values()]
+            search_index = SearchIndex(self.search_index.field_weights)
+            search_index.build(documents)
+            with self.flashcards_lock:
+                if self.card_index_version == version:
+                    self.search_index = search_index
+                    return
+            logging.info("Karten während des Suchindex-Aufbaus geändert, baue erneut auf.")
+
+    def search_flashcards(self, query: str, category: Optional[str] = None,
+                          subcategory: Optional[str] = None, fuzzy: bool = True,
+                          limit: Optional[int] = SEARCH_RESULT_LIMIT) -> List[Flashcard]:
+        """
+        Volltextsuche über Frage, Antwort, Tags, Hinweis und Quelle.
+        Alle Suchwörter müssen vorkommen (als Wort, Wortanfang oder Teilwort); bei
+        Tippfehlern werden ähnliche Wörter gefunden. Die Treffer sind nach Relevanz sortiert.
+
+        Args:
+            query (str): Suchbegriff(e).
+            category (Optional[str]): Nur in dieser Kategorie suchen ("Alle"/None = alle).
+            subcategory (Optional[str]): Nur in dieser Subkategorie suchen.
+            fuzzy (bool): Unscharfe Suche für Wörter ohne Treffer.
+            limit (Optional[int]): Maximale Anzahl Ergebnisse (None = alle).
 
         Returns:
-            Optional[str]: Der Pfad zur erstellten Backup-Datei oder None bei einem Fehler.
+            List[Flashcard]: Die gefundenen Karten, beste Treffer zuerst.
         """
-        # Nur Backup erstellen, wenn die Originaldatei existiert
-        if not os.path.exists(file_path):
-            logging.debug(f"_backup_file: Originaldatei '{file_path}' existiert nicht, kein Backup erstellt.")
-            return None
+        if not self.search_index.built:
+            # Der Aufbau läuft normalerweise seit dem Laden im Hintergrund; ohne Karten-Lock darauf warten
+            self.build_search_index_async().join()
+        with self.flashcards_lock:
+            if not self.search_index.built:
+                self.search_index.build(
+                    (card.id, self._search_fields(card)) for card in self._cards_by_id.values())
+            candidates = None
+            if (category and category.lower() != "alle") or (subcategory and subcategory.lower() != "alle"):
+                candidates = {card.id for card in self._cards_for_category_filter(category, subcategory)}
+                if not candidates:
+                    return []
+            results = self.search_index.search(query, fuzzy=fuzzy, limit=limit, candidates=candidates)
+            return self._cards_for_ids([card_id for card_id, _ in results])
+
+    def get_category_key(self, card_id: str) -> Optional[Tuple[int, int]]:
+        """Schlüssel des Kategorie-Buckets einer Karte (oder None)."""
+        return self._category_key_by_id.get(card_id)
+
+    def _remove_flashcards(self, cards: List[Flashcard]):
+        """Entfernt mehrere Karten aus self.flashcards und den Indizes."""
+        removed = {id(card) for card in cards}
+        if not removed:
+            return
+        with self.flashcards_lock:
+            self._bump_card_index_version()
+            self._flashcards[:] = [card for card in self._flashcards if id(card) not in removed]
+            for card in cards:
+                self._index_remove_card(card)
+
+    def get_flashcard_by_id(self, card_id: str) -> Optional[Flashcard]:
+        """
+        Sucht eine Flashcard anhand ihrer ID über den ID-Index.
+
+        Args:
+            card_id: Die ID der gesuchten Flashcard.
+
+        Returns:
+            Das gefundene Flashcard-Objekt oder None, wenn nicht gefunden.
+        """
+        with self.flashcards_lock:
+            card = self._cards_by_id.get(card_id)
+        if card is None:
+            logging.debug(f"get_flashcard_by_id: Keine Karte mit ID '{card_id}' gefunden.")
+        return card
 
-        try:
-            # Zeitstempel für eindeutigen Dateinamen
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f") # Mikrosekunden für mehr Eindeutigkeit
-            # Nur den Dateinamen des Originals nehmen
-            original_filename = os.path.basename(file_path)
-            # Neuen Backup-Namen zusammensetzen
-            backup_filename = f"{backup_prefix}_backup_{timestamp}_{original_filename}"
-            # Zielpfad im Backup-Verzeichnis
-            backup_path = os.path.join(self.backup_dir, backup_filename)
-
-            # Stelle sicher, dass das Backup-Verzeichnis existiert
-            os.makedirs(self.backup_dir, exist_ok=True)
-
-            # Kopiere die Datei (copy2 erhält Metadaten wie Zeitstempel)
-            shutil.copy2(file_path, backup_path)
-            logging.info(f"_backup_file: Backup erfolgreich erstellt: '{backup_path}'")
-            return backup_path
-        except Exception as e:
-            logging.error(f"_backup_file: Fehler beim Erstellen des Backups für '{file_path}': {e}", exc_info=True)
-            return None # Fehler signalisieren
 # In data_manager.py -> Ersetze die komplette save_flashcards Methode mit dieser Version
 
-    def save_flashcards(self):
+    def _write_flashcards(self) -> bool:
         """
         Speichert die aktuelle Liste der Flashcards in die JSON-Datei.
         Verwendet card.to_dict() für die korrekte Serialisierung von Datumsfeldern.
+        Nicht mit gehaltenem flashcards_lock aufrufen (Lock-Reihenfolge: erst Schreib-, dann Karten-Lock).
         """
+        # Niemals einen nur teilweise geladenen Kartenstapel schreiben
+        self.flashcards_loaded.wait()
+
+        if self.storage is not None:
+            with self.flashcards_lock:
+                success = self.storage.save_flashcards([card.to_dict() for card in self.flashcards])
+            if success:
+                logging.info(f"{len(self.flashcards)} Flashcards im Speicher-Backend '{self.storage.name}' gespeichert.")
+                self.backup_store.submit('flashcards', self._flashcards_snapshot_bytes, reason="autosave")
+            return success
+
         target_file_path = self.flashcards_file
         logging.info(f"Speichere Flashcards nach: '{target_file_path}'")
 
@@ -922,42 +1134,34 @@ class DataManager:
              return False
 
         # --- Thread-sicheres Speichern ---
-        with self.flashcards_lock: # Korrektes Lock verwenden
-            backup_path = None
+        # Der Schreib-Lock hält parallele Schreibvorgänge in Reihenfolge. Der Karten-Lock wird nur
+        # für die Datenaufbereitung gehalten, Antworten (record_review) warten nicht auf die Datei.
+        with self._flashcards_write_lock:
             data_to_save = [] # Initialisieren für den Fall, dass etwas schiefgeht
 
             try:
-                logging.debug(f"Speichern: Lock für '{target_file_path}' erhalten.")
-
-                # --- Datenaufbereitung mit card.to_dict() ---
-                logging.debug(f"Speichern: Bereite Flashcard-Daten vor...")
-                if not self.flashcards:
-                     logging.info("Speichern: Flashcards-Liste ist leer.")
-                     data_to_save = []
-                elif isinstance(self.flashcards, list) and self.flashcards and isinstance(self.flashcards[0], Flashcard):
-                    try:
-                        # *** WICHTIGSTE ÄNDERUNG: Verwende die to_dict() Methode der Karte ***
-                        data_to_save = [card.to_dict() for card in self.flashcards]
-                        logging.debug(f"Speichern: {len(data_to_save)} Flashcards via card.to_dict() für JSON vorbereitet.")
-                    except Exception as convert_e:
-                         logging.error(f"Speichern: Fehler bei Konvertierung via card.to_dict(): {convert_e}", exc_info=True)
-                         raise # Fehler weitergeben an äußeres try-except
-                else:
-                    logging.error(f"Speichern: Unerwarteter Datentyp in self.flashcards: {type(self.flashcards[0]) if self.flashcards else 'leer oder keine Liste'}")
-                    raise TypeError("Unerwarteter Datentyp in self.flashcards beim Speichern")
-
-                # --- Backup erstellen ---
-                if os.path.exists(target_file_path):
-                    logging.debug(f"Speichern: Erstelle Backup für '{target_file_path}'...")
-                    if hasattr(self, '_backup_file') and callable(self._backup_file):
-                         backup_path = self._backup_file(target_file_path, "flashcards")
-                         if backup_path:
-                            logging.debug(f"Speichern: Backup erstellt unter '{backup_path}'")
-                         else:
-                            logging.warning("Speichern: Backup konnte nicht erstellt werden.")
+                with self.flashcards_lock:
+                    logging.debug(f"Speichern: Lock für '{target_file_path}' erhalten.")
+
+                    # --- Datenaufbereitung mit card.to_dict() ---
+                    logging.debug(f"Speichern: Bereite Flashcard-Daten vor...")
+                    if not self.flashcards:
+                         logging.info("Speichern: Flashcards-Liste ist leer.")
+                         data_to_save = []
+                    elif isinstance(self.flashcards, list) and self.flashcards and isinstance(self.flashcards[0], Flashcard):
+                        try:
+                            # *** WICHTIGSTE ÄNDERUNG: Verwende die to_dict() Methode der Karte ***
+                            data_to_save = [card.to_dict() for card in self.flashcards]
+                            logging.debug(f"Speichern: {len(data_to_save)} Flashcards via card.to_dict() für JSON vorbereitet.")
+                        except Exception as convert_e:
+                             logging.error(f"Speichern: Fehler bei Konvertierung via card.to_dict(): {convert_e}", exc_info=True)
+                             raise # Fehler weitergeben an äußeres try-except
                     else:
-                         logging.warning("Speichern: _backup_file Methode nicht gefunden, Backup übersprungen.")
+                        logging.error(f"Speichern: Unerwarteter Datentyp in self.flashcards: {type(self.flashcards[0]) if self.flashcards else 'leer oder keine Liste'}")
+                        raise TypeError("Unerwarteter Datentyp in self.flashcards beim Speichern")
 
+                    # Bis hierher angehängte Journal-Einträge sind in data_to_save enthalten
+                    journal_position = self.review_journal.position()
 
                 # --- Atomares Schreiben (Temp-Datei -> Umbenennen) ---
                 temp_file_path = target_file_path + ".tmp"
@@ -971,6 +1175,15 @@ class DataManager:
 
                     shutil.move(temp_file_path, target_file_path)
                     logging.info(f"Flashcards erfolgreich gespeichert in '{target_file_path}' (atomar).")
+                    write_snapshot(target_file_path, data_to_save)
+
+                    # Der Snapshot enthält die Journal-Einträge bis journal_position -> diese entfernen
+                    if journal_position[1] > 0:
+                        self.review_journal.truncate_through(journal_position)
+                        logging.debug("Speichern: Review-Journal in Snapshot übernommen und gekürzt.")
+
+                    # Sicherung im Hintergrund (unveränderte Stände werden übersprungen)
+                    self.backup_store.submit('flashcards', target_file_path, reason="autosave")
                     return True # Erfolg signalisieren
 
                 except TypeError as type_err:
@@ -988,132 +1201,400 @@ class DataManager:
 
 
             except Exception as e:
+                # Die Originaldatei bleibt unverändert, da erst nach erfolgreichem Schreiben umbenannt wird
                 logging.error(f"Speichern: !!! Allgemeiner Fehler im Speicherprozess für {target_file_path}: {e} !!!", exc_info=True)
-                if backup_path and os.path.exists(backup_path):
-                    try:
-                        logging.warning(f"Speichern: Fehler aufgetreten, versuche Wiederherstellung aus Backup: {backup_path}")
-                        shutil.copy2(backup_path, target_file_path)
-                        logging.info(f"Speichern: Datei aus Backup {backup_path} wiederhergestellt.")
-                    except Exception as backup_restore_e:
-                        logging.error(f"Speichern: !!! Konnte NICHT aus Backup wiederherstellen: {backup_restore_e} !!!")
                 return False
             finally:
                  logging.debug(f"Speichern: Lock für '{target_file_path}' wird freigegeben.")
-    def load_flashcards(self):
-        logging.info("Versuche, Flashcards zu laden...")
-        if os.path.exists(self.flashcards_file):
-            try:
-                with open(self.flashcards_file, 'r', encoding='utf-8') as f:
-                    flashcards_data = json.load(f)
+    def load_flashcards(self, progress_callback: Optional[Callable[[int, float], None]] = None) -> bool:
+        """
+        Lädt die Flashcards (aus dem Speicher-Backend oder blockweise aus flashcards.json).
 
-                if not isinstance(flashcards_data, list):
-                     logging.error(f"Flashcards JSON ({self.flashcards_file}) ist keine Liste. Lade leere Liste.")
-                     self.flashcards = []
-                     self.backup_flashcards("invalid_format")
-                     return False
+        Args:
+            progress_callback (Optional[Callable[[int, float], None]]): Wird nach jedem Block mit
+                der Anzahl geladener Karten und dem Anteil (0.0 - 1.0) aufgerufen.
 
-                with self.flashcards_lock:
-                    loaded_cards = []
-                    seen_ids = set()
+        Returns:
+            bool: True wenn erfolgreich, False sonst.
+        """
+        logging.info("Versuche, Flashcards zu laden...")
+        self.flashcards_loaded.clear()
+        try:
+            if self.storage is not None:
+                success = self._load_flashcards_from_storage()
+            else:
+                success = self._load_flashcards_from_json(progress_callback)
+        finally:
+            self.flashcards_loaded.set()
+        if success:
+            self.build_search_index_async()
+        return success
 
-                    logging.debug(f"Beginne mit der Verarbeitung von {len(flashcards_data)} Einträgen aus JSON.")
+    def load_flashcards_async(self, progress_callback: Optional[Callable[[int, float], None]] = None,
+                              done_callback: Optional[Callable[[bool], None]] = None) -> threading.Thread:
+        """
+        Lädt die Flashcards in einem Hintergrund-Thread.
 
-                    for i, card_data in enumerate(flashcards_data):
-                        if not isinstance(card_data, dict):
-                            logging.warning(f"Eintrag {i+1}: Ungültiger Eintrag in flashcards.json (kein Dictionary): {card_data}")
-                            continue
+        Die Callbacks laufen im Lade-Thread; UI-Code muss sie selbst an den Tk-Thread weitergeben.
+        """
+        self.flashcards_loaded.clear()
 
-                        card_id_from_json = card_data.get('id', 'FEHLT!')
-                        next_review_date_from_json = card_data.get('leitner_next_review_date', 'FEHLT!')
-                        question_preview = card_data.get('question', 'Frage fehlt')[:30]
-                        logging.debug(f"Eintrag {i+1}: Lade aus JSON -> ID='{card_id_from_json}', leitner_next_review_date='{next_review_date_from_json}', Frage='{question_preview}...'")
+        def run():
+            success = self.load_flashcards(progress_callback)
+            if done_callback:
+                done_callback(success)
 
-                        if card_id_from_json != 'FEHLT!':
-                            if card_id_from_json in seen_ids:
-                                logging.warning(f"Eintrag {i+1}: Doppelte Karten-ID '{card_id_from_json}' beim Laden gefunden. Überspringe Duplikat.")
-                                continue
-                            seen_ids.add(card_id_from_json)
-                        else:
-                             logging.warning(f"Eintrag {i+1}: Karte ohne ID in JSON gefunden: Frage='{question_preview}...'. Neue ID wird von Flashcard.from_dict (oder __init__) generiert.")
+        thread = threading.Thread(target=run, name="FlashcardLoader", daemon=True)
+        thread.start()
+        return thread
 
-                        try:
-                            card = Flashcard.from_dict(card_data)
-
-                            if card.image_path and isinstance(card.image_path, str):
-                                if not os.path.isabs(card.image_path):
-                                     base_name = os.path.basename(card.image_path)
-                                     abs_path = os.path.join(self.images_dir, base_name)
-                                else:
-                                     abs_path = card.image_path
-
-                                if os.path.exists(abs_path):
-                                    card.image_path = abs_path
-                                else:
-                                    logging.warning(f"Eintrag {i+1}: Bildpfad nicht gefunden für Karte ID {card.id}: {abs_path} (Original: {card_data.get('image_path')})")
-                                    card.image_path = None
-                            else:
-                                card.image_path = None
-
-
-                            loaded_cards.append(card)
-
-                        except KeyError as e:
-                            logging.error(f"Eintrag {i+1}: Fehlendes erwartetes Feld beim Laden der Karte ID '{card_id_from_json}': {e}. Überspringe Karte. Daten: {card_data}")
-                            continue
-                        except TypeError as e:
-                            logging.error(f"Eintrag {i+1}: Typfehler beim Erstellen der Karte ID '{card_id_from_json}': {e}. Überspringe Karte. Daten: {card_data}")
-                            continue
-                        except Exception as e:
-                            logging.error(f"Eintrag {i+1}: Allgemeiner Fehler beim Verarbeiten der Karte ID '{card_id_from_json}': {e}. Überspringe Karte.", exc_info=True)
-                            continue
-
-                    self.flashcards = loaded_cards
-                    logging.info(f"{len(self.flashcards)} Flashcards erfolgreich aus {self.flashcards_file} geladen und verarbeitet.")
-                    return True
+    def _scan_image_names(self) -> Set[str]:
+        """Liest die Dateinamen im Bilder-Verzeichnis mit einem einzigen os.scandir."""
+        try:
+            with os.scandir(self.images_dir) as entries:
+                return {entry.name for entry in entries if entry.is_file()}
+        except OSError as e:
+            logging.warning(f"Bilder-Verzeichnis {self.images_dir} konnte nicht gelesen werden: {e}")
+            return set()
 
-            except json.JSONDecodeError as e:
-                 logging.error(f"Fehler beim Parsen der JSON-Datei {self.flashcards_file}: {e}")
-                 self.backup_flashcards("json_decode_error")
-                 self.flashcards = []
-                 return False
-            except Exception as e:
-                logging.error(f"Generischer Fehler beim Laden der Flashcards aus {self.flashcards_file}: {e}", exc_info=True)
-                self.backup_flashcards("load_error")
-                self.flashcards = []
-                return False
-        else:
+    def _resolve_image_path(self, image_path, image_names: Set[str]) -> Optional[str]:
+        """
+        Bestimmt den absoluten Bildpfad einer Karte oder None, wenn das Bild fehlt.
+        Bilder im Bilder-Verzeichnis werden gegen image_names geprüft statt per os.path.exists.
+        """
+        if not image_path or not isinstance(image_path, str):
+            return None
+        base_name = os.path.basename(image_path)
+        if not os.path.isabs(image_path) or os.path.dirname(image_path) == self.images_dir:
+            return os.path.join(self.images_dir, base_name) if base_name in image_names else None
+        return image_path if os.path.exists(image_path) else None
+
+    def _append_loaded_cards(self, cards: List[Flashcard]):
+        """Hängt einen geladenen Block an self.flashcards an und nimmt ihn in die Indizes auf."""
+        with self.flashcards_lock:
+            self._bump_card_index_version()
+            self.flashcards.extend(cards)
+            for card in cards:
+                self._index_add_card(card)
+
+    def _load_flashcards_from_json(self, progress_callback: Optional[Callable[[int, float], None]] = None) -> bool:
+        """Lädt flashcards.json blockweise; der Rest der App kann bereits geladene Karten nutzen."""
+        if not os.path.exists(self.flashcards_file):
             logging.warning(f"Flashcards-Datei {self.flashcards_file} existiert nicht. Initialisiere leere Flashcards-Liste.")
             self.flashcards = []
             return True
 
+        image_names = self._scan_image_names()
+        with self.flashcards_lock:
+            self.flashcards = []
+        seen_ids = set()
+        chunk: List[Flashcard] = []
+        skipped = 0
+
+        # Gültiger Snapshot: JSON-Dekodierung komplett überspringen
+        cached_cards = read_snapshot(self.flashcards_file)
+        from_snapshot = isinstance(cached_cards, list)
+        raw_cards = []  # JSON-Inhalt für den neuen Snapshot
+
+        try:
+            entries = (self._iter_cached_cards(cached_cards) if from_snapshot
+                       else self._iter_json_cards(raw_cards))
+            for i, (card_data, progress) in enumerate(entries):
+                card = self._card_from_json(i, card_data, seen_ids, image_names)
+                if card is None:
+                    skipped += 1
+                    continue
+                chunk.append(card)
+                if len(chunk) >= FLASHCARD_LOAD_CHUNK_SIZE:
+                    self._append_loaded_cards(chunk)
+                    chunk = []
+                    if progress_callback:
+                        progress_callback(len(self.flashcards), progress)
+            self._append_loaded_cards(chunk)
+        except json.JSONDecodeError as e:
+            logging.error(f"Fehler beim Parsen der JSON-Datei {self.flashcards_file}: {e}")
+            self.backup_store.add_file('flashcards', self.flashcards_file, reason="json_decode_error", pinned=True)
+            self.flashcards = []
+            return False
+        except Exception as e:
+            logging.error(f"Generischer Fehler beim Laden der Flashcards aus {self.flashcards_file}: {e}", exc_info=True)
+            self.backup_store.add_file('flashcards', self.flashcards_file, reason="load_error", pinned=True)
+            self.flashcards = []
+            return False
+
+        if not from_snapshot:
+            write_snapshot(self.flashcards_file, raw_cards)
+        with self.flashcards_lock:
+            self._replay_review_journal()
+        if progress_callback:
+            progress_callback(len(self.flashcards), 1.0)
+        source = "Snapshot" if from_snapshot else self.flashcards_file
+        logging.info(f"{len(self.flashcards)} Flashcards erfolgreich aus {source} geladen ({skipped} übersprungen).")
+        return True
+
+    @staticmethod
+    def _iter_cached_cards(cached_cards: List[Dict]):
+        """Liefert (Karteneintrag, Fortschritt) aus einem Snapshot."""
+        total = max(len(cached_cards), 1)
+        for i, card_data in enumerate(cached_cards):
+            yield card_data, (i + 1) / total
+
+    def _iter_json_cards(self, raw_cards: List):
+        """Liefert (Karteneintrag, Fortschritt) aus flashcards.json und sammelt die Einträge in raw_cards."""
+        file_size = max(os.path.getsize(self.flashcards_file), 1)
+        with open(self.flashcards_file, 'r', encoding='utf-8') as f:
+            for card_data, position in iter_json_array(f):
+                raw_cards.append(card_data)
+                yield card_data, position / file_size
+
+    def rebuild_snapshot_cache(self) -> bool:
+        """Baut die Schnellstart-Snapshots von flashcards.json und stats.json neu auf."""
+        success = True
+        for source_path in (self.flashcards_file, self.stats_file):
+            if os.path.exists(source_path):
+                success = rebuild_snapshot(source_path) and success
+        logging.info(f"Snapshot-Cache neu aufgebaut (erfolgreich: {success}).")
+        return success
+
+    def _card_from_json(self, i: int, card_data, seen_ids: Set[str], image_names: Set[str]) -> Optional[Flashcard]:
+        """Erstellt eine Flashcard aus einem JSON-Eintrag oder gibt None für ungültige Einträge zurück."""
+        if not isinstance(card_data, dict):
+            logging.warning(f"Eintrag {i+1}: Ungültiger Eintrag in flashcards.json (kein Dictionary): {card_data}")
+            return None
+
+        card_id = card_data.get('id')
+        if card_id is not None:
+            if card_id in seen_ids:
+                logging.warning(f"Eintrag {i+1}: Doppelte Karten-ID '{card_id}' beim Laden gefunden. Überspringe Duplikat.")
+                return None
+            seen_ids.add(card_id)
+        else:
+            logging.warning(f"Eintrag {i+1}: Karte ohne ID in JSON gefunden. Neue ID wird von Flashcard.from_dict generiert.")
+
+        try:
+            card = Flashcard.from_dict(card_data)
+            if card.image_path:
+                resolved = self._resolve_image_path(card.image_path, image_names)
+                if resolved is None:
+                    logging.warning(f"Eintrag {i+1}: Bildpfad nicht gefunden für Karte ID {card.id}: {card.image_path}")
+                card.image_path = resolved
+        except TypeError as e:
+            logging.error(f"Eintrag {i+1}: Typfehler beim Erstellen der Karte ID '{card_id}': {e}. Überspringe Karte. Daten: {card_data}")
+            return None
+        except Exception as e:
+            logging.error(f"Eintrag {i+1}: Allgemeiner Fehler beim Verarbeiten der Karte ID '{card_id}': {e}. Überspringe Karte.", exc_info=True)
+            return None
+        return card
+
+    def _load_flashcards_from_storage(self) -> bool:
+        """Lädt alle Flashcards aus dem aktiven Speicher-Backend."""
+        try:
+            cards_data = self.storage.load_flashcards()
+        except Exception as e:
+            logging.error(f"Fehler beim Laden der Flashcards aus '{self.storage.name}': {e}", exc_info=True)
+            self.flashcards = []
+            return False
+
+        image_names = self._scan_image_names()
+        loaded_cards = []
+        for card_data in cards_data:
+            try:
+                card = Flashcard.from_dict(card_data)
+            except (KeyError, TypeError) as e:
+                logging.error(f"Ungültige Karte im Speicher-Backend übersprungen ({card_data.get('id')}): {e}")
+                continue
+            if card.image_path:
+                card.image_path = self._resolve_image_path(card.image_path, image_names)
+            loaded_cards.append(card)
+
+        with self.flashcards_lock:
+            self.flashcards = loaded_cards
+        logging.info(f"{len(self.flashcards)} Flashcards aus Speicher-Backend '{self.storage.name}' geladen.")
+        return True
+
+    # -----------------------------------------------------------------------------
+    # REVIEW-JOURNAL
+    # ------------------------------------------------------------------------------
+
+    def record_review(self, flashcard: Flashcard, correct: bool, was_wrong_in_session: bool = False) -> bool:
+        """
+        Hält eine einzelne Antwort im append-only Review-Journal fest.
+
+        Statt flashcards.json nach jeder Antwort komplett neu zu schreiben, wird nur
+        der neue Leitner-Zustand der Karte angehängt. Das Journal wird beim Laden
+        wieder eingespielt und regelmäßig bzw. beim Beenden in den Snapshot kompaktiert.
+
+        Args:
+            flashcard (Flashcard): Die beantwortete Karte (bereits mit neuem Leitner-Zustand).
+            correct (bool): Ob die Antwort richtig war.
+            was_wrong_in_session (bool): Ob die Karte in dieser Session bereits falsch war.
+
+        Returns:
+            bool: True wenn der Eintrag geschrieben wurde, False sonst.
+        """
+        record = {
+            'id': flashcard.id,
+            'result': bool(correct),
+            'was_wrong_in_session': bool(was_wrong_in_session),
+            'ts': datetime.datetime.now().isoformat(),
+            'state': {name: getattr(flashcard, name) for name in LEITNER_STATE_FIELDS}
+        }
+        with self.flashcards_lock:
+            if self.storage is not None:
+                # Das Backend kann einzelne Karten direkt aktualisieren (kein Journal nötig)
+                return self.storage.upsert_flashcards([flashcard.to_dict()])
+
+            if not self.review_journal.append(record):
+                logging.warning("Review-Journal nicht beschreibbar, speichere kompletten Snapshot.")
+                return self.save_flashcards()
+
+            if self.review_journal.record_count >= REVIEW_JOURNAL_COMPACT_THRESHOLD:
+                logging.info(f"Review-Journal hat {self.review_journal.record_count} Einträge erreicht, kompaktiere...")
+                self.compact_review_journal()
+        return True
+
+    def compact_review_journal(self) -> bool:
+        """
+        Übernimmt das Review-Journal in flashcards.json und leert es anschließend.
+
+        Returns:
+            bool: True wenn erfolgreich oder nichts zu tun war, False sonst.
+        """
+        with self.flashcards_lock:
+            if self.review_journal.record_count == 0:
+                return True
+            return bool(self.save_flashcards())
+
+    def _replay_review_journal(self) -> int:
+        """
+        Spielt die Einträge des Review-Journals auf die geladenen Flashcards ein.
+
+        Returns:
+            int: Anzahl der angewendeten Einträge.
+        """
+        records = self.review_journal.read_records()
+        if not records:
+            return 0
+
+        applied = 0
+        for record in records:
+            card = self._cards_by_id.get(record.get('id'))
+            state = record.get('state')
+            if card is None or not isinstance(state, dict):
+                continue
+            for name in LEITNER_STATE_FIELDS:
+                if name in state:
+                    setattr(card, name, state[name])
+            applied += 1
+
+        if applied:
+            self._bump_card_index_version()
+        logging.info(f"Review-Journal: {applied} von {len(records)} Einträgen auf Flashcards angewendet.")
+        return applied
+
+    def find_duplicate(self, question: str, answer: str) -> Optional[Flashcard]:
+        """
+        Sucht eine vorhandene Karte mit gleicher Frage und Antwort über den Duplikat-Index
+        (Vergleich ohne Groß-/Kleinschreibung, Akzente und überzählige Leerzeichen).
+        """
+        with self.flashcards_lock:
+            same_text = self._cards_by_duplicate_key.get(duplicate_key(question, answer))
+            return next(iter(same_text.values())) if same_text else None
+
+    def _insert_flashcard(self, flashcard: Flashcard) -> bool:
+        """
+        Prüft auf Duplikate, kopiert das Bild und nimmt die Karte in Liste und Indizes auf
+        (ohne zu speichern). Muss mit flashcards_lock aufgerufen werden; card_index_version
+        erhöht der Aufrufer einmal für alle eingefügten Karten.
+        """
+        if self.find_duplicate(flashcard.question, flashcard.answer) is not None:
+            logging.warning(f"Flashcard mit gleicher Frage und Antwort existiert bereits: '{flashcard.question}'")
+            return False
+
+        if flashcard.image_path and os.path.exists(flashcard.image_path):
+            try:
+                file_extension = os.path.splitext(flashcard.image_path)[1]
+                unique_filename = f"img_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}{file_extension}"
+                new_image_path = os.path.join(self.images_dir, unique_filename)
+
+                shutil.copy2(flashcard.image_path, new_image_path)
+                flashcard.image_path = new_image_path
+                logging.info(f"Bild kopiert: {new_image_path}")
+            except Exception as e:
+                logging.error(f"Fehler beim Kopieren des Bildes: {e}")
+                flashcard.image_path = None
+
+        self.flashcards.append(flashcard)
+        self._index_add_card(flashcard)
+        return True
+
     def add_flashcard(self, flashcard: Flashcard) -> bool:
         try:
             with self.flashcards_lock:
-                for card in self.flashcards:
-                    if card.question == flashcard.question and card.answer == flashcard.answer:
-                        logging.warning(f"Flashcard mit gleicher Frage und Antwort existiert bereits: '{flashcard.question}'")
-                        return False
-                
-                if flashcard.image_path and os.path.exists(flashcard.image_path):
-                    try:
-                        file_extension = os.path.splitext(flashcard.image_path)[1]
-                        unique_filename = f"img_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}{file_extension}"
-                        new_image_path = os.path.join(self.images_dir, unique_filename)
-                        
-                        shutil.copy2(flashcard.image_path, new_image_path)
-                        flashcard.image_path = new_image_path
-                        logging.info(f"Bild kopiert: {new_image_path}")
-                    except Exception as e:
-                        logging.error(f"Fehler beim Kopieren des Bildes: {e}")
-                        flashcard.image_path = None
-                
-                self.flashcards.append(flashcard)
+                if not self._insert_flashcard(flashcard):
+                    return False
+                self._bump_card_index_version()
                 logging.info(f"Flashcard hinzugefügt: '{flashcard.question}'")
-                self.save_flashcards()
+                if self.storage is not None:
+                    self.storage.upsert_flashcards([flashcard.to_dict()])
+                else:
+                    self.save_flashcards()
                 return True
         except Exception as e:
             logging.error(f"Fehler beim Hinzufügen der Flashcard '{flashcard.question}': {e}")
             raise
+
+    def add_flashcards(self, flashcards: List[Flashcard], check_similar: bool = False) -> Dict:
+        """
+        Fügt mehrere Karten auf einmal hinzu (z.B. beim Import) und speichert einmal.
+
+        Exakte Duplikate (auch innerhalb der Liste) werden übersprungen. Mit check_similar
+        werden außerdem ähnliche Karten über einen MinHash-Index ermittelt; sie werden
+        hinzugefügt, aber im Bericht zur Überprüfung aufgeführt.
+
+        Args:
+            flashcards (List[Flashcard]): Die neuen Karten.
+            check_similar (bool): Beinahe-Duplikate ermitteln.
+
+        Returns:
+            Dict: 'added' (List[Flashcard]), 'duplicates' (übersprungene Karten, List[Flashcard]),
+            'similar' (List[Dict] mit 'card', 'match' und 'similarity').
+        """
+        report = {'added': [], 'duplicates': [], 'similar': []}
+        with self.flashcards_lock:
+            similar_index = None
+            if check_similar:
+                similar_index = MinHashIndex()
+                for card_id, (question, answer) in self._duplicate_key_by_id.items():
+                    similar_index.add(card_id, normalize_card_text(f"{question} {answer}"))
+
+            for flashcard in flashcards:
+                if not self._insert_flashcard(flashcard):
+                    report['duplicates'].append(flashcard)
+                    continue
+                report['added'].append(flashcard)
+                if similar_index is not None:
+                    text = normalize_card_text(' '.join(self._duplicate_key_by_id[flashcard.id]))
+                    matches = similar_index.query(text, exclude=flashcard.id)
+                    if matches:
+                        match_id, similarity = matches[0]
+                        report['similar'].append({
+                            'card': flashcard,
+                            'match': self._cards_by_id.get(match_id),
+                            'similarity': similarity,
+                        })
+                    similar_index.add(flashcard.id, text)
+
+            if report['added']:
+                self._bump_card_index_version()
+                if self.storage is not None:
+                    self.storage.upsert_flashcards([card.to_dict() for card in report['added']])
+                else:
+                    self.save_flashcards()
+        logging.info(f"{len(report['added'])} Flashcards hinzugefügt, {len(report['duplicates'])} Duplikate "
+                     f"übersprungen, {len(report['similar'])} ähnliche Karten gefunden.")
+        return report
+
     def cleanup_unused_images(self):
         """
         Entfernt Bilder, die von keiner Flashcard mehr verwendet werden.
@@ -1140,8 +1621,13 @@ class DataManager:
         with self.flashcards_lock:
             if flashcard in self.flashcards:
                 self.flashcards.remove(flashcard)
+                self._bump_card_index_version()
+                self._index_remove_card(flashcard)
                 logging.info(f"Flashcard gelöscht: {flashcard.question}")
-                self.save_flashcards()
+                if self.storage is not None:
+                    self.storage.delete_flashcards([flashcard.id])
+                else:
+                    self.save_flashcards()
                 return True
             else:
                 logging.warning("Flashcard zum Löschen nicht gefunden.")
@@ -1151,31 +1637,76 @@ class DataManager:
         """
         Gibt eine Liste von Flashcards zurück, die fällig für eine Überprüfung sind.
         """
-        today = datetime.date.today().strftime("%d.%m.%Y")
-        due = []
-        with self.flashcards_lock:
-            for card in self.flashcards:
-                if card.next_review <= today:
-                    if category and card.category.lower() != category.lower():
-                        continue
-                    if subcategory and card.subcategory.lower() != subcategory.lower():
-                        continue
-                    due.append(card)
+        if self.storage is not None:
+            due = self._cards_for_ids(self.storage.query_flashcard_ids(
+                category=category, subcategory=subcategory, due_on_or_before=datetime.date.today()
+            ))
+            logging.info(f"{len(due)} Flashcards fällig für Überprüfung.")
+            return due
+
+        # Vergleich als Epochentage (Karten ohne gültiges Datum sind fällig, wie im Speicher-Backend)
+        today = day_numbers.today()
+        due = [card for card in self.get_flashcards_in_category(category, subcategory)
+               if (day_numbers.parse_day(card.next_review) or today) <= today]
         logging.info(f"{len(due)} Flashcards fällig für Überprüfung.")
         return due
 
     def filter_flashcards_by_tags(self, tags: List[str]) -> List[Flashcard]:
         """
-        Filtert Flashcards basierend auf den angegebenen Tags.
+        Filtert Flashcards basierend auf den angegebenen Tags (alle müssen vorhanden sein).
         """
-        filtered = []
-        with self.flashcards_lock:
-            for card in self.flashcards:
-                if all(tag.lower() in (t.lower() for t in card.tags) for tag in tags):
-                    filtered.append(card)
+        filtered = self.query_flashcards_by_tags(all_of=tags)
         logging.info(f"{len(filtered)} Flashcards nach Tags {tags} gefiltert.")
         return filtered
 
+    def query_flashcards_by_tags(self, all_of: Optional[List[str]] = None,
+                                 any_of: Optional[List[str]] = None,
+                                 none_of: Optional[List[str]] = None) -> List[Flashcard]:
+        """
+        Tag-Abfrage über den Tag-Index (Groß-/Kleinschreibung egal).
+
+        Args:
+            all_of (Optional[List[str]]): Karten müssen alle diese Tags haben (UND).
+            any_of (Optional[List[str]]): Karten müssen mindestens einen dieser Tags haben (ODER).
+            none_of (Optional[List[str]]): Karten dürfen keinen dieser Tags haben (NICHT).
+
+        Returns:
+            List[Flashcard]: Die passenden Karten. Ohne all_of/any_of werden alle Karten
+            ohne die ausgeschlossenen Tags zurückgegeben.
+        """
+        all_of = self._normalized_tags(all_of)
+        any_of = self._normalized_tags(any_of)
+        none_of = self._normalized_tags(none_of)
+        with self.flashcards_lock:
+            postings = []
+            for tag in all_of:
+                tagged = self._cards_by_tag.get(tag)
+                if not tagged:
+                    return []
+                postings.append(tagged)
+            if any_of:
+                union: Dict[str, Flashcard] = {}
+                for tag in any_of:
+                    union.update(self._cards_by_tag.get(tag, {}))
+                if not union:
+                    return []
+                postings.append(union)
+            if not postings:
+                postings.append(self._cards_by_id)
+
+            # Kleinste Menge durchlaufen, in den übrigen nachschlagen
+            postings.sort(key=len)
+            smallest, others = postings[0], postings[1:]
+            excluded = [self._cards_by_tag[tag] for tag in none_of if tag in self._cards_by_tag]
+            return [card for card_id, card in smallest.items()
+                    if all(card_id in other for other in others)
+                    and not any(card_id in tagged for tagged in excluded)]
+
+    def get_tag_counts(self) -> Dict[str, int]:
+        """Gibt alle Tags (kleingeschrieben, sortiert) mit der Anzahl ihrer Karten zurück."""
+        with self.flashcards_lock:
+            return {tag: len(self._cards_by_tag[tag]) for tag in sorted(self._cards_by_tag)}
+
     def filter_flashcards(self, category: Optional[str] = None, 
                             subcategory: Optional[str] = None, 
                             progress: Optional[str] = None,
@@ -1183,27 +1714,29 @@ class DataManager:
         """
         Erweiterte Filterfunktion für Flashcards.
         """
+        if self.storage is not None:
+            filtered = self._cards_for_ids(self.storage.query_flashcard_ids(
+                category=category, subcategory=subcategory,
+                progress=progress, difficulty_range=difficulty_range
+            ))
+            logging.info(f"{len(filtered)} Flashcards nach den Kriterien gefiltert.")
+            return filtered
+
         filtered = []
-        with self.flashcards_lock:
-            for card in self.flashcards:
-                if category and category.lower() != "alle" and card.category.lower() != category.lower():
+        for card in self._cards_for_category_filter(category, subcategory):
+            if progress:
+                if progress.lower() == "gekonnt" and card.consecutive_correct <= 0:
                     continue
-                if subcategory and subcategory.lower() != "alle" and card.subcategory.lower() != subcategory.lower():
+                elif progress.lower() == "nicht gekonnt" and card.consecutive_correct > 0:
                     continue
                     
-                if progress:
-                    if progress.lower() == "gekonnt" and card.consecutive_correct <= 0:
-                        continue
-                    elif progress.lower() == "nicht gekonnt" and card.consecutive_correct > 0:
-                        continue
-                        
-                if difficulty_range:
-                    min_diff, max_diff = difficulty_range
-                    if not (min_diff <= card.difficulty_rating <= max_diff):
-                        continue
-                        
-                filtered.append(card)
-                
+            if difficulty_range:
+                min_diff, max_diff = difficulty_range
+                if not (min_diff <= card.difficulty_rating <= max_diff):
+                    continue
+                    
+            filtered.append(card)
+            
         logging.info(f"{len(filtered)} Flashcards nach den Kriterien gefiltert.")
         return filtered
 
@@ -1211,17 +1744,23 @@ class DataManager:
         """
         Filtert Flashcards basierend auf Kategorie und Unterkategorie.
         """
-        filtered = []
-        with self.flashcards_lock:
-            for card in self.flashcards:
-                if category and category.lower() != "alle" and card.category.lower() != category.lower():
-                    continue
-                if subcategory and subcategory.lower() != "alle" and card.subcategory.lower() != subcategory.lower():
-                    continue
-                filtered.append(card)
+        filtered = self._cards_for_category_filter(category, subcategory)
         logging.info(f"{len(filtered)} Flashcards nach Kategorie '{category}' und Subkategorie '{subcategory}' gefiltert.")
         return filtered
 
+    def _cards_for_category_filter(self, category: Optional[str], subcategory: Optional[str]) -> List[Flashcard]:
+        """Wie get_flashcards_in_category, aber "Alle" steht (wie in den Filtern der Oberfläche) für keinen Filter."""
+        if category and category.lower() == "alle":
+            category = None
+        if subcategory and subcategory.lower() == "alle":
+            subcategory = None
+        return self.get_flashcards_in_category(category, subcategory)
+
+
+    def _cards_for_ids(self, card_ids: List[str]) -> List[Flashcard]:
+        """Gibt die Flashcard-Objekte zu einer Liste von IDs in der Reihenfolge der IDs zurück."""
+        with self.flashcards_lock:
+            return [self._cards_by_id[card_id] for card_id in card_ids if card_id in self._cards_by_id]
 
     def handle_image(self, original_image_path: str) -> str:
         """
@@ -1252,6 +1791,11 @@ class DataManager:
         """
         Lädt Kategorien aus der Kategorien-Datei.
         """
+        if self.storage is not None:
+            categories_data = self.storage.load_document(DOCUMENT_CATEGORIES, {})
+            self.categories = defaultdict(dict, {k.lower(): {sk.lower(): sv for sk, sv in v.items()} for k, v in categories_data.items()})
+            logging.info(f"{len(self.categories)} Kategorien aus Speicher-Backend '{self.storage.name}' geladen.")
+            return
         if os.path.exists(self.categories_file):
             try:
                 with open(self.categories_file, 'r', encoding='utf-8') as f:
@@ -1265,13 +1809,15 @@ class DataManager:
             logging.warning(f"Kategorien-Datei {self.categories_file} existiert nicht. Initialisiere leere Kategorien.")
             self.categories = defaultdict(dict)
 
-    def save_categories(self) -> bool:
+    def _write_categories(self) -> bool:
         """
         Speichert die aktuellen Kategorien in der Kategorien-Datei.
         """
         try:
             with self.categories_lock:
                 categories_data = {k: {sk: sv for sk, sv in v.items()} for k, v in self.categories.items()}
+                if self.storage is not None:
+                    return self.storage.save_document(DOCUMENT_CATEGORIES, categories_data)
                 temp_file_path = self.categories_file + ".tmp"
                 with open(temp_file_path, 'w', encoding='utf-8') as f:
                     json.dump(categories_data, f, indent=4, ensure_ascii=False)
@@ -1332,8 +1878,7 @@ class DataManager:
                     del self.categories[existing_category]
                     category_found = True
                     
-                    self.flashcards = [card for card in self.flashcards 
-                                    if card.category.lower() != category.lower()]
+                    self._remove_flashcards(self.get_flashcards_in_category(category))
                     
                     self.save_categories()
                     self.save_flashcards()
@@ -1373,9 +1918,7 @@ class DataManager:
                         if existing_subcat.lower() == subcategory.lower():
                             del self.categories[existing_category][existing_subcat]
                             
-                            self.flashcards = [card for card in self.flashcards 
-                                            if not (card.category.lower() == category.lower() and 
-                                                card.subcategory.lower() == subcategory.lower())]
+                            self._remove_flashcards(self.get_flashcards_in_category(category, subcategory))
                             
                             self.save_categories()
                             self.save_flashcards()
@@ -1410,34 +1953,108 @@ class DataManager:
         """
         Lädt Statistiken aus der Statistiken-Datei.
         """
-        if os.path.exists(self.stats_file):
+        if self.storage is not None:
+            try:
+                self.stats = self.storage.load_stats()
+                logging.info(f"{len(self.stats)} Statistiken aus Speicher-Backend '{self.storage.name}' geladen.")
+            except Exception as e:
+                logging.error(f"Fehler beim Laden der Statistiken: {e}")
+            return
+        cached_stats = read_snapshot(self.stats_file)
+        if isinstance(cached_stats, list):
+            self.stats = cached_stats
+            logging.info(f"{len(self.stats)} Statistiken aus Snapshot geladen.")
+        elif os.path.exists(self.stats_file):
             try:
                 with open(self.stats_file, 'r', encoding='utf-8') as f:
                     self.stats = json.load(f)
                 logging.info(f"{len(self.stats)} Statistiken aus {self.stats_file} geladen.")
+                write_snapshot(self.stats_file, self.stats)
             except Exception as e:
                 logging.error(f"Fehler beim Laden der Statistiken: {e}")
         else:
             logging.warning(f"Statistik-Datei {self.stats_file} existiert nicht. Initialisiere leere Statistik-Liste.")
             self.stats = []
+        self._replay_stats_log()
 
-    def save_stats(self) -> bool:
+    def _replay_stats_log(self) -> int:
+        """
+        Hängt die Sitzungen aus dem Sitzungs-Log an die geladenen Statistiken an.
+
+        Jeder Eintrag kennt seine Position in der Statistik-Liste; Einträge, die bereits
+        in stats.json enthalten sind (Absturz zwischen Kompaktieren und Leeren des Logs),
+        werden übersprungen.
+
+        Returns:
+            int: Anzahl der angehängten Sitzungen.
+        """
+        records = self.stats_log.read_records()
+        if not records:
+            return 0
+
+        applied = 0
+        with self.stats_lock:
+            for record in records:
+                session = record.get('session')
+                if not isinstance(session, dict) or record.get('index', -1) < len(self.stats):
+                    continue
+                self.stats.append(session)
+                applied += 1
+
+        logging.info(f"Sitzungs-Log: {applied} von {len(records)} Sitzungen an Statistiken angehängt.")
+        return applied
+
+    def _write_stats(self) -> bool:
         """
         Speichert die aktuellen Statistiken in der Statistiken-Datei.
         """
         try:
             with self.stats_lock:
+                if self.storage is not None:
+                    return self.storage.save_stats(self.stats)
                 temp_file_path = self.stats_file + ".tmp"
                 with open(temp_file_path, 'w', encoding='utf-8') as f:
                     json.dump(self.stats, f, indent=4, ensure_ascii=False)
 
                 shutil.move(temp_file_path, self.stats_file)
                 logging.info(f"Statistiken in {self.stats_file} gespeichert.")
+                write_snapshot(self.stats_file, self.stats)
+
+                # stats.json enthält jetzt alle geloggten Sitzungen -> Log leeren
+                if self.stats_log.record_count > 0:
+                    self.stats_log.truncate()
+                    logging.debug("Sitzungs-Log in stats.json übernommen und geleert.")
                 return True
         except Exception as e:
             logging.error(f"Fehler beim Speichern der Statistiken: {e}")
             raise
 
+    def persist_session_summary(self, session_summary: Dict) -> bool:
+        """
+        Persistiert eine gerade an self.stats angehängte Sitzung.
+
+        Mit Speicher-Backend wird nur diese eine Sitzung eingefügt, sonst wird sie
+        an das Sitzungs-Log angehängt (fsync). Ab STATS_LOG_COMPACT_THRESHOLD Einträgen
+        schreibt der SaveScheduler stats.json im Hintergrund neu und leert das Log.
+        """
+        with self.stats_lock:
+            self.bump_data_version('stats')
+            if self.storage is not None:
+                return self.storage.append_session(session_summary)
+            if self.save_scheduler.is_dirty('stats'):
+                # stats.json wird ohnehin komplett neu geschrieben (z.B. nach dem Löschen von Sitzungen)
+                return self.save_stats()
+
+            record = {'index': len(self.stats) - 1, 'session': session_summary}
+            if not self.stats_log.append(record):
+                logging.warning("Sitzungs-Log nicht beschreibbar, speichere komplette Statistik.")
+                return self.save_stats()
+
+            if self.stats_log.record_count >= STATS_LOG_COMPACT_THRESHOLD:
+                logging.info(f"Sitzungs-Log hat {self.stats_log.record_count} Einträge erreicht, kompaktiere im Hintergrund...")
+                self.save_stats()
+        return True
+
     # =========================================================================
     # NEU: Methode zum Zurücksetzen der Leitner-Statistiken
     # =========================================================================
@@ -1457,9 +2074,7 @@ class DataManager:
             cards_to_reset = self.flashcards
             # Filtere Karten, wenn eine spezifische Kategorie angegeben ist
             if category:
-                cards_to_reset = [
-                    card for card in self.flashcards if card.category.lower() == category.lower()
-                ]
+                cards_to_reset = self.get_flashcards_in_category(category)
 
             if not cards_to_reset:
                 logging.warning("Keine Karten zum Zurücksetzen der Leitner-Statistiken gefunden.")
@@ -1485,6 +2100,7 @@ class DataManager:
                 reset_count += 1
             
             logging.info(f"{reset_count} Karten wurden im Leitner-System zurückgesetzt.")
+            self._bump_card_index_version()
             
             # Speichere die Änderungen sofort, um die zurückgesetzten Daten persistent zu machen
             self.save_flashcards()
@@ -1548,12 +2164,15 @@ class DataManager:
             logging.error(f"Fehler beim Exportieren der Flashcards nach CSV: {e}")
             return False
 
-    def import_flashcards_from_csv(self, file_path: str) -> List[Flashcard]:
+    def import_flashcards_from_csv(self, file_path: str, check_similar: bool = True) -> List[Flashcard]:
         """
         Importiert Flashcards aus einer CSV-Datei.
+        Der Bericht (übersprungene Duplikate, ähnliche Karten) steht danach in last_import_report.
         """
         import csv
         imported_cards = []
+        new_cards = []
+        self.last_import_report = {'added': [], 'duplicates': [], 'similar': []}
         try:
             with open(file_path, 'r', encoding='utf-8') as csvfile:
                 reader = csv.DictReader(csvfile)
@@ -1572,8 +2191,9 @@ class DataManager:
                         source=row.get('source', '').strip(),
                         image_path=row.get('image_path', '').strip() or None
                     )
-                    if self.add_flashcard(flashcard):
-                        imported_cards.append(flashcard)
+                    new_cards.append(flashcard)
+            self.last_import_report = self.add_flashcards(new_cards, check_similar=check_similar)
+            imported_cards = self.last_import_report['added']
             logging.info(f"{len(imported_cards)} Flashcards wurden aus {file_path} importiert.")
             return imported_cards
         except Exception as e:
@@ -1586,14 +2206,10 @@ class DataManager:
 
     def get_all_tags(self) -> List[str]:
         """
-        Gibt eine sortierte Liste aller Tags zurück.
+        Gibt eine sortierte Liste aller Tags (kleingeschrieben) zurück.
         """
-        tags = set()
         with self.flashcards_lock:
-            for card in self.flashcards:
-                for tag in card.tags:
-                    tags.add(tag.lower())
-        return sorted(tags)
+            return sorted(self._cards_by_tag)
 
     # -----------------------------------------------------------------------------
     # SM2 ALGORITHMUS
@@ -1647,16 +2263,24 @@ class DataManager:
     # BACKUP MANAGER
     # ------------------------------------------------------------------------------
 
+    def _flashcards_snapshot_bytes(self) -> bytes:
+        """Serialisiert die aktuellen Flashcards im Format von flashcards.json."""
+        with self.flashcards_lock:
+            flashcards_data = [card.to_dict() for card in self.flashcards]
+        return json.dumps(flashcards_data, indent=4, ensure_ascii=False).encode('utf-8')
+
+    def _themes_snapshot_bytes(self) -> bytes:
+        """Serialisiert die aktuellen Themes im Format von themes.json."""
+        with self.theme_manager.lock:
+            return json.dumps(self.theme_manager.themes, indent=4, ensure_ascii=False).encode('utf-8')
+
     def backup_themes(self, reason: str = "update") -> bool:
         """
-        Erstellt ein Backup der aktuellen Themes.
+        Plant ein (angeheftetes) Backup der aktuellen Themes im Backup-Speicher ein.
         """
-        timestamp = datetime.datetime.now().strftime("%d.%m.%Y_%H-%M-%S")
-        backup_filename = f"theme_backup_{reason}_{timestamp}.json"
-        backup_path = os.path.join(self.backup_dir, backup_filename)
         try:
-            self.theme_manager.export_themes(backup_path)
-            logging.info(f"Themes-Backup erstellt: {backup_path}")
+            self.backup_store.submit('themes', self._themes_snapshot_bytes, reason=reason, pinned=True)
+            logging.info(f"Themes-Backup eingeplant ({reason}).")
             return True
         except Exception as e:
             logging.error(f"Fehler beim Erstellen des Theme-Backups: {e}")
@@ -1664,28 +2288,82 @@ class DataManager:
 
     def backup_flashcards(self, reason: str = "backup") -> bool:
         """
-        Erstellt ein Backup der aktuellen Flashcards.
+        Plant ein (angeheftetes) Backup der aktuellen Flashcards im Backup-Speicher ein.
         """
-        timestamp = datetime.datetime.now().strftime("%d.%m.%Y_%H-%M-%S")
-        backup_filename = f"flashcards_backup_{reason}_{timestamp}.json"
-        backup_path = os.path.join(self.backup_dir, backup_filename)
         try:
-            with self.flashcards_lock:
-                flashcards_data = [card.to_dict() for card in self.flashcards]
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(flashcards_data, f, indent=4, ensure_ascii=False)
-            logging.info(f"Flashcards-Backup erstellt: {backup_path}")
+            self.backup_store.submit('flashcards', self._flashcards_snapshot_bytes, reason=reason, pinned=True)
+            logging.info(f"Flashcards-Backup eingeplant ({reason}).")
             return True
         except Exception as e:
             logging.error(f"Fehler beim Erstellen des Flashcards-Backups: {e}")
             return False
 
+    def list_backups(self, name: Optional[str] = None) -> List[Dict]:
+        """Gibt die Sicherungen aus dem Backup-Speicher zurück (neueste zuerst)."""
+        return self.backup_store.list_snapshots(name)
+
+    def restore_backup(self, snapshot_id: str) -> bool:
+        """
+        Stellt Flashcards oder Themes aus einer Sicherung wieder her.
+
+        Vorher wird der aktuelle Stand angeheftet gesichert, damit die Wiederherstellung
+        selbst rückgängig gemacht werden kann.
+
+        Args:
+            snapshot_id (str): ID des Manifest-Eintrags.
+
+        Returns:
+            bool: True wenn erfolgreich, False sonst.
+        """
+        entry = self.backup_store.get(snapshot_id)
+        if entry is None:
+            logging.error(f"Sicherung '{snapshot_id}' nicht gefunden.")
+            return False
+        try:
+            data = json.loads(self.backup_store.read(snapshot_id).decode('utf-8'))
+            if entry['name'] == 'flashcards':
+                if not isinstance(data, list):
+                    raise ValueError("Sicherung enthält keine Kartenliste")
+                self.backup_store.add('flashcards', self._flashcards_snapshot_bytes(), reason="vor_wiederherstellung", pinned=True)
+                # Wie beim Laden: ungültige Einträge überspringen, Bildpfade auflösen
+                image_names = self._scan_image_names()
+                seen_ids: Set[str] = set()
+                cards = [self._card_from_json(i, card_data, seen_ids, image_names) for i, card_data in enumerate(data)]
+                with self.flashcards_lock:
+                    self.flashcards = [card for card in cards if card is not None]
+                    self.save_flashcards()
+                # Sofort schreiben: das Journal (alter Stand) wird erst nach erfolgreichem Schreiben
+                # gekürzt, ein Absturz davor lässt den bisherigen Stand samt Journal intakt
+                success = self.flush(['flashcards'])
+            elif entry['name'] == 'themes':
+                if not isinstance(data, dict):
+                    raise ValueError("Sicherung enthält keine Themes")
+                self.backup_store.add('themes', self._themes_snapshot_bytes(), reason="vor_wiederherstellung", pinned=True)
+                with self.theme_manager.lock:
+                    self.theme_manager.themes = data
+                self.theme_manager.save_themes()
+                success = True
+            else:
+                logging.error(f"Unbekannter Sicherungstyp '{entry['name']}'.")
+                return False
+        except Exception as e:
+            logging.error(f"Fehler beim Wiederherstellen der Sicherung '{snapshot_id}': {e}", exc_info=True)
+            return False
+        logging.info(f"Sicherung '{snapshot_id}' wiederhergestellt.")
+        return success
+
     # -----------------------------------------------------------------------------
     # WOCHENPLAN VERWALTUNG
     # ------------------------------------------------------------------------------
 
     def load_weekly_plan(self) -> dict:
         """Lädt Wochenplan aus JSON."""
+        if self.storage is not None:
+            try:
+                return self.storage.load_weekly_plan()
+            except Exception as e:
+                logging.error(f"Fehler beim Laden des Wochenplans: {e}")
+                return {}
         if not os.path.exists(self.weekly_plan_file):
             logging.info(f"Wochenplan-Datei {self.weekly_plan_file} existiert nicht. Initialisiere leeren Wochenplan.")
             return {}
@@ -1698,10 +2376,12 @@ class DataManager:
             logging.error(f"Fehler beim Laden des Wochenplans: {e}")
             return {}
 
-    def save_weekly_plan(self) -> bool:
+    def _write_weekly_plan(self) -> bool:
         """Speichert Wochenplan als JSON."""
         try:
             with self.weekly_plan_lock:
+                if self.storage is not None:
+                    return self.storage.save_weekly_plan(self.weekly_plan)
                 temp_file_path = self.weekly_plan_file + ".tmp"
                 with open(temp_file_path, 'w', encoding='utf-8') as f:
                     json.dump(self.weekly_plan, f, indent=4, ensure_ascii=False)
@@ -1714,13 +2394,80 @@ class DataManager:
             logging.error(f"Fehler beim Speichern des Wochenplans: {e}")
             return False
 
+    @property
+    def weekly_plan(self) -> Dict[str, List[Dict]]:
+        """Wochenplan: Datum (YYYY-MM-DD) -> Liste der Planeinträge."""
+        return self._weekly_plan
+
+    @weekly_plan.setter
+    def weekly_plan(self, plan: Dict[str, List[Dict]]):
+        # Jede Neuzuweisung baut den ID-Index neu auf
+        self._weekly_plan = plan
+        self._rebuild_plan_index()
+        self.bump_data_version('weekly_plan')
+
+    def _rebuild_plan_index(self):
+        """Baut den Index Plan-ID -> (Datum, Position) aus self.weekly_plan neu auf."""
+        self._plan_index: Dict[str, Tuple[str, int]] = {}
+        for date_str in self._weekly_plan:
+            self._reindex_plan_date(date_str)
+
+    def _reindex_plan_date(self, date_str: str):
+        """Aktualisiert die Index-Positionen aller Einträge eines Datums."""
+        for index, entry in enumerate(self._weekly_plan.get(date_str, [])):
+            plan_id = entry.get('id')
+            if plan_id:
+                self._plan_index[plan_id] = (date_str, index)
+
+    def _locate_plan_entry(self, plan_id: str) -> Optional[Tuple[str, int]]:
+        """
+        Findet Datum und Position eines Planeintrags über den ID-Index.
+
+        Wurde der Plan von außen verändert und passt der Index nicht mehr,
+        wird er einmal neu aufgebaut.
+        """
+        for attempt in range(2):
+            location = self._plan_index.get(plan_id)
+            if location is not None:
+                date_str, index = location
+                entries = self._weekly_plan.get(date_str, [])
+                if index < len(entries) and entries[index].get('id') == plan_id:
+                    return location
+            if attempt == 0:
+                self._rebuild_plan_index()
+        return None
+
+    def _plan_changed(self):
+        """Speichert den Wochenplan bzw. merkt die Änderung für das Ende des laufenden Batches vor."""
+        if self._plan_batch_depth > 0:
+            self._plan_batch_dirty = True
+        else:
+            self.save_weekly_plan()
+
+    @contextmanager
+    def plan_batch(self):
+        """
+        Fasst mehrere Änderungen am Wochenplan zusammen; gespeichert wird einmal am Ende.
+
+        Beispiel:
+            with data_manager.plan_batch():
+                for entry in entries:
+                    data_manager.delete_plan_entry(entry['id'])
+        """
+        with self.weekly_plan_lock:
+            self._plan_batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._plan_batch_depth -= 1
+                if self._plan_batch_depth == 0 and self._plan_batch_dirty:
+                    self._plan_batch_dirty = False
+                    self.save_weekly_plan()
+
     def add_plan_entry(self, date: datetime.date, kategorie: str, unterkategorie: str,
                       aktion: str, **kwargs) -> str:
         """Fügt neue Session zum Plan hinzu."""
         date_str = date.strftime('%Y-%m-%d')
-        if date_str not in self.weekly_plan:
-            self.weekly_plan[date_str] = []
-
         entry = {
             'id': str(uuid.uuid4()),
             'kategorie': kategorie,
@@ -1736,8 +2483,11 @@ class DataManager:
             'prioritaet': kwargs.get('prioritaet', 'mittel')
         }
 
-        self.weekly_plan[date_str].append(entry)
-        self.save_weekly_plan()
+        with self.weekly_plan_lock:
+            entries = self.weekly_plan.setdefault(date_str, [])
+            entries.append(entry)
+            self._plan_index[entry['id']] = (date_str, len(entries) - 1)
+            self._plan_changed()
         logging.info(f"Planeintrag hinzugefügt: {kategorie} - {unterkategorie} am {date_str}")
         return entry['id']
 
@@ -1748,35 +2498,69 @@ class DataManager:
 
     def get_plan_entry(self, plan_id: str) -> Optional[dict]:
         """Findet spezifischen Eintrag anhand ID."""
-        for date, entries in self.weekly_plan.items():
-            for entry in entries:
-                if entry['id'] == plan_id:
-                    return entry
-        return None
+        with self.weekly_plan_lock:
+            location = self._locate_plan_entry(plan_id)
+            if location is None:
+                return None
+            date_str, index = location
+            return self.weekly_plan[date_str][index]
 
     def update_plan_entry(self, plan_id: str, updates: dict) -> bool:
         """Aktualisiert einen Planeintrag."""
-        entry = self.get_plan_entry(plan_id)
-        if entry:
-            entry.update(updates)
-            self.save_weekly_plan()
-            logging.info(f"Planeintrag {plan_id} aktualisiert.")
-            return True
+        with self.weekly_plan_lock:
+            entry = self.get_plan_entry(plan_id)
+            if entry:
+                entry.update(updates)
+                self._plan_changed()
+                logging.info(f"Planeintrag {plan_id} aktualisiert.")
+                return True
         logging.warning(f"Planeintrag {plan_id} nicht gefunden.")
         return False
 
     def delete_plan_entry(self, plan_id: str) -> bool:
         """Löscht einen Planeintrag."""
-        for date, entries in self.weekly_plan.items():
-            original_length = len(entries)
-            self.weekly_plan[date] = [e for e in entries if e['id'] != plan_id]
-            if len(self.weekly_plan[date]) < original_length:
-                self.save_weekly_plan()
+        with self.weekly_plan_lock:
+            location = self._locate_plan_entry(plan_id)
+            if location is not None:
+                date_str, index = location
+                entries = self.weekly_plan[date_str]
+                # Neue Liste statt Löschen an Ort und Stelle: Aufrufer dürfen über die alte Liste iterieren
+                self.weekly_plan[date_str] = entries[:index] + entries[index + 1:]
+                del self._plan_index[plan_id]
+                self._reindex_plan_date(date_str)
+                self._plan_changed()
                 logging.info(f"Planeintrag {plan_id} gelöscht.")
                 return True
         logging.warning(f"Planeintrag {plan_id} nicht gefunden.")
         return False
 
+    def apply_plan_changes(self, adds: Optional[List[Dict]] = None,
+                           updates: Optional[Dict[str, Dict]] = None,
+                           deletes: Optional[List[str]] = None) -> List[str]:
+        """
+        Wendet mehrere Änderungen am Wochenplan an und speichert einmal.
+
+        Args:
+            adds (Optional[List[Dict]]): Neue Einträge; je ein Dict mit den Argumenten von
+                add_plan_entry (date, kategorie, unterkategorie, aktion, weitere optional).
+            updates (Optional[Dict[str, Dict]]): Plan-ID -> zu ändernde Felder.
+            deletes (Optional[List[str]]): Zu löschende Plan-IDs.
+
+        Returns:
+            List[str]: Die IDs der neuen Einträge (in der Reihenfolge von adds).
+        """
+        new_ids = []
+        with self.plan_batch():
+            for plan_id in deletes or []:
+                self.delete_plan_entry(plan_id)
+            for plan_id, changes in (updates or {}).items():
+                self.update_plan_entry(plan_id, changes)
+            for add in adds or []:
+                new_ids.append(self.add_plan_entry(**add))
+        logging.info(f"Wochenplan: {len(deletes or [])} gelöscht, {len(updates or {})} aktualisiert, "
+                     f"{len(new_ids)} hinzugefügt.")
+        return new_ids
+
     def get_plan_for_week(self, start_date: datetime.date) -> dict:
         """Gibt alle Sessions für eine Woche zurück (7 Tage ab start_date)."""
         week_plan = {}
@@ -1791,6 +2575,12 @@ class DataManager:
 
     def load_learning_sets(self) -> dict:
         """Lädt Lernsets aus JSON."""
+        if self.storage is not None:
+            try:
+                return self.storage.load_learning_sets()
+            except Exception as e:
+                logging.error(f"Fehler beim Laden der Lernsets: {e}")
+                return {'lernsets': {}, 'aktives_set': None}
         if not os.path.exists(self.learning_sets_file):
             logging.info(f"Lernsets-Datei {self.learning_sets_file} existiert nicht. Initialisiere leere Lernsets.")
             return {'lernsets': {}, 'aktives_set': None}
@@ -1803,10 +2593,12 @@ class DataManager:
             logging.error(f"Fehler beim Laden der Lernsets: {e}")
             return {'lernsets': {}, 'aktives_set': None}
 
-    def save_learning_sets(self) -> bool:
+    def _write_learning_sets(self) -> bool:
         """Speichert Lernsets als JSON."""
         try:
             with self.learning_sets_lock:
+                if self.storage is not None:
+                    return self.storage.save_learning_sets(self.learning_sets)
                 temp_file_path = self.learning_sets_file + ".tmp"
                 with open(temp_file_path, 'w', encoding='utf-8') as f:
                     json.dump(self.learning_sets, f, indent=4, ensure_ascii=False)
@@ -1897,6 +2689,10 @@ class DataManager:
 
     def load_algorithm_settings(self) -> dict:
         """Lädt Algorithmus-Einstellungen."""
+        if self.storage is not None:
+            settings = self.storage.load_document(DOCUMENT_ALGORITHM_SETTINGS)
+            if settings is not None:
+                return settings
         if not os.path.exists(self.algorithm_settings_file):
             logging.info(f"Algorithmus-Einstellungen {self.algorithm_settings_file} existieren nicht. Initialisiere Standardwerte.")
             return {
@@ -1935,10 +2731,12 @@ class DataManager:
                 }
             }
 
-    def save_algorithm_settings(self) -> bool:
+    def _write_algorithm_settings(self) -> bool:
         """Speichert Algorithmus-Einstellungen."""
         try:
             with self.algorithm_settings_lock:
+                if self.storage is not None:
+                    return self.storage.save_document(DOCUMENT_ALGORITHM_SETTINGS, self.algorithm_settings)
                 temp_file_path = self.algorithm_settings_file + ".tmp"
                 with open(temp_file_path, 'w', encoding='utf-8') as f:
                     json.dump(self.algorithm_settings, f, indent=4, ensure_ascii=False)
@@ -1962,7 +2760,8 @@ class DataManager:
         if 'gewichtungen' not in self.algorithm_settings:
             self.algorithm_settings['gewichtungen'] = {}
         self.algorithm_settings['gewichtungen'].update(weights)
-        return self.save_algorithm_settings()
+        # Die Oberfläche meldet "gespeichert": sofort schreiben statt nur vorzumerken
+        return self.save_algorithm_settings() and self.flush(['algorithm_settings'])
 
     def get_algorithm_weights(self) -> dict:
         """Gibt die aktuellen Gewichtungen zurück."""
@@ -1988,6 +2787,12 @@ class DataManager:
 
     def load_planners(self) -> dict:
         """Lädt Planer aus JSON."""
+        if self.storage is not None:
+            try:
+                return self.storage.load_planners()
+            except Exception as e:
+                logging.error(f"Fehler beim Laden der Planer: {e}")
+                return {'planners': {}, 'active_planner': None}
         if not os.path.exists(self.planners_file):
             logging.info(f"Planer-Datei {self.planners_file} existiert nicht. Initialisiere leere Planer.")
             return {'planners': {}, 'active_planner': None}
@@ -2000,10 +2805,12 @@ class DataManager:
             logging.error(f"Fehler beim Laden der Planer: {e}")
             return {'planners': {}, 'active_planner': None}
 
-    def save_planners(self) -> bool:
+    def _write_planners(self) -> bool:
         """Speichert Planer als JSON."""
         try:
             with self.planners_lock:
+                if self.storage is not None:
+                    return self.storage.save_planners(self.planners)
                 temp_file_path = self.planners_file + ".tmp"
                 with open(temp_file_path, 'w', encoding='utf-8') as f:
                     json.dump(self.planners, f, indent=4, ensure_ascii=False)
@@ -2020,6 +2827,185 @@ class DataManager:
         """Speichert alle Daten (für Rückwärtskompatibilität mit PlannerManager)."""
         return self.save_planners()
 
+    # -------------------------------------------------------------------------
+    # SPEICHERN (WRITE-BEHIND)
+    # -------------------------------------------------------------------------
+    # Die save_*-Methoden kehren sofort zurück; der SaveScheduler fasst Änderungen
+    # zusammen und ruft die passenden _write_*-Methoden im Hintergrund auf.
+
+    def save_flashcards(self) -> bool:
+        """Markiert die Flashcards als geändert (Schreiben im Hintergrund)."""
+        self.bump_data_version('flashcards')
+        return self.save_scheduler.mark_dirty('flashcards')
+
+    def save_categories(self) -> bool:
+        """Markiert die Kategorien als geändert (Schreiben im Hintergrund)."""
+        self.bump_data_version('categories')
+        return self.save_scheduler.mark_dirty('categories')
+
+    def save_stats(self) -> bool:
+        """Markiert die Statistiken als geändert (Schreiben im Hintergrund)."""
+        self.bump_data_version('stats')
+        return self.save_scheduler.mark_dirty('stats')
+
+    def save_weekly_plan(self) -> bool:
+        """Markiert den Wochenplan als geändert (Schreiben im Hintergrund)."""
+        self.bump_data_version('weekly_plan')
+        return self.save_scheduler.mark_dirty('weekly_plan')
+
+    def save_learning_sets(self) -> bool:
+        """Markiert die Lernsets als geändert (Schreiben im Hintergrund)."""
+        self.bump_data_version('learning_sets')
+        return self.save_scheduler.mark_dirty('learning_sets')
+
+    def save_algorithm_settings(self) -> bool:
+        """Markiert die Algorithmus-Einstellungen als geändert (Schreiben im Hintergrund)."""
+        self.bump_data_version('algorithm_settings')
+        return self.save_scheduler.mark_dirty('algorithm_settings')
+
+    def save_planners(self) -> bool:
+        """Markiert die Planer als geändert (Schreiben im Hintergrund)."""
+        self.bump_data_version('planners')
+        return self.save_scheduler.mark_dirty('planners')
+
+    def flush(self, names: Optional[List[str]] = None) -> bool:
+        """
+        Schreibt alle ausstehenden Änderungen sofort (z.B. beim Beenden).
+        Die save_*-Methoden liefern nur, ob vorgemerkt wurde; wer einen geschriebenen
+        Stand braucht (Meldung "gespeichert", Wiederherstellung), ruft flush() auf.
+
+        Args:
+            names (Optional[List[str]]): Nur diese Sammlungen schreiben (Standard: alle).
+
+        Returns:
+            bool: True wenn alle Schreibvorgänge erfolgreich waren.
+        """
+        success = self.save_scheduler.flush(names)
+        if success:
+            logging.info("Alle ausstehenden Änderungen geschrieben.")
+        else:
+            logging.error(f"Nicht alle Änderungen konnten geschrieben werden: {self.save_scheduler.metrics()['last_error']}")
+        return success
+
+    def get_save_metrics(self) -> Dict:
+        """Kennzahlen zu ausstehenden und erledigten Hintergrund-Schreibvorgängen."""
+        return self.save_scheduler.metrics()
+
+    # -------------------------------------------------------------------------
+    # VERSIONSZÄHLER UND MEMOISIERUNG
+    # -------------------------------------------------------------------------
+    # Jede Änderung an einer Sammlung erhöht deren Zähler (save_*, Neuzuweisung,
+    # Kartenindex, neue Sitzung, neues Fälligkeitsdatum), auch bevor geschrieben wird.
+
+    def bump_data_version(self, collection: str):
+        """Erhöht den Versionszähler einer Sammlung (z.B. "flashcards", "stats")."""
+        with self._data_versions_lock:
+            self._data_versions[collection] = self._data_versions.get(collection, 0) + 1
+
+    def data_version(self, collection: str) -> int:
+        """Aktueller Versionszähler einer Sammlung (monoton steigend)."""
+        return self._data_versions.get(collection, 0)
+
+    def data_versions(self, *collections: str) -> Tuple[int, ...]:
+        """Versionszähler mehrerer Sammlungen, z.B. als Teil eines Cache-Schlüssels."""
+        with self._data_versions_lock:
+            return tuple(self._data_versions.get(collection, 0) for collection in collections)
+
+    def memoize(self, name: str, args: Tuple, collections: Tuple[str, ...], compute: Callable[[], object]):
+        """
+        Gibt ein gespeichertes Ergebnis zurück, solange sich Argumente und die Versionen der
+        angegebenen Sammlungen nicht geändert haben; sonst wird compute() aufgerufen.
+
+        Args:
+            name (str): Name der Berechnung (Teil des Schlüssels).
+            args (Tuple): Hashbare Argumente der Berechnung.
+            collections (Tuple[str, ...]): Sammlungen, von denen das Ergebnis abhängt.
+            compute (Callable[[], object]): Berechnet das Ergebnis.
+        """
+        key = (name, args, collections, self.data_versions(*collections))
+        return self.memo_cache.get_or_compute(key, compute)
+
+    def get_memo_metrics(self) -> Dict:
+        """Kennzahlen des Ergebnis-Caches (Treffer, Fehlzugriffe, Größe) und aktuelle Versionszähler."""
+        metrics = self.memo_cache.metrics()
+        with self._data_versions_lock:
+            metrics['versions'] = dict(self._data_versions)
+        return metrics
+
+    # -------------------------------------------------------------------------
+    # SPEICHER-BACKEND (MIGRATION / EXPORT)
+    # -------------------------------------------------------------------------
+
+    def migrate_to_sqlite(self) -> bool:
+        """
+        Überträgt alle geladenen Daten in die SQLite-Datenbank im Datenverzeichnis
+        und verwendet sie ab sofort als Speicher-Backend. Nur dort wird sie beim
+        Start wiedergefunden. Die JSON-Dateien bleiben unverändert liegen.
+
+        Returns:
+            bool: True wenn erfolgreich, False sonst.
+        """
+        db_path = self.sqlite_db_file
+        # Ausstehende JSON-Schreibvorgänge abschließen, bevor das Backend gewechselt wird
+        self.flush()
+        try:
+            backend = SQLiteStorageBackend(db_path)
+            with self.flashcards_lock, self.stats_lock, self.categories_lock:
+                backend.save_flashcards([card.to_dict() for card in self.flashcards])
+                backend.save_stats(self.stats)
+                backend.save_document(DOCUMENT_CATEGORIES, {k: dict(v) for k, v in self.categories.items()})
+            backend.save_weekly_plan(self.weekly_plan)
+            backend.save_learning_sets(self.learning_sets)
+            backend.save_document(DOCUMENT_ALGORITHM_SETTINGS, self.algorithm_settings)
+            backend.save_planners(self.planners)
+        except Exception as e:
+            logging.error(f"Migration nach SQLite ({db_path}) fehlgeschlagen: {e}", exc_info=True)
+            return False
+
+        if self.storage is not None:
+            self.storage.close()
+        self.storage = backend
+        # Journal-Einträge sind jetzt in der Datenbank enthalten
+        self.review_journal.truncate()
+        self.stats_log.truncate()
+        logging.info(f"Daten nach SQLite migriert: {db_path}")
+        return True
+
+    def export_to_json(self, target_dir: str) -> bool:
+        """
+        Schreibt alle Daten als JSON-Dateien (Import-/Exportformat) in ein Verzeichnis,
+        unabhängig vom aktiven Speicher-Backend.
+
+        Args:
+            target_dir (str): Zielverzeichnis.
+
+        Returns:
+            bool: True wenn erfolgreich, False sonst.
+        """
+        documents = {
+            os.path.basename(self.flashcards_file): lambda: [card.to_dict() for card in self.flashcards],
+            os.path.basename(self.categories_file): lambda: {k: dict(v) for k, v in self.categories.items()},
+            os.path.basename(self.stats_file): lambda: self.stats,
+            os.path.basename(self.weekly_plan_file): lambda: self.weekly_plan,
+            os.path.basename(self.learning_sets_file): lambda: self.learning_sets,
+            os.path.basename(self.algorithm_settings_file): lambda: self.algorithm_settings,
+            os.path.basename(self.planners_file): lambda: self.planners,
+        }
+        try:
+            os.makedirs(target_dir, exist_ok=True)
+            with self.flashcards_lock, self.stats_lock, self.categories_lock:
+                for file_name, get_data in documents.items():
+                    target_path = os.path.join(target_dir, file_name)
+                    temp_file_path = target_path + ".tmp"
+                    with open(temp_file_path, 'w', encoding='utf-8') as f:
+                        json.dump(get_data(), f, indent=4, ensure_ascii=False)
+                    shutil.move(temp_file_path, target_path)
+            logging.info(f"Alle Daten als JSON nach {target_dir} exportiert.")
+            return True
+        except Exception as e:
+            logging.error(f"Fehler beim JSON-Export nach {target_dir}: {e}")
+            return False
+
 # ------------------------------------------------------------------------------
 # INITIALISIERUNG DES LOGGINGS UND BEISPIELFUNKTION
 # ------------------------------------------------------------------------------
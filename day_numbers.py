@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Einheitliche Datumsdarstellung für das Flashcard-Projekt.
+Intern werden Tage als ganze Zahlen seit dem 01.01.1970 (Epochentag) und Zeitpunkte als
+Sekunden seit der Epoche (lokale Zeit, ohne Zeitzone) behandelt. Die gespeicherten Formate
+("TT.MM.JJJJ" in Karten und Statistiken, ISO in den Leitner-Feldern, "JJJJ-MM-TT" im
+Wochenplan) bleiben unverändert; sie werden nur hier gelesen bzw. für Anzeige und
+Speicherung erzeugt. Jeder Text wird dabei nur einmal geparst (Cache).
+"""
+
+import datetime
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+STATS_DATE_FORMAT = "%d.%m.%Y"
+PLAN_DATE_FORMAT = "%Y-%m-%d"
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_EPOCH = datetime.datetime(1970, 1, 1)
+_SECONDS_PER_DAY = 86400
+
+
+def day_of(value: Union[datetime.date, datetime.datetime]) -> int:
+    """Epochentag eines date- oder datetime-Objekts."""
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def to_date(day: int) -> datetime.date:
+    """date-Objekt zu einem Epochentag."""
+    return datetime.date.fromordinal(day + _EPOCH_ORDINAL)
+
+
+def today() -> int:
+    """Epochentag von heute."""
+    return day_of(datetime.date.today())
+
+
+@lru_cache(maxsize=65536)
+def parse_day(value: Optional[str]) -> Optional[int]:
+    """
+    Epochentag zu einem gespeicherten Datum.
+
+    Args:
+        value (Optional[str]): "TT.MM.JJJJ", "JJJJ-MM-TT" oder ein ISO-Zeitpunkt.
+
+    Returns:
+        Optional[int]: Der Epochentag oder None bei leeren/ungültigen Werten.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        if value[4:5] == '-':
+            return day_of(datetime.date.fromisoformat(value[:10]))
+        return day_of(datetime.datetime.strptime(value, STATS_DATE_FORMAT))
+    except ValueError:
+        return None
+
+
+def format_day(day: int, date_format: str = STATS_DATE_FORMAT) -> str:
+    """Formatiert einen Epochentag (Standard: TT.MM.JJJJ)."""
+    return to_date(day).strftime(date_format)
+
+
+@lru_cache(maxsize=65536)
+def parse_seconds(value: Optional[str]) -> Optional[int]:
+    """
+    Sekunden seit der Epoche zu einem ISO-Zeitpunkt (z.B. leitner_next_review_date).
+
+    Returns:
+        Optional[int]: Die Sekunden oder None bei leeren/ungültigen Werten.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        moment = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return seconds_of(moment)
+
+
+def seconds_of(moment: datetime.datetime) -> int:
+    """Sekunden seit der Epoche eines (naiven) datetime-Objekts."""
+    return int((moment.replace(tzinfo=None) - _EPOCH).total_seconds())
+
+
+def to_datetime(seconds: int) -> datetime.datetime:
+    """datetime-Objekt zu Sekunden seit der Epoche."""
+    return _EPOCH + datetime.timedelta(seconds=seconds)
+
+
+def day_of_seconds(seconds: int) -> int:
+    """Epochentag eines Zeitpunkts in Sekunden."""
+    return seconds // _SECONDS_PER_DAY
+
+
+def week_bounds(day: int) -> Tuple[int, int]:
+    """Erster und letzter Epochentag (Montag bis Sonntag) der Woche eines Tages."""
+    start = day - to_date(day).weekday()
+    return start, start + 6
+
+
+def month_bounds(day: int) -> Tuple[int, int]:
+    """Erster und letzter Epochentag des Monats eines Tages."""
+    date = to_date(day)
+    first = date.replace(day=1)
+    following = first.replace(year=first.year + 1, month=1) if first.month == 12 else first.replace(month=first.month + 1)
+    return day_of(first), day_of(following) - 1
+
+
+def parse_date(value: str) -> datetime.date:
+    """Wie parse_day, liefert aber ein date-Objekt und löst bei ungültigen Werten ValueError aus."""
+    day = parse_day(value)
+    if day is None:
+        raise ValueError(f"Ungültiges Datum: {value!r}")
+    return to_date(day)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Kapazitätsgerechte Verteilung von Fälligkeitsterminen.
+Jede Karte darf auf einen Tag ihres Fensters [0, Fensterende] (Tage ab dem Starttag) gelegt
+werden. Die Karten mit dem engsten Fenster werden zuerst verteilt, jeweils auf den Tag mit
+der geringsten Last, der die Grenze seines Wochentags noch nicht erreicht hat. Die Tage des
+Fensters liegen in einem Heap; da nur der gewählte Tag seine Last ändert, kostet jede Karte
+O(log Tage). Sind alle Tage eines Fensters voll, wird der Tag mit dem kleinsten Überhang gewählt.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Sequence
+
+from day_numbers import to_date
+
+
+def _day_key(load: int, capacity: Optional[int], day: int):
+    """Sortierschlüssel eines Tages: erst Tage mit freier Kapazität, dann geringste Last bzw. kleinster Überhang, dann früher."""
+    if capacity is not None and load >= capacity:
+        return (True, load - capacity, day)
+    return (False, load, day)
+
+
+def day_capacities(start_day: int, horizon: int, day_capacity: Optional[Sequence[int]]) -> List[Optional[int]]:
+    """Kapazität je Tag ab start_day aus den Grenzen je Wochentag (Montag-Sonntag); None = unbegrenzt."""
+    if day_capacity is None:
+        return [None] * horizon
+    weekday = to_date(start_day).weekday()
+    return [max(0, int(day_capacity[(weekday + offset) % 7])) for offset in range(horizon)]
+
+
+def balance_due_days(windows: Sequence[int], start_day: int,
+                     day_capacity: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Verteilt Karten auf Tage innerhalb ihres Fensters.
+
+    Args:
+        windows (Sequence[int]): Letzter erlaubter Tag (ab start_day) je Karte.
+        start_day (int): Epochentag von Tag 0.
+        day_capacity (Optional[Sequence[int]]): Kartengrenze je Wochentag (Montag-Sonntag), z.B.
+            day_card_limits des Planers; None für unbegrenzt (dann nur Spitzen glätten).
+
+    Returns:
+        List[int]: Tag (ab start_day) je Karte, in der Reihenfolge von windows.
+    """
+    if not windows:
+        return []
+    horizon = max(windows) + 1
+    capacities = day_capacities(start_day, horizon, day_capacity)
+    loads = [0] * horizon
+
+    assigned = [0] * len(windows)
+    heap: List = []
+    next_day = 0
+    for card in sorted(range(len(windows)), key=windows.__getitem__):
+        # Fenster wachsen monoton: neue Tage in den Heap aufnehmen
+        while next_day <= windows[card]:
+            heapq.heappush(heap, (_day_key(loads[next_day], capacities[next_day], next_day), next_day))
+            next_day += 1
+        _, day = heapq.heappop(heap)
+        assigned[card] = day
+        loads[day] += 1
+        heapq.heappush(heap, (_day_key(loads[day], capacities[day], day), day))
+    return assigned
+
+
+def load_histogram(days: Sequence[int], horizon: int) -> Dict:
+    """
+    Anzahl Karten je Tag (ab Tag 0); Tage vor 0 zählen zu Tag 0.
+
+    Returns:
+        Dict: 'loads' (Liste mit horizon Einträgen) und 'later' (Karten nach dem Zeitraum).
+    """
+    loads = [0] * horizon
+    later = 0
+    for day in days:
+        if day >= horizon:
+            later += 1
+        else:
+            loads[max(0, day)] += 1
+    return {'loads': loads, 'later': later}
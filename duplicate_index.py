@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Duplikaterkennung für das Flashcard-Projekt.
+Exakte Duplikate werden über einen normalisierten Schlüssel aus Frage und Antwort erkannt
+(Akzente bleiben erhalten, "zählen" und "zahlen" sind verschiedene Karten), ähnliche Karten
+(Beinahe-Duplikate) über MinHash-Signaturen mit Locality Sensitive Hashing auf akzentfreiem Text.
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from search_index import normalize
+
+# MinHash: Signaturlänge = Bänder * Zeilen pro Band.
+# Mit 8 x 4 werden Paare ab etwa 0.6 Jaccard-Ähnlichkeit zuverlässig Kandidaten.
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4
+# Mindest-Ähnlichkeit (Jaccard über Zeichen-Shingles), ab der Karten als ähnlich gemeldet werden
+NEAR_DUPLICATE_THRESHOLD = 0.8
+SHINGLE_SIZE = 5
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_card_text(text: Optional[str]) -> str:
+    """Normalisiert einen Kartentext für den Ähnlichkeitsvergleich (Kleinschreibung, Akzente, Leerraum)."""
+    return _WHITESPACE_RE.sub(' ', normalize(text or '')).strip()
+
+
+def exact_card_text(text: Optional[str]) -> str:
+    """Normalisiert einen Kartentext für exakte Duplikate (NFC, Kleinschreibung, Leerraum; Akzente bleiben)."""
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFC', (text or '').casefold())).strip()
+
+
+def duplicate_key(question: Optional[str], answer: Optional[str]) -> Tuple[str, str]:
+    """Schlüssel für exakte Duplikate: normalisierte Frage und Antwort."""
+    return exact_card_text(question), exact_card_text(answer)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Zeichen-Shingles eines (bereits normalisierten) Texts."""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    if not first or not second:
+        return 0.0
+    common = len(first & second)
+    return common / (len(first) + len(second) - common)
+
+
+class MinHashIndex:
+    """
+    LSH-Index über MinHash-Signaturen von Kartentexten.
+
+    Karten, die in mindestens einem Band dieselben Signaturwerte haben, sind Kandidaten;
+    die tatsächliche Ähnlichkeit wird anschließend über die Shingle-Mengen geprüft.
+    """
+
+    def __init__(self, bands: int = MINHASH_BANDS, rows: int = MINHASH_ROWS,
+                 threshold: float = NEAR_DUPLICATE_THRESHOLD, seed: int = 1):
+        """
+        Initialisiert einen leeren Index.
+
+        Args:
+            bands (int): Anzahl LSH-Bänder.
+            rows (int): Signaturwerte pro Band.
+            threshold (float): Mindest-Ähnlichkeit für Treffer.
+            seed (int): Startwert für die Hashfunktion (fest, damit Signaturen reproduzierbar sind).
+        """
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        self._salt = seed.to_bytes(8, 'little')
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(bands)]
+        self._shingles: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def _signature(self, shingle_set: Set[str]) -> List[int]:
+        # One-Permutation-Hashing: ein Hash pro Shingle, aufgeteilt auf bands * rows Fächer
+        # (Minimum je Fach). Leere Fächer übernehmen den Wert des nächsten belegten Fachs.
+        size = self.bands * self.rows
+        signature: List[Optional[int]] = [None] * size
+        for shingle in shingle_set:
+            value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8,
+                                                   salt=self._salt).digest(), 'little')
+            slot, rest = value % size, value // size
+            if signature[slot] is None or rest < signature[slot]:
+                signature[slot] = rest
+        for slot in range(size):
+            if signature[slot] is None:
+                for distance in range(1, size):
+                    borrowed = signature[(slot + distance) % size]
+                    if borrowed is not None and borrowed >= 0:
+                        # Negativ markiert, damit übernommene Werte nicht weitergereicht werden
+                        signature[slot] = -(borrowed * size + distance) - 1
+                        break
+        return signature
+
+    def _band_keys(self, signature: List[int]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def add(self, doc_id: str, text: str):
+        """Nimmt einen (normalisierten) Text unter doc_id auf."""
+        shingle_set = shingles(text)
+        if not shingle_set:
+            return
+        self._shingles[doc_id] = shingle_set
+        for band, key in self._band_keys(self._signature(shingle_set)):
+            self._buckets[band].setdefault(key, set()).add(doc_id)
+
+    def query(self, text: str, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Sucht ähnliche Texte.
+
+        Args:
+            text (str): Normalisierter Text.
+            exclude (Optional[str]): Diese doc_id nicht zurückgeben.
+
+        Returns:
+            List[Tuple[str, float]]: (doc_id, Ähnlichkeit) ab dem Schwellwert, ähnlichste zuerst.
+        """
+        shingle_set = shingles(text)
+        if not shingle_set:
+            return []
+        candidates: Set[str] = set()
+        for band, key in self._band_keys(self._signature(shingle_set)):
+            candidates.update(self._buckets[band].get(key, ()))
+        candidates.discard(exclude)
+        matches = []
+        for doc_id in candidates:
+            similarity = jaccard(shingle_set, self._shingles[doc_id])
+            if similarity >= self.threshold:
+                matches.append((doc_id, similarity))
+        matches.sort(key=lambda match: -match[1])
+        return matches
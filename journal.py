@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Append-only Journal für das Flashcard-Projekt.
+Speichert kleine Änderungsdatensätze zeilenweise (JSON Lines), statt bei jeder
+Änderung die komplette Datei neu zu schreiben.
+"""
+
+import json
+import os
+import logging
+import threading
+from typing import Dict, List, Tuple
+
+
+class AppendOnlyJournal:
+    """
+    Zeilenbasiertes Journal (eine JSON-Zeile pro Datensatz).
+
+    Datensätze werden nur angehängt. Beim Lesen werden unvollständige oder
+    beschädigte Zeilen (z.B. nach einem Absturz während des Schreibens) übersprungen.
+    """
+
+    def __init__(self, file_path: str, fsync: bool = True):
+        """
+        Initialisiert das Journal.
+
+        Args:
+            file_path (str): Pfad zur Journal-Datei.
+            fsync (bool): Ob nach jedem Anhängen os.fsync aufgerufen wird.
+        """
+        self.file_path = file_path
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self._handle = None
+        self._record_count = self._count_existing_records()
+        # Wird bei jedem Leeren erhöht; gemerkte Positionen älterer Generationen sind hinfällig
+        self._generation = 0
+
+    def _count_existing_records(self) -> int:
+        """Zählt die bereits vorhandenen Zeilen im Journal."""
+        if not os.path.exists(self.file_path):
+            return 0
+        try:
+            with open(self.file_path, 'rb') as f:
+                return sum(1 for line in f if line.strip())
+        except OSError as e:
+            logging.error(f"Journal {self.file_path} konnte nicht gelesen werden: {e}")
+            return 0
+
+    @property
+    def record_count(self) -> int:
+        """Anzahl der Datensätze seit der letzten Kompaktierung."""
+        return self._record_count
+
+    def append(self, record: Dict) -> bool:
+        """
+        Hängt einen Datensatz an das Journal an.
+
+        Args:
+            record (Dict): Der zu speichernde Datensatz (muss JSON-serialisierbar sein).
+
+        Returns:
+            bool: True wenn erfolgreich, False sonst.
+        """
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+        with self.lock:
+            try:
+                if self._handle is None:
+                    os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+                    self._handle = open(self.file_path, 'a', encoding='utf-8')
+                self._handle.write(line)
+                self._handle.flush()
+                if self.fsync:
+                    os.fsync(self._handle.fileno())
+                self._record_count += 1
+                return True
+            except Exception as e:
+                logging.error(f"Fehler beim Schreiben in das Journal {self.file_path}: {e}")
+                self._close_handle()
+                return False
+
+    def read_records(self) -> List[Dict]:
+        """
+        Liest alle gültigen Datensätze aus dem Journal.
+
+        Returns:
+            List[Dict]: Die Datensätze in Schreibreihenfolge.
+        """
+        records = []
+        with self.lock:
+            if self._handle is not None:
+                self._handle.flush()
+            if not os.path.exists(self.file_path):
+                return records
+            try:
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    for line_number, line in enumerate(f, start=1):
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            logging.warning(f"Journal {self.file_path}: Beschädigte Zeile {line_number} übersprungen.")
+                            continue
+                        if isinstance(record, dict):
+                            records.append(record)
+            except OSError as e:
+                logging.error(f"Fehler beim Lesen des Journals {self.file_path}: {e}")
+        return records
+
+    def position(self) -> Tuple[int, int]:
+        """Aktuelle Position (Generation, Anzahl Datensätze) für truncate_through."""
+        with self.lock:
+            return self._generation, self._record_count
+
+    def truncate(self) -> bool:
+        """
+        Leert das Journal, nachdem sein Inhalt in einen Snapshot übernommen wurde.
+
+        Returns:
+            bool: True wenn erfolgreich, False sonst.
+        """
+        with self.lock:
+            return self._truncate_locked()
+
+    def truncate_through(self, position: Tuple[int, int]) -> bool:
+        """
+        Entfernt die Datensätze bis zu einer mit position() gemerkten Stelle, z.B. nachdem
+        ein Snapshot mit diesem Stand geschrieben wurde. Spätere Datensätze bleiben erhalten.
+
+        Returns:
+            bool: True wenn erfolgreich (oder nichts zu tun war), False sonst.
+        """
+        generation, count = position
+        with self.lock:
+            if generation != self._generation or count <= 0:
+                return True
+            if count >= self._record_count:
+                return self._truncate_locked()
+            self._close_handle()
+            temp_file_path = self.file_path + ".tmp"
+            try:
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    lines = [line for line in f if line.strip()]
+                with open(temp_file_path, 'w', encoding='utf-8') as f:
+                    f.writelines(lines[count:])
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file_path, self.file_path)
+                self._record_count = len(lines) - count
+                self._generation += 1
+                return True
+            except OSError as e:
+                logging.error(f"Fehler beim Kürzen des Journals {self.file_path}: {e}")
+                return False
+
+    def _truncate_locked(self) -> bool:
+        self._close_handle()
+        try:
+            if os.path.exists(self.file_path):
+                os.remove(self.file_path)
+            self._record_count = 0
+            self._generation += 1
+            return True
+        except OSError as e:
+            logging.error(f"Fehler beim Leeren des Journals {self.file_path}: {e}")
+            return False
+
+    def close(self):
+        """Schließt die offene Journal-Datei."""
+        with self.lock:
+            self._close_handle()
+
+    def _close_handle(self):
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+            self._handle = None
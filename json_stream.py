@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Inkrementelles Lesen von JSON-Arrays für das Flashcard-Projekt.
+Liest eine Datei blockweise und liefert die Elemente des obersten Arrays einzeln,
+ohne die gesamte Datei auf einmal zu parsen.
+"""
+
+import json
+import re
+from typing import Any, Iterator, TextIO, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+
+
+def iter_json_array(f: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[Any, int]]:
+    """
+    Liefert die Elemente eines JSON-Arrays nacheinander.
+
+    Args:
+        f (TextIO): Im Textmodus geöffnete Datei, deren oberstes Element ein Array ist.
+        chunk_size (int): Anzahl Zeichen pro Leseblock.
+
+    Yields:
+        Tuple[Any, int]: Das Element und die Anzahl bisher gelesener Zeichen (für Fortschrittsanzeigen).
+
+    Raises:
+        json.JSONDecodeError: Wenn die Datei kein gültiges JSON-Array enthält.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    offset = 0  # Anzahl Zeichen vor buffer[0]
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer += chunk
+        return True
+
+    def skip_whitespace(pos: int) -> int:
+        while True:
+            pos = _WHITESPACE_RE.match(buffer, pos).end()
+            if pos < len(buffer) or not read_more():
+                return pos
+
+    pos = skip_whitespace(0)
+    if pos >= len(buffer) or buffer[pos] != '[':
+        raise json.JSONDecodeError("Oberstes JSON-Element ist keine Liste", buffer, pos)
+    pos = skip_whitespace(pos + 1)
+    expect_element = True
+    first = True
+
+    while True:
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Unerwartetes Dateiende im JSON-Array", buffer, pos)
+        char = buffer[pos]
+        if char == ']' and (first or not expect_element):
+            return
+        if not expect_element:
+            if char != ',':
+                raise json.JSONDecodeError("Komma oder ']' erwartet", buffer, pos)
+            pos = skip_whitespace(pos + 1)
+            expect_element = True
+            continue
+
+        # Element dekodieren; bei unvollständigem Puffer weiterlesen
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if read_more():
+                    continue
+                raise
+            # Zahlen am Pufferende könnten abgeschnitten sein: weiterlesen, bis ein Trennzeichen folgt
+            if (end >= len(buffer) or buffer[end] not in _DELIMITERS) and read_more():
+                continue
+            break
+
+        yield item, offset + end
+        first = False
+        expect_element = False
+
+        pos = skip_whitespace(end)
+        # Bereits verarbeiteten Teil des Puffers gelegentlich verwerfen
+        if pos > chunk_size:
+            buffer = buffer[pos:]
+            offset += pos
+            pos = 0
@@ -266,6 +266,12 @@ class LearningSetManager:
         Returns:
             Dict: Statistiken inkl. Anzahl Karten, durchschnittliche Erfolgsquote, etc.
         """
+        return self.data_manager.memoize(
+            'set_statistics', (set_id,), ('learning_sets', 'flashcards', 'stats'),
+            lambda: self._compute_set_statistics(set_id))
+
+    def _compute_set_statistics(self, set_id: str) -> Dict:
+        """Berechnet die Set-Statistiken ohne Cache (siehe get_set_statistics)."""
         learning_set = self.get_set(set_id)
         if not learning_set:
             return {}
@@ -280,28 +286,15 @@ class LearningSetManager:
 
         for category, subcategory in combinations:
             # Zähle Karten
-            cards = [c for c in self.data_manager.flashcards
-                    if c.category.lower() == category.lower() and
-                       c.subcategory.lower() == subcategory.lower()]
-            total_cards += len(cards)
+            total_cards += len(self.data_manager.get_flashcards_in_category(category, subcategory))
 
             # Zähle fällige Karten aus Leitner-System
             # (benötigt leitner_system, daher optional)
 
-            # Erfolgsquote aus Statistiken
-            for stat in self.data_manager.stats:
-                if not isinstance(stat, dict) or 'details' not in stat:
-                    continue
-
-                for detail in stat['details']:
-                    if not isinstance(detail, dict):
-                        continue
-
-                    if (detail.get('category', '').lower() == category.lower() and
-                        detail.get('subcategory', '').lower() == subcategory.lower()):
-                        total_attempts += 1
-                        if detail.get('correct', False):
-                            total_correct += 1
+            # Erfolgsquote aus den Statistik-Summen
+            totals = self.data_manager.stats_rollup.totals(category, subcategory)
+            total_attempts += totals.attempts
+            total_correct += totals.correct
 
         success_rate = (total_correct / total_attempts * 100) if total_attempts > 0 else 0
 
@@ -6,51 +6,179 @@ Leitner-System mit 10 Levels - Optimierte Version
 Mit exponentiellen Multiplikatoren, Streak-System und verbessertem Punktabzug
 """
 
+import bisect
 import datetime
 import logging
 import math
-from dataclasses import dataclass, field
-from collections import defaultdict, deque
-from typing import Dict, List, Optional, Tuple
+import threading
+from collections import defaultdict
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from day_numbers import day_of, parse_day, to_date, today
+from due_balancer import balance_due_days, day_capacities, load_histogram
+
+
+# Wiederholungsintervall (Tage) je Level
+LEVEL_INTERVALS = {
+    1: 1,     # Level 1: täglich
+    2: 2,     # Level 2: alle 2 Tage
+    3: 4,     # Level 3: alle 4 Tage
+    4: 7,     # Level 4: wöchentlich
+    5: 10,    # Level 5: alle 10 Tage
+    6: 12,    # Level 6: alle 12 Tage
+    7: 14,    # Level 7: zwei-wöchentlich
+    8: 20,    # Level 8: alle 20 Tage
+    9: 25,    # Level 9: alle 25 Tage
+    10: 30    # Level 10: alle 30 Tage
+}
+
+# Straf-Faktor für falsche Antworten je Level
+LEVEL_PENALTY_FACTORS = {
+    1: 1.0,
+    2: 1.25,
+    3: 1.5,
+    4: 1.75,
+    5: 2.0,
+    6: 2.25,
+    7: 2.5,
+    8: 2.75,
+    9: 3.0,
+    10: 4.0
+}
+
+# Obergrenze der Punkte je Level 1-9 (darüber: Level 10), siehe LeitnerCard._update_level
+LEVEL_POINT_LIMITS = (10, 25, 50, 85, 120, 175, 220, 285, 350)
+
+
+def level_for_points(points) -> int:
+    """Level (1-10) zu einem Punktestand."""
+    return bisect.bisect_left(LEVEL_POINT_LIMITS, points or 0) + 1
+
+
+def _parse_datetime(date_value, default: Optional[Callable[[], datetime.datetime]] = None) -> datetime.datetime:
+    """
+    Wandelt einen gespeicherten Datumswert (ISO-String oder datetime) in ein datetime um.
+    Fehlende oder ungültige Werte ergeben default() bzw. den aktuellen Zeitpunkt.
+    """
+    if isinstance(date_value, datetime.datetime):
+        return date_value
+    if isinstance(date_value, str):
+        try:
+            return datetime.datetime.fromisoformat(date_value)
+        except ValueError:
+            pass
+    return default() if default else datetime.datetime.now()
+
+
+def _start_of_today() -> datetime.datetime:
+    return datetime.datetime.combine(datetime.date.today(), datetime.time.min)
+
+
+def _flashcard_field(name):
+    """Eigenschaft, die direkt ein Feld der zugrunde liegenden Flashcard liest und schreibt."""
+    def getter(self):
+        return getattr(self.flashcard, name)
+
+    def setter(self, value):
+        setattr(self.flashcard, name, value)
+        self.changed = True
+
+    return property(getter, setter)
+
+
+def _flashcard_datetime_field(name, default=None):
+    """Wie _flashcard_field, speichert datetime-Werte aber als ISO-String in der Flashcard."""
+    def getter(self):
+        return _parse_datetime(getattr(self.flashcard, name), default)
+
+    def setter(self, value):
+        setattr(self.flashcard, name, value.isoformat() if isinstance(value, datetime.datetime) else value)
+        self.changed = True
+
+    return property(getter, setter)
+
 
 class LeitnerCard:
     """
     Repräsentiert eine Lernkarte im optimierten 10-Level Leitner-System.
+
+    Schlanke Sicht auf eine Flashcard des DataManagers: Inhalt und Leitner-Zustand werden
+    nicht kopiert, sondern direkt in der Flashcard gelesen und geschrieben. Nur die
+    sitzungsbezogenen SRS-Zähler liegen in der Sicht selbst.
     """
 
-    def __init__(self, card_id, question, answer, category, subcategory, tags=None, image_path=None, question_image_path=None):
-        self.card_id = card_id
-        self.question = question
-        self.answer = answer
-        self.category = category
-        self.subcategory = subcategory
-        self.tags = tags or []
-        self.image_path = image_path
-        self.question_image_path = question_image_path
-        
-        # Leitner-spezifische Eigenschaften
-        self.points = 0
-        self.positive_streak = 0
-        self.negative_streak = 0
-        self.total_incorrect_count = 0  # NEU: Zählt alle falschen Antworten gesamt
-        self.consecutive_incorrect_sessions = 0  # NEU: Zählt aufeinanderfolgende Sessions mit falschen Antworten
-        self.last_reviewed = datetime.datetime.now()
-        self.next_review_date = datetime.datetime.now()
-        self.review_history = []
-        self.level = 1
+    __slots__ = ('flashcard', 'due_index', 'changed', 'consecutive_correct', 'repetitions',
+                 'success_count', 'difficulty_rating')
+
+    # Maximale Länge der Erfolgshistorie
+    SUCCESS_HISTORY_SIZE = 10
+
+    card_id = property(lambda self: self.flashcard.id)
+    question = _flashcard_field('question')
+    answer = _flashcard_field('answer')
+    category = _flashcard_field('category')
+    subcategory = _flashcard_field('subcategory')
+    tags = _flashcard_field('tags')
+    image_path = _flashcard_field('image_path')
+    question_image_path = _flashcard_field('question_image_path')
+
+    # Leitner-spezifische Eigenschaften
+    points = _flashcard_field('leitner_points')
+    positive_streak = _flashcard_field('leitner_positive_streak')
+    negative_streak = _flashcard_field('leitner_negative_streak')
+    total_incorrect_count = _flashcard_field('leitner_total_incorrect_count')  # Zählt alle falschen Antworten gesamt
+    consecutive_incorrect_sessions = _flashcard_field('leitner_consecutive_incorrect_sessions')  # Aufeinanderfolgende Sessions mit falschen Antworten
+    last_reviewed = _flashcard_datetime_field('leitner_last_reviewed')
+
+    # Attribute für graduellen Wiederaufbau
+    in_recovery_mode = _flashcard_field('leitner_in_recovery_mode')
+    recovery_interval = _flashcard_field('leitner_recovery_interval')
+    success_history = property(lambda self: self.flashcard.leitner_success_history)
+
+    def __init__(self, flashcard, due_index: Optional['DueDateIndex'] = None):
+        """
+        Args:
+            flashcard (Flashcard): Die Karte aus DataManager.flashcards.
+            due_index (Optional[DueDateIndex]): Wird bei jedem neuen Fälligkeitsdatum aktualisiert.
+        """
+        self.flashcard = flashcard
+        self.due_index = due_index
+        self.changed = False
+
+        # Kompatibilität mit SRS-System (nur für die laufende Sitzung)
         self.consecutive_correct = 0
-        
-        # Attribute für graduellen Wiederaufbau
-        self.in_recovery_mode = False
-        self.recovery_interval = 1
-        self.success_history = deque(maxlen=10)
-        self.success_rate = 0.0
-        
-        # Kompatibilität mit SRS-System
         self.repetitions = 0
         self.success_count = 0
         self.difficulty_rating = 3.0
-        
+
+    @property
+    def next_review_date(self) -> datetime.datetime:
+        # Nie gelernte Karten sind ab heute fällig
+        return _parse_datetime(self.flashcard.leitner_next_review_date, _start_of_today)
+
+    @next_review_date.setter
+    def next_review_date(self, value):
+        self.flashcard.leitner_next_review_date = value.isoformat() if isinstance(value, datetime.datetime) else value
+        self.changed = True
+        if self.due_index is not None:
+            self.due_index.update(self.flashcard)
+
+    @property
+    def level(self) -> int:
+        # Das Level ergibt sich immer aus den Punkten; gespeicherte Werte können veraltet sein
+        return level_for_points(self.points)
+
+    @level.setter
+    def level(self, value):
+        self.flashcard.leitner_level = value
+        self.changed = True
+
+    @property
+    def success_rate(self) -> float:
+        history = self.success_history
+        return sum(history) / len(history) if history else 0.0
+
     def _get_level_interval(self):
         """
         Gibt das Standard-Intervall für das aktuelle Level zurück.
@@ -67,29 +195,16 @@ class LeitnerCard:
         9: Alle 25 Tage
         10: Alle 30 Tage
         """
-        intervals = {
-            1: 1,     # Level 1: täglich
-            2: 2,     # Level 2: alle 2 Tage
-            3: 4,     # Level 3: alle 4 Tage
-            4: 7,     # Level 4: wöchentlich
-            5: 10,    # Level 5: alle 10 Tage
-            6: 12,    # Level 6: alle 12 Tage
-            7: 14,    # Level 7: zwei-wöchentlich
-            8: 20,    # Level 8: alle 20 Tage
-            9: 25,    # Level 9: alle 25 Tage
-            10: 30    # Level 10: alle 30 Tage
-        }
-        return intervals.get(self.level, 1)
+        return LEVEL_INTERVALS.get(self.level, 1)
     
     def _update_success_rate(self, was_correct: bool):
         """
-        Fügt das letzte Ergebnis zur success_history hinzu und berechnet die success_rate neu.
+        Fügt das letzte Ergebnis zur success_history hinzu (die success_rate ergibt sich daraus).
         """
-        self.success_history.append(was_correct)
-        if not self.success_history:
-            self.success_rate = 0.0
-        else:
-            self.success_rate = sum(self.success_history) / len(self.success_history)
+        history = self.success_history
+        history.append(was_correct)
+        del history[:-self.SUCCESS_HISTORY_SIZE]
+        self.changed = True
     
     def _get_exponential_multiplier(self):
         """
@@ -147,19 +262,7 @@ class LeitnerCard:
         Level 4: 1.75   Level 9: 3.0
         Level 5: 2.0    Level 10: 4.0
         """
-        level_factors = {
-            1: 1.0,
-            2: 1.25,
-            3: 1.5,
-            4: 1.75,
-            5: 2.0,
-            6: 2.25,
-            7: 2.5,
-            8: 2.75,
-            9: 3.0,
-            10: 4.0
-        }
-        return level_factors.get(self.level, 1.0)
+        return LEVEL_PENALTY_FACTORS.get(self.level, 1.0)
     
     def _get_total_errors_factor(self):
         """
@@ -202,7 +305,7 @@ class LeitnerCard:
         else:
             return 4.0
 
-    def answer_correct(self, was_wrong_in_session=False):
+    def answer_correct(self, was_wrong_in_session=False, now: Optional[datetime.datetime] = None, log: bool = True):
         """
         Verarbeitet eine richtige Antwort mit exponentiellen Multiplikatoren und Streak-Bonus.
 
@@ -215,23 +318,28 @@ class LeitnerCard:
 
         Args:
             was_wrong_in_session (bool): True wenn die Karte bereits in dieser Session falsch war
+            now (Optional[datetime.datetime]): Zeitpunkt der Antwort (Standard: jetzt)
+            log (bool): False unterdrückt die Log-Zeile je Antwort (Massenimport)
 
         Returns:
             tuple: (points_added, base_points, success_multiplier, streak_bonus)
         """
+        now = now or datetime.datetime.now()
+
         # ✓ NEU: Session-basierte Logik
         if was_wrong_in_session:
-            self.last_reviewed = datetime.datetime.now()
+            self.last_reviewed = now
             self._update_success_rate(True)
             self.repetitions += 1
             self.success_count += 1
 
             # Setze nächstes Review-Datum auf HEUTE für erneutes Üben in nächster Session
-            self.next_review_date = datetime.datetime.now()
+            self.next_review_date = now
 
-            logging.info(f"Card {self.card_id} RICHTIG (nach Fehler in Session). "
-                        f"+0 Punkte | Session abgeschlossen | Verfügbar für nächste Session | "
-                        f"Consecutive Sessions Counter bleibt bei {self.consecutive_incorrect_sessions}")
+            if log:
+                logging.info(f"Card {self.card_id} RICHTIG (nach Fehler in Session). "
+                            f"+0 Punkte | Session abgeschlossen | Verfügbar für nächste Session | "
+                            f"Consecutive Sessions Counter bleibt bei {self.consecutive_incorrect_sessions}")
 
             return (0, 0, 0.0, 0.0)  # Keine Punkte, Karte für Session abgeschlossen
 
@@ -261,37 +369,25 @@ class LeitnerCard:
             self.recovery_interval = min(self.recovery_interval * 2, self._get_level_interval())
             if self.recovery_interval >= self._get_level_interval():
                 self.in_recovery_mode = False
-                logging.info(f"Card {self.card_id} hat Recovery-Modus beendet (Level {self.level})")
-            self.next_review_date = datetime.datetime.now() + datetime.timedelta(days=self.recovery_interval)
+                if log:
+                    logging.info(f"Card {self.card_id} hat Recovery-Modus beendet (Level {self.level})")
+            self.next_review_date = now + datetime.timedelta(days=self.recovery_interval)
         else:
-            self._set_next_review_date()
+            self._set_next_review_date(now)
 
-        self.last_reviewed = datetime.datetime.now()
-        
-        # Review History aktualisieren
-        self.review_history.append({
-            'date': self.last_reviewed,
-            'result': True,
-            'points_change': points_to_add,
-            'new_points': self.points,
-            'new_level': self.level,
-            'success_rate_after': self.success_rate,
-            'positive_streak': self.positive_streak,
-            'success_multiplier': success_multiplier,
-            'streak_bonus': streak_bonus,
-            'in_recovery_mode': self.in_recovery_mode
-        })
-        
-        logging.info(f"Card {self.card_id} CORRECT. "
-                    f"Success Rate: {self.success_rate:.2%}, "
-                    f"Exp. Multiplier: {success_multiplier:.2f}x, "
-                    f"Streak Bonus: {streak_bonus:.1f}x, "
-                    f"Points: +{points_to_add} -> {self.points} (Level {self.level})")
+        self.last_reviewed = now
+
+        if log:
+            logging.info(f"Card {self.card_id} CORRECT. "
+                        f"Success Rate: {self.success_rate:.2%}, "
+                        f"Exp. Multiplier: {success_multiplier:.2f}x, "
+                        f"Streak Bonus: {streak_bonus:.1f}x, "
+                        f"Points: +{points_to_add} -> {self.points} (Level {self.level})")
         
         return points_to_add, base_points, success_multiplier, streak_bonus
 
 
-    def answer_incorrect(self):
+    def answer_incorrect(self, now: Optional[datetime.datetime] = None, log: bool = True):
         """
         Verarbeitet eine falsche Antwort mit optimiertem Punktabzug-System.
 
@@ -304,9 +400,15 @@ class LeitnerCard:
         - Session 2 falsch: -2 × Faktoren
         - Session 3 falsch: -3 × Faktoren, etc.
 
+        Args:
+            now (Optional[datetime.datetime]): Zeitpunkt der Antwort (Standard: jetzt)
+            log (bool): False unterdrückt die Log-Zeile je Antwort (Massenimport)
+
         Returns:
             tuple: (points_subtracted, consecutive_sessions_factor, level_factor, streak_loss_factor)
         """
+        now = now or datetime.datetime.now()
+
         # Speichere den alten Streak für Strafberechnung
         broken_streak = self.positive_streak
 
@@ -332,33 +434,18 @@ class LeitnerCard:
         # ✓ GEÄNDERT: Setze Datum auf HEUTE (nicht +1 Tag)
         self.in_recovery_mode = True
         self.recovery_interval = 1
-        self.next_review_date = datetime.datetime.now()  # ✓ Entfernt: "+ datetime.timedelta(days=1)"
-        self.last_reviewed = datetime.datetime.now()
-        
-        self.review_history.append({
-            'date': self.last_reviewed,
-            'result': False,
-            'points_change': -points_to_subtract,
-            'new_points': self.points,
-            'new_level': self.level,
-            'success_rate_after': self.success_rate,
-            'broken_streak': broken_streak,
-            'total_incorrect': self.total_incorrect_count,
-            'consecutive_incorrect_sessions': self.consecutive_incorrect_sessions,  # ✓ NEU
-            'consecutive_sessions_factor': consecutive_sessions_factor,  # ✓ NEU
-            'level_factor': level_factor,
-            'streak_loss_factor': streak_loss_factor,
-            'in_recovery_mode': True
-        })
-
-        logging.info(f"Card {self.card_id} INCORRECT. "
-                    f"Success Rate: {self.success_rate:.2%}, "
-                    f"Total Errors: {self.total_incorrect_count}, "
-                    f"Consecutive Incorrect Sessions: {self.consecutive_incorrect_sessions}, "
-                    f"Broken Streak: {broken_streak}, "
-                    f"Factors: {consecutive_sessions_factor} × {level_factor} × {streak_loss_factor}, "
-                    f"Points: -{points_to_subtract} -> {self.points} (Level {self.level}) | "
-                    f"✓ Verfügbar für nächste Session HEUTE")
+        self.next_review_date = now  # ✓ Entfernt: "+ datetime.timedelta(days=1)"
+        self.last_reviewed = now
+
+        if log:
+            logging.info(f"Card {self.card_id} INCORRECT. "
+                        f"Success Rate: {self.success_rate:.2%}, "
+                        f"Total Errors: {self.total_incorrect_count}, "
+                        f"Consecutive Incorrect Sessions: {self.consecutive_incorrect_sessions}, "
+                        f"Broken Streak: {broken_streak}, "
+                        f"Factors: {consecutive_sessions_factor} × {level_factor} × {streak_loss_factor}, "
+                        f"Points: -{points_to_subtract} -> {self.points} (Level {self.level}) | "
+                        f"✓ Verfügbar für nächste Session HEUTE")
 
         return points_to_subtract, consecutive_sessions_factor, level_factor, streak_loss_factor
 
@@ -399,10 +486,264 @@ class LeitnerCard:
         else:
             self.level = 10
 
-    def _set_next_review_date(self):
+    def _set_next_review_date(self, now: Optional[datetime.datetime] = None):
         """Setzt das nächste Überprüfungsdatum basierend auf dem Level."""
         interval = self._get_level_interval()
-        self.next_review_date = datetime.datetime.now() + datetime.timedelta(days=interval)
+        self.next_review_date = (now or datetime.datetime.now()) + datetime.timedelta(days=interval)
+
+
+class DueDateIndex:
+    """
+    Fälligkeits-Index über alle Karten, getrennt nach Kategorie-Bucket des DataManagers.
+
+    Pro Bucket: Epochentag (day_numbers) des nächsten Review-Datums -> card_ids, dazu die
+    sortierte Liste der belegten Tage (bisect). Nie gelernte Karten (ohne Datum) sind ab heute
+    fällig und liegen in einer eigenen Menge. Antworten aktualisieren den Index über
+    LeitnerCard.next_review_date; ändert sich der Kartenbestand (card_index_version des
+    DataManagers), wird er beim nächsten Zugriff neu aufgebaut.
+    """
+
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self.lock = threading.RLock()
+        self._version = None
+        self._days: Dict[Tuple[int, int], Dict[int, Set[str]]] = {}
+        self._review_days: Dict[Tuple[int, int], List[int]] = {}
+        self._undated: Dict[Tuple[int, int], Set[str]] = {}
+        self._entry_by_id: Dict[str, Tuple[Tuple[int, int], Optional[int]]] = {}
+
+    @staticmethod
+    def _review_day_of(flashcard) -> Optional[int]:
+        value = flashcard.leitner_next_review_date
+        if isinstance(value, datetime.datetime):
+            return day_of(value)
+        # Jeder gespeicherte ISO-String wird nur einmal geparst (Cache in parse_day)
+        return parse_day(value)
+
+    def rebuild(self):
+        """Baut den Index aus allen Karten des DataManagers neu auf."""
+        with self.lock:
+            self._version = self.data_manager.card_index_version
+            self._days.clear()
+            self._review_days.clear()
+            self._undated.clear()
+            self._entry_by_id.clear()
+            for flashcard in list(self.data_manager.flashcards):
+                self._add(flashcard)
+        logging.debug(f"Fälligkeits-Index aufgebaut: {len(self._entry_by_id)} Karten.")
+
+    def _ensure_current(self):
+        if self._version != self.data_manager.card_index_version:
+            self.rebuild()
+
+    def _add(self, flashcard):
+        card_id = flashcard.id
+        key = self.data_manager.get_category_key(card_id) if card_id else None
+        if key is None:
+            return
+        review_day = self._review_day_of(flashcard)
+        self._entry_by_id[card_id] = (key, review_day)
+        if review_day is None:
+            self._undated.setdefault(key, set()).add(card_id)
+            return
+        days = self._days.setdefault(key, {})
+        if review_day not in days:
+            days[review_day] = set()
+            bisect.insort(self._review_days.setdefault(key, []), review_day)
+        days[review_day].add(card_id)
+
+    def _remove(self, card_id: str):
+        entry = self._entry_by_id.pop(card_id, None)
+        if entry is None:
+            return
+        key, review_day = entry
+        if review_day is None:
+            self._undated.get(key, set()).discard(card_id)
+            return
+        day = self._days[key][review_day]
+        day.discard(card_id)
+        if not day:
+            del self._days[key][review_day]
+            review_days = self._review_days[key]
+            del review_days[bisect.bisect_left(review_days, review_day)]
+
+    def update(self, flashcard):
+        """Übernimmt das aktuelle Fälligkeitsdatum einer Karte (inkrementell)."""
+        # Auch ungespeicherte Antworten ändern Scores und Empfehlungen (memoisierte Ergebnisse)
+        self.data_manager.bump_data_version('flashcards')
+        with self.lock:
+            if self._version != self.data_manager.card_index_version:
+                # Wird beim nächsten Zugriff ohnehin komplett neu aufgebaut
+                return
+            self._remove(flashcard.id)
+            self._add(flashcard)
+
+    def _iter_days(self, key, first: Optional[int], last: Optional[int]):
+        """Liefert (Ordinal, card_ids) der belegten Tage eines Buckets mit first <= Ordinal <= last."""
+        review_days = self._review_days.get(key, [])
+        start = 0 if first is None else bisect.bisect_left(review_days, first)
+        end = len(review_days) if last is None else bisect.bisect_right(review_days, last)
+        days = self._days[key] if end > start else None
+        for review_day in review_days[start:end]:
+            yield review_day, days[review_day]
+
+    def card_ids_due_by(self, moment: datetime.datetime, category: Optional[str] = None,
+                        subcategory: Optional[str] = None) -> List[str]:
+        """IDs aller Karten mit next_review_date <= moment (nach Fälligkeit sortiert)."""
+        with self.lock:
+            self._ensure_current()
+            moment_day = day_of(moment)
+            include_undated = moment >= _start_of_today()
+            result = []
+            for key in self.data_manager.get_category_keys(category, subcategory):
+                if include_undated:
+                    result.extend((0, card_id) for card_id in self._undated.get(key, ()))
+                for review_day, card_ids in self._iter_days(key, None, moment_day):
+                    if review_day < moment_day:
+                        result.extend((review_day, card_id) for card_id in card_ids)
+                        continue
+                    # Am Stichtag selbst entscheidet die Uhrzeit
+                    for card_id in card_ids:
+                        flashcard = self.data_manager.get_flashcard_by_id(card_id)
+                        if flashcard is not None and _parse_datetime(flashcard.leitner_next_review_date) <= moment:
+                            result.append((review_day, card_id))
+            result.sort(key=lambda item: item[0])
+            return [card_id for _, card_id in result]
+
+    def count_due_by(self, moment: datetime.datetime, category: Optional[str] = None,
+                     subcategory: Optional[str] = None) -> int:
+        """Anzahl der Karten mit next_review_date <= moment."""
+        if moment.time() != datetime.time.max:
+            return len(self.card_ids_due_by(moment, category, subcategory))
+        # Bis Tagesende: ganze Tage zählen, ohne einzelne Karten anzusehen
+        with self.lock:
+            self._ensure_current()
+            moment_day = day_of(moment)
+            include_undated = moment >= _start_of_today()
+            count = 0
+            for key in self.data_manager.get_category_keys(category, subcategory):
+                if include_undated:
+                    count += len(self._undated.get(key, ()))
+                count += sum(len(card_ids) for _, card_ids in self._iter_days(key, None, moment_day))
+            return count
+
+    def due_counts_by_key(self, moment: datetime.datetime) -> Dict[Tuple[int, int], int]:
+        """Anzahl der Karten mit next_review_date <= moment je Kategorie-Bucket (ein Durchlauf über alle Buckets)."""
+        with self.lock:
+            self._ensure_current()
+            moment_day = day_of(moment)
+            include_undated = moment >= _start_of_today()
+            whole_days = moment.time() == datetime.time.max
+            counts = {}
+            for key in set(self._undated) | set(self._review_days):
+                count = len(self._undated.get(key, ())) if include_undated else 0
+                for review_day, card_ids in self._iter_days(key, None, moment_day):
+                    if review_day < moment_day or whole_days:
+                        count += len(card_ids)
+                        continue
+                    # Am Stichtag selbst entscheidet die Uhrzeit
+                    for card_id in card_ids:
+                        flashcard = self.data_manager.get_flashcard_by_id(card_id)
+                        if flashcard is not None and _parse_datetime(flashcard.leitner_next_review_date) <= moment:
+                            count += 1
+                if count:
+                    counts[key] = count
+            return counts
+
+    def card_ids_due_between(self, start: datetime.date, end: datetime.date, category: Optional[str] = None,
+                             subcategory: Optional[str] = None) -> List[str]:
+        """IDs der Karten, deren Fälligkeitstag zwischen start und end liegt (jeweils einschließlich)."""
+        with self.lock:
+            self._ensure_current()
+            first, last = day_of(start), day_of(end)
+            include_undated = first <= today() <= last
+            result = []
+            for key in self.data_manager.get_category_keys(category, subcategory):
+                if include_undated:
+                    result.extend((0, card_id) for card_id in self._undated.get(key, ()))
+                for review_day, card_ids in self._iter_days(key, first, last):
+                    result.extend((review_day, card_id) for card_id in card_ids)
+            result.sort(key=lambda item: item[0])
+            return [card_id for _, card_id in result]
+
+    def due_counts_per_day(self, start: datetime.date, days: int, category: Optional[str] = None,
+                           subcategory: Optional[str] = None) -> List[int]:
+        """
+        Anzahl fälliger Karten je Tag für days Tage ab start.
+        Der erste Tag enthält zusätzlich alle bereits überfälligen Karten.
+        """
+        counts = [0] * max(0, days)
+        if not counts:
+            return counts
+        with self.lock:
+            self._ensure_current()
+            first = day_of(start)
+            last = first + days - 1
+            today_day = today()
+            for key in self.data_manager.get_category_keys(category, subcategory):
+                undated = len(self._undated.get(key, ()))
+                if undated and today_day <= last:
+                    counts[max(0, today_day - first)] += undated
+                for review_day, card_ids in self._iter_days(key, None, last):
+                    counts[max(0, review_day - first)] += len(card_ids)
+        return counts
+
+
+class LeitnerCardIndex(Mapping):
+    """
+    Live-Zuordnung card_id -> LeitnerCard über dem ID-Index des DataManagers.
+
+    Sichten werden beim ersten Zugriff erzeugt und wiederverwendet, solange die
+    Flashcard dieselbe bleibt. Neue oder entfernte Karten im DataManager sind
+    ohne Neuladen sichtbar.
+    """
+
+    __slots__ = ('data_manager', 'due_index', '_views')
+
+    def __init__(self, data_manager, due_index: Optional[DueDateIndex] = None):
+        self.data_manager = data_manager
+        self.due_index = due_index
+        self._views: Dict[str, LeitnerCard] = {}
+
+    def __getitem__(self, card_id) -> LeitnerCard:
+        flashcard = self.data_manager.get_flashcard_by_id(card_id) if card_id else None
+        if flashcard is None:
+            raise KeyError(card_id)
+        return self.view_for(flashcard)
+
+    def view_for(self, flashcard) -> LeitnerCard:
+        """Gibt die (wiederverwendete) Sicht auf eine Flashcard zurück."""
+        view = self._views.get(flashcard.id)
+        if view is None or view.flashcard is not flashcard:
+            view = LeitnerCard(flashcard, self.due_index)
+            self._views[flashcard.id] = view
+        return view
+
+    def __iter__(self):
+        seen = set()
+        for flashcard in list(self.data_manager.flashcards):
+            card_id = flashcard.id
+            if card_id and card_id not in seen:
+                seen.add(card_id)
+                yield card_id
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, card_id) -> bool:
+        return bool(card_id) and self.data_manager.get_flashcard_by_id(card_id) is not None
+
+    def views(self) -> List[LeitnerCard]:
+        """Bereits erzeugte Sichten (z.B. um geänderte Karten zu finden)."""
+        return list(self._views.values())
+
+    def prune(self) -> int:
+        """Verwirft Sichten auf Karten, die nicht mehr im DataManager sind. Gibt deren Anzahl zurück."""
+        stale = [card_id for card_id, view in self._views.items()
+                 if self.data_manager.get_flashcard_by_id(card_id) is not view.flashcard]
+        for card_id in stale:
+            del self._views[card_id]
+        return len(stale)
 
 
 class LeitnerSystem:
@@ -412,7 +753,8 @@ class LeitnerSystem:
     
     def __init__(self, data_manager):
         self.data_manager = data_manager
-        self.cards = {}  # Dict mit card_id: LeitnerCard
+        self.due_index = DueDateIndex(data_manager)
+        self.cards = LeitnerCardIndex(data_manager, self.due_index)  # card_id -> LeitnerCard
         self._load_cards()
 
     def get_level(self, points):
@@ -493,184 +835,270 @@ class LeitnerSystem:
             'streak_bonus': card._get_streak_bonus()  # NEU
         }
 
-    def reschedule_due_dates_evenly(self):
+    def plan_due_date_rebalance(self, day_card_limits: Optional[List[int]] = None) -> Optional[Dict]:
         """
-        Plant die Fälligkeitstermine aller Karten einmalig neu,
-        basierend auf ihrem aktuellen Leitner-Level.
+        Berechnet neue Fälligkeitstermine für alle Karten, ohne sie zu ändern (Probelauf).
+
+        Jede Karte darf zwischen heute und dem Intervall ihres Levels fällig werden. Die Karten
+        werden über alle Level hinweg so verteilt, dass die Tageslast möglichst gleichmäßig ist
+        und die Grenzen je Wochentag eingehalten werden (siehe due_balancer).
+
+        Args:
+            day_card_limits (Optional[List[int]]): Kartengrenze je Wochentag (Montag-Sonntag), wie
+                die day_card_limits der Planer-Präferenzen; None für unbegrenzt.
+
+        Returns:
+            Optional[Dict]: 'dates' (ISO-Daten ab heute), 'before' / 'after' (Karten je Tag),
+            'later_before' (Karten nach dem Zeitraum), 'capacity' (je Tag oder None),
+            'peak_before' / 'peak_after' und 'assignments' (Liste (Flashcard, Tag ab heute));
+            None, wenn es keine Karten gibt.
         """
-        logging.info("Starte einmalige Neuplanung der Fälligkeitstermine für 10-Level System...")
-        all_flashcards = self.data_manager.flashcards
+        cards = [fc for fc in self.data_manager.flashcards if hasattr(fc, 'leitner_points')]
+        if not cards:
+            return None
 
-        if not all_flashcards:
-            logging.warning("Keine Karten zur Neuplanung gefunden.")
-            return False
-
-        now = datetime.datetime.now()
-        today_date = now.date()
-
-        # Intervalle für alle 10 Level
-        level_max_intervals = {
-            1: 1,
-            2: 2,
-            3: 4,
-            4: 7,
-            5: 10,
-            6: 12,
-            7: 14,
-            8: 20,
-            9: 25,
-            10: 30
+        start_day = today()
+        windows = [LEVEL_INTERVALS.get(self.get_level(fc.leitner_points), 1) for fc in cards]
+        assigned = balance_due_days(windows, start_day, day_card_limits)
+
+        horizon = max(windows) + 1
+        current = []
+        for fc in cards:
+            due = parse_day(fc.leitner_next_review_date)
+            current.append(0 if due is None else due - start_day)
+        before = load_histogram(current, horizon)
+        after = load_histogram(assigned, horizon)
+
+        return {
+            'dates': [to_date(start_day + offset).isoformat() for offset in range(horizon)],
+            'before': before['loads'],
+            'later_before': before['later'],
+            'after': after['loads'],
+            'capacity': day_capacities(start_day, horizon, day_card_limits),
+            'peak_before': max(before['loads']),
+            'peak_after': max(after['loads']),
+            'assignments': list(zip(cards, assigned)),
         }
 
-        # Gruppiere Karten nach Level
-        cards_by_level = defaultdict(list)
-        for fc in all_flashcards:
-            if not hasattr(fc, 'leitner_points'):
-                continue
-            points = fc.leitner_points
-            level = self.get_level(points)
-            cards_by_level[level].append(fc)
+    def rebalance_due_dates(self, day_card_limits: Optional[List[int]] = None, dry_run: bool = False) -> Optional[Dict]:
+        """
+        Plant die Fälligkeitstermine aller Karten kapazitätsgerecht neu (siehe plan_due_date_rebalance).
+        Punkte und Level bleiben unverändert.
 
-        # Verteile Karten gleichmäßig über erlaubtes Intervall
-        for level, cards_in_level in cards_by_level.items():
-            if not cards_in_level:
-                continue
-                
-            max_days = level_max_intervals.get(level, 1)
-            num_cards = len(cards_in_level)
-            
-            logging.info(f"Level {level}: {num_cards} Karten, max {max_days} Tage")
-            
-            # Verteile gleichmäßig
-            for i, card in enumerate(cards_in_level):
-                if num_cards == 1:
-                    offset_days = max_days
-                else:
-                    offset_days = int((i / (num_cards - 1)) * max_days)
-                
-                new_due = today_date + datetime.timedelta(days=offset_days)
-                new_due_dt = datetime.datetime.combine(new_due, datetime.time(12, 0))
-                
-                card.leitner_next_review_date = new_due_dt.isoformat()
-                
-                if hasattr(card, 'id') and card.id in self.cards:
-                    self.cards[card.id].next_review_date = new_due_dt
+        Args:
+            day_card_limits (Optional[List[int]]): Kartengrenze je Wochentag (Montag-Sonntag); None für unbegrenzt.
+            dry_run (bool): Nur berechnen, nichts ändern.
+
+        Returns:
+            Optional[Dict]: Lastverteilung vor/nach der Neuplanung (ohne 'assignments'),
+            zusätzlich 'saved' (bool); None, wenn es keine Karten gibt.
+        """
+        plan = self.plan_due_date_rebalance(day_card_limits)
+        if plan is None:
+            logging.warning("Keine Karten zur Neuplanung gefunden.")
+            return None
+
+        assignments = plan.pop('assignments')
+        logging.info(f"Neuplanung für {len(assignments)} Karten: Spitzenlast "
+                     f"{plan['peak_before']} -> {plan['peak_after']} Karten/Tag"
+                     f"{' (Probelauf)' if dry_run else ''}.")
+        plan['saved'] = False
+        if dry_run:
+            return plan
+
+        today_date = to_date(today())
+        for fc, offset in assignments:
+            new_due = datetime.datetime.combine(today_date + datetime.timedelta(days=offset), datetime.time(12, 0))
+            fc.leitner_next_review_date = new_due.isoformat()
+
+        self.due_index.rebuild()
 
         # Speichern
         try:
-            self.save_cards()
             self.data_manager.save_flashcards()
             logging.info("Neuplanung erfolgreich abgeschlossen und gespeichert.")
-            return True
+            plan['saved'] = True
         except Exception as e:
             logging.error(f"Fehler beim Speichern nach Neuplanung: {e}")
-            return False
+        return plan
+
+    def reschedule_due_dates_evenly(self, day_card_limits: Optional[List[int]] = None) -> bool:
+        """
+        Plant die Fälligkeitstermine aller Karten einmalig neu,
+        basierend auf ihrem aktuellen Leitner-Level (kapazitätsgerecht, siehe rebalance_due_dates).
+        """
+        logging.info("Starte einmalige Neuplanung der Fälligkeitstermine für 10-Level System...")
+        plan = self.rebalance_due_dates(day_card_limits)
+        return bool(plan and plan['saved'])
 
     def _load_cards(self):
-        """Lädt Karten aus dem DataManager und konvertiert sie zu LeitnerCards."""
-        self.cards.clear()
+        """Prüft den DataManager; die LeitnerCards selbst sind Sichten auf dessen Flashcards."""
         if not self.data_manager or not hasattr(self.data_manager, 'flashcards'):
             logging.error("DataManager oder DataManager.flashcards nicht initialisiert.")
             return
+        logging.info(f"{len(self.cards)} Karten im optimierten 10-Level Leitner-System verfügbar.")
 
-        for card_data in self.data_manager.flashcards:
-            if not hasattr(card_data, 'id') or not card_data.id:
-                continue
-            
-            leitner_card = LeitnerCard(
-                card_id=card_data.id,
-                question=card_data.question,
-                answer=card_data.answer,
-                category=card_data.category,
-                subcategory=card_data.subcategory,
-                tags=card_data.tags,
-                image_path=getattr(card_data, 'image_path', None),
-                question_image_path=getattr(card_data, 'question_image_path', None)
-            )
-
-            # Bestehende Daten laden
-            leitner_card.points = getattr(card_data, 'leitner_points', 0)
-            leitner_card.positive_streak = getattr(card_data, 'leitner_positive_streak', 0)
-            leitner_card.negative_streak = getattr(card_data, 'leitner_negative_streak', 0)
-            leitner_card.total_incorrect_count = getattr(card_data, 'leitner_total_incorrect_count', 0)  # NEU
-            leitner_card.consecutive_incorrect_sessions = getattr(card_data, 'leitner_consecutive_incorrect_sessions', 0)  # ✓ NEU
-            leitner_card.in_recovery_mode = getattr(card_data, 'leitner_in_recovery_mode', False)
-            leitner_card.recovery_interval = getattr(card_data, 'leitner_recovery_interval', 1)
-            leitner_card.last_reviewed = self._parse_datetime(
-                getattr(card_data, 'leitner_last_reviewed', None)
-            )
-            leitner_card.next_review_date = self._parse_datetime(
-                getattr(card_data, 'leitner_next_review_date', datetime.datetime.now())
-            )
-            leitner_card._update_level()
-            
-            # Lade Erfolgshistorie
-            success_history_data = getattr(card_data, 'leitner_success_history', [])
-            if success_history_data:
-                leitner_card.success_history.extend(success_history_data)
-                leitner_card.success_rate = (
-                    sum(leitner_card.success_history) / len(leitner_card.success_history)
-                    if leitner_card.success_history else 0.0
-                )
-
-            self.cards[card_data.id] = leitner_card
-            
-        logging.info(f"{len(self.cards)} Karten in das optimierte 10-Level Leitner-System geladen.")
+    def save_cards(self) -> int:
+        """
+        Speichert die Flashcards, falls seit dem letzten Aufruf Leitner-Karten geändert wurden.
 
-    def save_cards(self):
-        """Speichert alle Leitner-Karten zurück in den DataManager."""
+        Der Leitner-Zustand liegt bereits in den Flashcards; es wird nichts zurückkopiert.
+
+        Returns:
+            int: Anzahl der geänderten Karten.
+        """
         if not self.data_manager or not hasattr(self.data_manager, 'flashcards'):
             logging.error("DataManager nicht verfügbar zum Speichern.")
-            return
+            return 0
+
+        changed = 0
+        for leitner_card in self.cards.views():
+            if leitner_card.changed:
+                leitner_card.changed = False
+                changed += 1
+
+        if changed:
+            self.data_manager.save_flashcards()
+            logging.info(f"{changed} geänderte Leitner-Karten gespeichert.")
+        else:
+            logging.debug("Keine geänderten Leitner-Karten zu speichern.")
+        return changed
+
+    @staticmethod
+    def _review_moment(timestamp) -> Optional[datetime.datetime]:
+        """Zeitpunkt einer importierten Antwort als naive lokale Zeit (datetime oder ISO-String)."""
+        if isinstance(timestamp, str):
+            try:
+                timestamp = datetime.datetime.fromisoformat(timestamp)
+            except ValueError:
+                return None
+        if not isinstance(timestamp, datetime.datetime):
+            return None
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone().replace(tzinfo=None)
+        return timestamp
+
+    def apply_reviews(self, reviews: Iterable[Tuple[str, bool, object, bool]]) -> Dict[str, int]:
+        """
+        Übernimmt Antworten aus anderen Geräten oder externen Werkzeugen in einem Durchgang.
+
+        Die Antworten werden nach Zeitpunkt sortiert und mit denselben Regeln wie
+        answer_correct()/answer_incorrect() verarbeitet (Punkte, Level, Recovery), jeweils zum
+        Zeitpunkt der Antwort. Der Fälligkeits-Index wird danach einmal neu aufgebaut und die
+        Karten werden einmal gespeichert.
 
-        for card_id, leitner_card in self.cards.items():
-            matching_cards = [fc for fc in self.data_manager.flashcards if fc.id == card_id]
-            if not matching_cards:
+        Args:
+            reviews (Iterable[Tuple[str, bool, object, bool]]): (card_id, correct, timestamp,
+                was_wrong_in_session) je Antwort; timestamp als datetime oder ISO-String.
+
+        Returns:
+            Dict[str, int]: 'applied' (verarbeitete Antworten), 'cards' (geänderte Karten),
+            'unknown_cards' und 'invalid' (übersprungene Antworten).
+        """
+        events = []
+        invalid = 0
+        for position, (card_id, correct, timestamp, was_wrong_in_session) in enumerate(reviews):
+            moment = self._review_moment(timestamp)
+            if moment is None:
+                invalid += 1
                 continue
-                
-            card_data = matching_cards[0]
-            card_data.leitner_points = leitner_card.points
-            card_data.leitner_positive_streak = leitner_card.positive_streak
-            card_data.leitner_negative_streak = leitner_card.negative_streak
-            card_data.leitner_total_incorrect_count = leitner_card.total_incorrect_count  # NEU
-            card_data.leitner_consecutive_incorrect_sessions = leitner_card.consecutive_incorrect_sessions  # ✓ NEU
-            card_data.leitner_in_recovery_mode = leitner_card.in_recovery_mode
-            card_data.leitner_recovery_interval = leitner_card.recovery_interval
-            card_data.leitner_last_reviewed = leitner_card.last_reviewed.isoformat()
-            card_data.leitner_next_review_date = leitner_card.next_review_date.isoformat()
-            card_data.leitner_success_history = list(leitner_card.success_history)
-            
+            events.append((moment, position, card_id, bool(correct), bool(was_wrong_in_session)))
+        # Gleiche Zeitpunkte behalten die Eingabereihenfolge
+        events.sort(key=lambda event: (event[0], event[1]))
+
+        # Eigene Sichten ohne Index: der Index wird am Ende einmal neu aufgebaut
+        views: Dict[str, Optional[LeitnerCard]] = {}
+        applied = unknown = 0
+        for moment, _, card_id, correct, was_wrong_in_session in events:
+            view = views.get(card_id, False)
+            if view is False:
+                flashcard = self.data_manager.get_flashcard_by_id(card_id) if card_id else None
+                view = views[card_id] = LeitnerCard(flashcard) if flashcard is not None else None
+            if view is None:
+                unknown += 1
+                continue
+            if correct:
+                view.answer_correct(was_wrong_in_session, now=moment, log=False)
+            else:
+                view.answer_incorrect(now=moment, log=False)
+            applied += 1
+
+        changed = sum(1 for view in views.values() if view is not None)
+        result = {'applied': applied, 'cards': changed, 'unknown_cards': unknown, 'invalid': invalid}
+        if unknown or invalid:
+            logging.warning(f"Import von Antworten: {unknown} Antworten zu unbekannten Karten und "
+                            f"{invalid} Antworten ohne gültigen Zeitpunkt übersprungen.")
+        if not changed:
+            return result
+
+        self.due_index.rebuild()
         self.data_manager.save_flashcards()
-        logging.info("Optimierte Leitner-Karten gespeichert.")
+        logging.info(f"{applied} importierte Antworten auf {changed} Karten angewendet und gespeichert.")
+        return result
 
     def _parse_datetime(self, date_value):
         """Hilfsmethode zum Parsen von Datetime-Werten."""
-        if isinstance(date_value, datetime.datetime):
-            return date_value
-        elif isinstance(date_value, str):
-            try:
-                return datetime.datetime.fromisoformat(date_value)
-            except:
-                return datetime.datetime.now()
-        else:
-            return datetime.datetime.now()
+        return _parse_datetime(date_value)
+
+    def get_cards_in_category(self, category=None, subcategory=None) -> List[LeitnerCard]:
+        """
+        Gibt die Leitner-Karten einer Kategorie und/oder Subkategorie zurück
+        (über den Kategorie-Index des DataManagers; None = alle).
+        """
+        if not category and not subcategory:
+            return list(self.cards.values())
+        return [self.cards.view_for(flashcard) for flashcard in
+                self.data_manager.get_flashcards_in_category(category, subcategory) if flashcard.id]
+
+    def get_cards_due_by(self, moment: Optional[datetime.datetime] = None,
+                         category=None, subcategory=None) -> List[LeitnerCard]:
+        """
+        Gibt die bis moment (Standard: jetzt) fälligen Karten über den Fälligkeits-Index zurück,
+        älteste zuerst. Kategorie/Subkategorie ohne Beachtung der Groß-/Kleinschreibung.
+        """
+        moment = moment or datetime.datetime.now()
+        return self._views_for_ids(self.due_index.card_ids_due_by(moment, category, subcategory))
+
+    def get_cards_due_between(self, start: datetime.date, end: datetime.date,
+                              category=None, subcategory=None) -> List[LeitnerCard]:
+        """Gibt die Karten zurück, deren Fälligkeitstag zwischen start und end liegt."""
+        return self._views_for_ids(self.due_index.card_ids_due_between(start, end, category, subcategory))
+
+    def count_due_cards(self, moment: Optional[datetime.datetime] = None, category=None, subcategory=None) -> int:
+        """Anzahl der bis moment (Standard: jetzt) fälligen Karten."""
+        return self.due_index.count_due_by(moment or datetime.datetime.now(), category, subcategory)
+
+    def count_due_cards_by_key(self, moment: Optional[datetime.datetime] = None) -> Dict[Tuple[int, int], int]:
+        """Anzahl der bis moment (Standard: jetzt) fälligen Karten je Kategorie-Bucket des DataManagers."""
+        return self.due_index.due_counts_by_key(moment or datetime.datetime.now())
+
+    def get_due_counts_per_day(self, start: datetime.date, days: int, category=None, subcategory=None) -> List[int]:
+        """Fällige Karten je Tag für die nächsten days Tage (Tag 0 inklusive Überfälliger)."""
+        return self.due_index.due_counts_per_day(start, days, category, subcategory)
+
+    def _views_for_ids(self, card_ids: List[str]) -> List[LeitnerCard]:
+        views = []
+        for card_id in card_ids:
+            flashcard = self.data_manager.get_flashcard_by_id(card_id)
+            if flashcard is not None:
+                views.append(self.cards.view_for(flashcard))
+        return views
 
     def get_due_cards(self, category=None, subcategory=None, level=None):
         """
         Gibt eine Liste der fälligen Karten zurück, optional gefiltert.
         """
-        now = datetime.datetime.now()
         due_cards = []
         
-        for card in self.cards.values():
-            if card.next_review_date <= now:
-                if category and card.category != category:
-                    continue
-                if subcategory and card.subcategory != subcategory:
-                    continue
-                if level and card.level != level:
-                    continue
-                due_cards.append(card)
+        for card in self.get_cards_due_by(None, category, subcategory):
+            # Exakter Vergleich wie bisher (der Index ignoriert Groß-/Kleinschreibung)
+            if category and card.category != category:
+                continue
+            if subcategory and card.subcategory != subcategory:
+                continue
+            if level and card.level != level:
+                continue
+            due_cards.append(card)
         
         return due_cards
 
@@ -703,19 +1131,13 @@ class LeitnerSystem:
         }
     
     def reload_cards(self):
-        """Lädt die Karten neu aus dem DataManager."""
-        logging.info("Lade Leitner-Karten neu...")
-        old_card_ids = set(self.cards.keys())
-        self.cards.clear()
-        self._load_cards()
-        new_card_ids = set(self.cards.keys())
-        
-        added = new_card_ids - old_card_ids
-        removed = old_card_ids - new_card_ids
-        
-        if added:
-            logging.info(f"{len(added)} neue Leitner-Karten hinzugefügt")
+        """
+        Gleicht die Leitner-Karten mit dem DataManager ab.
+
+        Die Karten sind Sichten auf DataManager.flashcards und damit immer aktuell;
+        es werden nur Sichten auf entfernte Karten verworfen.
+        """
+        removed = self.cards.prune()
         if removed:
-            logging.info(f"{len(removed)} Leitner-Karten entfernt")
-        
-        logging.info(f"Neuladen abgeschlossen. Gesamt: {len(self.cards)} Karten.")
\ No newline at end of file
+            logging.info(f"{removed} Leitner-Karten entfernt")
+        logging.debug(f"Leitner-Karten aktuell. Gesamt: {len(self.cards)} Karten.")
@@ -44,12 +44,17 @@ import seaborn as sns
 import gc
 import mplcursors
 from data_manager import DataManager, ThemeManager, StatisticsManager, Flashcard, get_persistent_path
+from json_stream import iter_json_array
+from snapshot_cache import has_valid_snapshot
+from day_numbers import day_of, month_bounds, parse_date, parse_day, to_date, week_bounds
+from stats_frame import SUCCESS_RATE_LABELS, StatsFrame, success_rate_classes
 
 
 from custom_widgets import ModernButton, ModernCombobox
 from export_import import export_flashcards_to_csv, import_flashcards_from_csv
 from calendar_ui import WeeklyCalendarView
 from calendar_ui_modern import PlannerSelectionView, ModernWeeklyCalendarView
+from planner_manager import PlannerManager
 
 sns.set_style("whitegrid")
 sns.set_palette("husl")
@@ -164,7 +169,12 @@ def ensure_initial_files(data_manager: DataManager):
             file_path = Path(getattr(data_manager, f"{filename.split('.')[0]}_file"))
         
         logging.info(f"Überprüfe Datei: {file_path}")
-        
+
+        # Ein aktueller Snapshot belegt eine gültig gespeicherte Datei; keine JSON-Prüfung nötig
+        if has_valid_snapshot(str(file_path)):
+            logging.info(f"Datei {file_path} durch gültigen Snapshot abgedeckt.")
+            continue
+
         if not file_path.exists():
             try:
                 if getattr(sys, 'frozen', False):
@@ -190,7 +200,11 @@ def ensure_initial_files(data_manager: DataManager):
             # Überprüfen, ob die Datei leer ist (leeres dict oder leere liste)
             try:
                 with file_path.open('r', encoding='utf-8') as f:
-                    content = json.load(f)
+                    if isinstance(default_content, list):
+                        # Listen (Flashcards, Statistiken) nur bis zum ersten Element lesen
+                        content = next(iter_json_array(f), None)
+                    else:
+                        content = json.load(f)
                 if not content:
                     # Inhalt ist leer
                     if getattr(sys, 'frozen', False):
@@ -237,9 +251,10 @@ def ensure_initial_files(data_manager: DataManager):
     # Initialisiere Flashcards mit Beispielkarten, falls leer
     try:
         flashcards_file = Path(data_manager.flashcards_file)
+        # Nur das erste Element lesen statt die gesamte Datei zu parsen
         with flashcards_file.open('r', encoding='utf-8') as f:
-            flashcards_content = json.load(f)
-        if not flashcards_content:
+            flashcards_content = next(iter_json_array(f), None)
+        if flashcards_content is None:
             logging.info("Flashcards-Datei ist leer. Füge Standard-Flashcards hinzu.")
             default_flashcards = [
                 Flashcard(
@@ -620,11 +635,6 @@ class FlashcardApp:
         self.toggle_button.pack(pady=(5,10), padx=5, anchor='e')
         
         self.theme_file_path = get_persistent_path('themes.json')
-        self.theme_backup_dir = os.path.join(self.data_manager.backup_dir, 'theme_backups')
-        os.makedirs(self.theme_backup_dir, exist_ok=True)
-
-        self.flashcards_backup_dir = os.path.join(self.data_manager.backup_dir, 'flashcards_backups')
-        os.makedirs(self.flashcards_backup_dir, exist_ok=True)
 
         self.ensure_default_themes()
         self.stats_manager = StatisticsManager(self.data_manager)
@@ -672,7 +682,41 @@ class FlashcardApp:
         self.setup_keyboard_shortcuts()
         self.set_app_icon()
         self.setup_auto_save()
-    
+        self._start_background_card_loading()
+
+    def _start_background_card_loading(self):
+        """Lädt die Flashcards im Hintergrund und zeigt den Fortschritt in der Seitenleiste."""
+        if self.data_manager.flashcards_loaded.is_set():
+            return
+        self.card_load_progress = (0, 0.0)
+        self.card_load_label = tk.Label(
+            self.sidebar_frame,
+            text="Lade Karten...",
+            font=("Segoe UI", 9),
+            bg="#E8F4F8",
+            fg="#2C3E50"
+        )
+        self.card_load_label.pack(side='bottom', pady=5)
+
+        def on_progress(count, fraction):
+            # Läuft im Lade-Thread; die Anzeige aktualisiert _poll_card_loading im Tk-Thread
+            self.card_load_progress = (count, fraction)
+
+        self.data_manager.load_flashcards_async(progress_callback=on_progress)
+        self.master.after(100, self._poll_card_loading)
+
+    def _poll_card_loading(self):
+        """Aktualisiert die Ladeanzeige, bis alle Flashcards geladen sind."""
+        if not self.data_manager.flashcards_loaded.is_set():
+            count, fraction = self.card_load_progress
+            self.card_load_label.config(text=f"Lade Karten... {count} ({fraction:.0%})")
+            self.master.after(100, self._poll_card_loading)
+            return
+        self.leitner_system.reload_cards()
+        self.card_load_label.config(text=f"{len(self.data_manager.flashcards)} Karten geladen")
+        self.master.after(3000, self.card_load_label.destroy)
+        logging.info("Flashcards im Hintergrund geladen.")
+
     def _create_sidebar_buttons(self):
         """Erstellt alle Buttons für die Seitenleiste an einer zentralen Stelle."""
         button_configs = [
@@ -724,16 +768,21 @@ class FlashcardApp:
             action()
             self.highlight_active_button(name)
     def setup_auto_save(self):
-        """Richtet periodisches Auto-Save ein (alle 5 Minuten)."""
+        """
+        Richtet periodisches Auto-Save ein (alle 5 Minuten).
+
+        Geschrieben wird über den Write-behind-Scheduler des DataManagers; hier werden
+        nur geänderte Leitner-Karten übernommen und ausstehende Änderungen protokolliert.
+        """
         def auto_save():
             try:
-                logging.info("Starte Auto-Save...")
-                self.data_manager.save_flashcards()
-                self.data_manager.save_categories()
-                self.data_manager.save_stats()
                 if hasattr(self, 'leitner_system'):
                     self.leitner_system.save_cards()
-                logging.info("Auto-Save erfolgreich durchgeführt.")
+                metrics = self.data_manager.get_save_metrics()
+                logging.info(
+                    f"Auto-Save: ausstehend={metrics['pending']}, Schreibvorgänge={metrics['writes']}, "
+                    f"zusammengefasst={metrics['coalesced']}, fehlgeschlagen={metrics['failed_writes']}"
+                )
             except Exception as e:
                 logging.error(f"Fehler beim Auto-Save: {e}")
             finally:
@@ -761,7 +810,10 @@ class FlashcardApp:
                 try:
                     self.master.config(cursor="watch") # Zeige Ladecursor
                     self.master.update_idletasks() # Aktualisiere UI sofort
-                    success = self.leitner_system.reschedule_due_dates_evenly()
+                    # Kartengrenzen je Wochentag des aktiven Planers (ohne Planer: unbegrenzt)
+                    active_planner = PlannerManager(self.data_manager).get_active_planner()
+                    day_card_limits = active_planner.get('day_card_limits') if active_planner else None
+                    success = self.leitner_system.reschedule_due_dates_evenly(day_card_limits)
                     self.master.config(cursor="") # Setze Cursor zurück
                     if success:
                         messagebox.showinfo("Erfolg", "Die Fälligkeitstermine wurden erfolgreich neu geplant.")
@@ -887,7 +939,7 @@ class FlashcardApp:
         for stat in self.data_manager.stats:
             if isinstance(stat, dict) and 'date' in stat and 'total_time' in stat:
                 try:
-                    date_obj = datetime.datetime.strptime(stat['date'], "%d.%m.%Y").date()
+                    date_obj = parse_date(stat['date'])
                     # Annahme: Wir haben eine Zeitkomponente, z.B., 'review_time'
                     review_time_str = stat.get('review_time', "12:00")  # Fallback zu Mittag
                     review_time = datetime.datetime.strptime(review_time_str, "%H:%M").time()
@@ -2317,6 +2369,7 @@ class FlashcardApp:
                 card.category = new_category
                 card.subcategory = new_subcategory
                 card.tags = new_tags
+                self.data_manager.reindex_flashcard(card)
 
                 self.data_manager.save_flashcards()
                 messagebox.showinfo("Erfolg", "Karte wurde aktualisiert!")
@@ -2376,41 +2429,6 @@ class FlashcardApp:
         except Exception as e:
             logging.error(f"Fehler beim Wiederherstellen der Filter: {e}")
 
-    def _update_flashcard_from_leitner(self, flashcard_obj: Flashcard, leitner_card: LeitnerCard):
-        """
-        Aktualisiert die Leitner-Attribute eines Flashcard-Objekts
-        basierend auf dem Zustand eines LeitnerCard-Objekts.
-        Konvertiert datetime-Objekte in ISO-Strings für die Speicherung.
-        """
-        if not flashcard_obj or not leitner_card:
-            logging.warning("Versuch, Flashcard von ungültigem LeitnerCard/Flashcard zu aktualisieren.")
-            return
-
-        try:
-            # Datums-Objekte sicher in Strings umwandeln
-            lr_obj = leitner_card.last_reviewed
-            nr_obj = leitner_card.next_review_date
-            lr_val_after = lr_obj.isoformat() if isinstance(lr_obj, (datetime.datetime, datetime.date)) else None
-            nr_val_after = nr_obj.isoformat() if isinstance(nr_obj, (datetime.datetime, datetime.date)) else None
-
-            # Attribute des Flashcard-Objekts aktualisieren
-            flashcard_obj.leitner_points = leitner_card.points
-            flashcard_obj.leitner_level = leitner_card.level
-            flashcard_obj.leitner_positive_streak = leitner_card.positive_streak
-            flashcard_obj.leitner_negative_streak = leitner_card.negative_streak
-            flashcard_obj.leitner_last_reviewed = lr_val_after
-            flashcard_obj.leitner_next_review_date = nr_val_after
-            flashcard_obj.leitner_in_recovery_mode = leitner_card.in_recovery_mode
-            flashcard_obj.leitner_recovery_interval = leitner_card.recovery_interval
-            
-            # KORREKTUR: Erfolgshistorie ebenfalls synchronisieren
-            flashcard_obj.leitner_success_history = list(leitner_card.success_history)
-
-        except AttributeError as e:
-            logging.error(f"Attributfehler beim Aktualisieren der Flashcard {flashcard_obj.id} von Leitner: {e}")
-        except Exception as e:
-            logging.exception(f"Unerwarteter Fehler beim Aktualisieren der Flashcard {flashcard_obj.id} von Leitner.")
-
     def display_filtered_cards(self, category, subcategory, page=1, cards_per_page=30, search_term=None):
         """Zeigt die gefilterten Karten im Grid-Layout an, berücksichtigt Suche und Paginierung."""
         try:
@@ -2422,18 +2440,12 @@ class FlashcardApp:
             # === Kartenfilterung (wie zuvor) ===
             subcat_filter = subcategory if subcategory and subcategory != "Alle" else None
             cat_filter = category if category and category != "Alle" else None
-            base_filtered_cards = self.data_manager.filter_flashcards_by_category_and_subcategory(cat_filter, subcat_filter)
 
-            if search_term:
-                search_term_lower = search_term.lower()
-                filtered_cards = [
-                    card for card in base_filtered_cards
-                    if search_term_lower in card.question.lower() or \
-                       search_term_lower in card.answer.lower() or \
-                       any(search_term_lower in tag.lower() for tag in getattr(card, 'tags', []))
-                ]
+            if search_term and search_term.strip():
+                # Volltextsuche über den Suchindex, Treffer nach Relevanz sortiert (alle Treffer, da paginiert wird)
+                filtered_cards = self.data_manager.search_flashcards(search_term, cat_filter, subcat_filter, limit=None)
             else:
-                filtered_cards = base_filtered_cards
+                filtered_cards = self.data_manager.filter_flashcards_by_category_and_subcategory(cat_filter, subcat_filter)
 
             # Speichere die VOLLSTÄNDIGE gefilterte Liste
             self.currently_displayed_filtered_cards = filtered_cards
@@ -4695,57 +4707,18 @@ class FlashcardApp:
             ).pack(pady=20)
             return
 
-        # Filter anwenden
-        filtered_stats = []
-        comparison_stats = []
-
-        for stat in stats:
-            if not isinstance(stat, dict) or 'details' not in stat:
-                continue
-
-            # Zeitfilter anwenden
-            if not self.passes_time_filter(stat):
-                continue
-
-            # Kategorie-Filter anwenden
-            category = None if self.selected_category_var.get() == "Alle" else self.selected_category_var.get()
-            subcategory = None if self.subcategory_var.get() == "Alle" else self.subcategory_var.get()
-
-            # Statistiken für Hauptkategorie filtern
-            filtered_details = []
-            for detail in stat.get('details', []):
-                matches_category = True if category is None else detail.get('category', '').lower() == category.lower()
-                matches_subcategory = True if subcategory is None else detail.get('subcategory', '').lower() == subcategory.lower()
-                
-                if matches_category and matches_subcategory:
-                    filtered_details.append(detail)
-
-            if filtered_details:
-                new_stat = stat.copy()
-                new_stat['details'] = filtered_details
-                new_stat['cards_total'] = len(filtered_details)
-                new_stat['cards_correct'] = sum(1 for d in filtered_details if d.get('correct', False))
-                filtered_stats.append(new_stat)
-
-            # Vergleichskategorie verarbeiten
-            if self.second_category_var.get() != "Keine":
-                comp_category = self.second_category_var.get()
-                comp_subcategory = None if self.second_subcategory_var.get() == "Alle" else self.second_subcategory_var.get()
-                
-                comp_details = []
-                for detail in stat.get('details', []):
-                    matches_category = detail.get('category', '').lower() == comp_category.lower()
-                    matches_subcategory = True if comp_subcategory is None else detail.get('subcategory', '').lower() == comp_subcategory.lower()
-                    
-                    if matches_category and matches_subcategory:
-                        comp_details.append(detail)
+        # Filter anwenden: Masken über die spaltenorientierte Statistik statt kopierter Sitzungen
+        frame = self._get_stats_frame(stats)
+        day_range = self._selected_time_range()
+        category = None if self.selected_category_var.get() == "Alle" else self.selected_category_var.get()
+        subcategory = None if self.subcategory_var.get() == "Alle" else self.subcategory_var.get()
+        filtered_stats = frame.select(day_range, category, subcategory)
 
-                if comp_details:
-                    comp_stat = stat.copy()
-                    comp_stat['details'] = comp_details
-                    comp_stat['cards_total'] = len(comp_details)
-                    comp_stat['cards_correct'] = sum(1 for d in comp_details if d.get('correct', False))
-                    comparison_stats.append(comp_stat)
+        comparison_stats = None
+        if self.second_category_var.get() != "Keine":
+            comp_category = self.second_category_var.get()
+            comp_subcategory = None if self.second_subcategory_var.get() == "Alle" else self.second_subcategory_var.get()
+            comparison_stats = frame.select(day_range, comp_category, comp_subcategory)
 
         # Diagramm basierend auf Typ erstellen
         chart_type = self.chart_type_var.get()
@@ -4776,41 +4749,50 @@ class FlashcardApp:
         # Zusammenfassende Statistiken anzeigen
         self._show_summary(filtered_stats, comparison_stats, parent_frame=display_frame)
 
-    def passes_time_filter(self, stat):
-        """PrÃƒÂ¼ft, ob eine Statistik den Zeitfilter erfÃƒÂ¼llt."""
+    def _time_filter_range(self, time_period, date_str=None, start_date=None, end_date=None):
+        """
+        Bereich (erster, letzter Epochentag) eines Zeitfilters; None für "Gesamt".
+        Löst ValueError aus, wenn ein benötigtes Datum fehlt oder ungültig ist.
+        """
+        if time_period in ('Tag', 'Woche', 'Monat'):
+            selected_day = day_of(parse_date(date_str))
+            if time_period == 'Tag':
+                return selected_day, selected_day
+            if time_period == 'Woche':
+                return week_bounds(selected_day)
+            return month_bounds(selected_day)
+        if time_period == 'Benutzerdefiniert':
+            start = day_of(parse_date(start_date))
+            end = day_of(parse_date(end_date))
+            return (start, end) if start <= end else (end, start)  # Tausche Start und Ende, wenn nötig
+        return None
+
+    def _get_stats_frame(self, stats):
+        """Spaltenorientierte Statistik; wird nur neu aufgebaut, wenn sich die Sitzungsliste geändert hat."""
+        frame = getattr(self, '_stats_frame', None)
+        if frame is None or not frame.is_current(stats):
+            frame = self._stats_frame = StatsFrame(stats)
+        return frame
+
+    def _selected_time_range(self):
+        """Bereich (Epochentage) des gewählten Zeitfilters; None für "Gesamt"."""
         time_period = self.time_period_var.get()
-        
+
         if time_period == "Gesamt":
-            return True
-            
+            return None
+
         try:
-            stat_date = datetime.datetime.strptime(stat['date'], "%d.%m.%Y").date()
-            today = datetime.date.today()
-            
-            if time_period == "Tag":
-                filter_date = datetime.datetime.strptime(self.date_var.get(), "%d.%m.%Y").date()
-                return stat_date == filter_date
-                
-            elif time_period == "Woche":
-                filter_date = datetime.datetime.strptime(self.date_var.get(), "%d.%m.%Y").date()
-                week_start = filter_date - datetime.timedelta(days=filter_date.weekday())
-                week_end = week_start + datetime.timedelta(days=6)
-                return week_start <= stat_date <= week_end
-                
-            elif time_period == "Monat":
-                filter_date = datetime.datetime.strptime(self.date_var.get(), "%d.%m.%Y").date()
-                return stat_date.year == filter_date.year and stat_date.month == filter_date.month
-                
-            elif time_period == "Benutzerdefiniert":
-                start_date = datetime.datetime.strptime(self.start_date_var.get(), "%d.%m.%Y").date()
-                end_date = datetime.datetime.strptime(self.end_date_var.get(), "%d.%m.%Y").date()
-                return start_date <= stat_date <= end_date
-                
-        except (ValueError, KeyError, AttributeError) as e:
+            if time_period == "Benutzerdefiniert":
+                day_range = self._time_filter_range(time_period, start_date=self.start_date_var.get(),
+                                                    end_date=self.end_date_var.get())
+            else:
+                day_range = self._time_filter_range(time_period, self.date_var.get())
+        except (ValueError, AttributeError) as e:
             logging.error(f"Fehler bei der Zeitfilterung: {e}")
-            return False
-            
-        return True
+            return (0, -1)  # Leerer Bereich
+
+        return day_range
+
     def _get_chart_labels(self):
         """
         Gibt zwei Strings zurück:
@@ -4845,21 +4827,9 @@ class FlashcardApp:
         """Zeichnet die Gesamtstatistik der gelernten Karten."""
 
         # ---------- Hauptkategorie-Daten aggregieren ----------
-        daily_stats = defaultdict(lambda: {"total": 0, "correct": 0})
-        for stat in stats:
-            if isinstance(stat, dict) and 'date' in stat:
-                date = stat['date']
-                # Direkt summieren von cards_total und cards_correct
-                daily_stats[date]["total"] += stat.get('cards_total', 0)
-                daily_stats[date]["correct"] += stat.get('cards_correct', 0)
-
-        # Sortierte Datumsstrings
-        dates = sorted(daily_stats.keys(), key=lambda d: datetime.datetime.strptime(d, "%d.%m.%Y"))
-        totals = [daily_stats[d]["total"] for d in dates]
-        corrects = [daily_stats[d]["correct"] for d in dates]
-
-        # In datetime konvertieren, damit matplotlib die X-Achse korrekt formatiert
-        x_dates = [datetime.datetime.strptime(d, "%d.%m.%Y") for d in dates]
+        # Summen je Tag (date-Objekte, aufsteigend), damit matplotlib die X-Achse korrekt formatiert
+        x_dates, totals, corrects = stats.daily_counts()
+        totals, corrects = totals.tolist(), corrects.tolist()
 
         # Hole Labels für Hauptkategorie und Vergleich
         main_label, comp_label = self._get_chart_labels()
@@ -4873,18 +4843,10 @@ class FlashcardApp:
                 linewidth=2, markersize=8)
 
         # ---------- Vergleich, falls ausgewÃƒÂ¤hlt ----------
+        comp_totals, comp_corrects = [], []
         if comparison_stats and self.second_category_var.get() != "Keine":
-            comp_daily_stats = defaultdict(lambda: {"total": 0, "correct": 0})
-            for stat in comparison_stats:
-                if isinstance(stat, dict) and 'date' in stat:
-                    date = stat['date']
-                    comp_daily_stats[date]["total"] += stat.get('cards_total', 0)
-                    comp_daily_stats[date]["correct"] += stat.get('cards_correct', 0)
-
-            comp_dates = sorted(comp_daily_stats.keys(), key=lambda d: datetime.datetime.strptime(d, "%d.%m.%Y"))
-            comp_totals = [comp_daily_stats[d]["total"] for d in comp_dates]
-            comp_corrects = [comp_daily_stats[d]["correct"] for d in comp_dates]
-            comp_x_dates = [datetime.datetime.strptime(d, "%d.%m.%Y") for d in comp_dates]
+            comp_x_dates, comp_totals, comp_corrects = comparison_stats.daily_counts()
+            comp_totals, comp_corrects = comp_totals.tolist(), comp_corrects.tolist()
 
             ax.plot(comp_x_dates, comp_totals, '--o', color='#e74c3c',
                     label=f"{comp_label} - Gesamt",
@@ -4926,10 +4888,7 @@ class FlashcardApp:
         # Y-Achse bei 0 starten und etwas Puffer nach oben
         y_max_main = max(totals + corrects) if (totals and corrects) else 0
 
-        y_max_comp = 0
-        if comparison_stats:
-            if comp_totals and comp_corrects:
-                y_max_comp = max(comp_totals + comp_corrects)
+        y_max_comp = max(comp_totals + comp_corrects) if (comp_totals and comp_corrects) else 0
 
         overall_y_max = max(y_max_main, y_max_comp)
         ax.set_ylim(bottom=0, top=overall_y_max * 1.1 if overall_y_max > 0 else 1)
@@ -5011,31 +4970,17 @@ class FlashcardApp:
 
     def _draw_category_correct_incorrect(self, ax, stats, comparison_stats=None):
         """Zeichnet ein gestapeltes Balkendiagramm mit der Anzahl der richtigen und falschen Karten pro Kategorie."""
-        # Datenaggregation mit Pandas
-        data = []
-        for stat in stats:
-            if 'details' in stat:
-                for detail in stat['details']:
-                    if isinstance(detail, dict) and 'category' in detail:
-                        data.append({
-                            'category': detail['category'],
-                            'correct': detail.get('correct', 0),
-                            'incorrect': not detail.get('correct', 0)
-                        })
-
-        if not data:
+        # Summen je Kategorie (bincount über die ausgewählten Details), alphabetisch sortiert
+        names, totals, corrects = stats.category_counts()
+
+        if not names:
             ax.text(0.5, 0.5, "Keine Daten verfügbar", ha='center', va='center')
             return
 
-        df = pd.DataFrame(data)
-        grouped = df.groupby('category').agg({
-            'correct': 'sum',
-            'incorrect': 'sum'
-        }).reset_index()
-
-        categories = grouped['category']
-        correct = grouped['correct']
-        incorrect = grouped['incorrect']
+        order = np.argsort(names, kind='stable')
+        categories = [names[index] for index in order]
+        correct = corrects[order]
+        incorrect = totals[order] - correct
 
         bar_width = 0.6
         bars_correct = ax.bar(categories, correct, bar_width, label='Richtig', color='green', alpha=0.7)
@@ -5081,64 +5026,23 @@ class FlashcardApp:
             return []
 
         try:
-            # Verarbeitung des ausgewÃƒÂ¤hlten Datums
-            selected_date = None
-            week_start = None
-            week_end = None
-            month_start = None
-            month_end = None
-
-            if time_period in ['Tag', 'Woche', 'Monat'] and date_str:
-                selected_date = datetime.datetime.strptime(date_str, "%d.%m.%Y").date()
-                
-                if time_period == 'Woche':
-                    # Berechne Start und Ende der Woche
-                    week_start = selected_date - datetime.timedelta(days=selected_date.weekday())
-                    week_end = week_start + datetime.timedelta(days=6)
-                
-                elif time_period == 'Monat':
-                    # Berechne Start und Ende des Monats
-                    month_start = selected_date.replace(day=1)
-                    if month_start.month == 12:
-                        month_end = month_start.replace(year=month_start.year + 1, month=1) - datetime.timedelta(days=1)
-                    else:
-                        month_end = month_start.replace(month=month_start.month + 1) - datetime.timedelta(days=1)
-
-            elif time_period == 'Benutzerdefiniert':
-                start = datetime.datetime.strptime(start_date, "%d.%m.%Y").date()
-                end = datetime.datetime.strptime(end_date, "%d.%m.%Y").date()
-                if start > end:
-                    start, end = end, start  # Tausche Start und Ende, wenn Start spÃƒÂ¤ter als Ende
+            # Zeitraum einmal als Epochentage bestimmen, danach nur noch Ganzzahl-Vergleiche
+            day_range = self._time_filter_range(time_period, date_str, start_date, end_date)
 
             # Filtere die Statistiken
             for stat in stats:
                 if not isinstance(stat, dict) or 'date' not in stat:
                     continue
 
-                try:
-                    stat_date = datetime.datetime.strptime(stat['date'], "%d.%m.%Y").date()
-                except ValueError as e:
-                    logging.error(f"Ungültiges Datum in Statistik: {stat.get('date', '')}: {e}")
+                stat_day = parse_day(stat['date'])
+                if stat_day is None:
+                    logging.error(f"Ungültiges Datum in Statistik: {stat.get('date', '')}")
                     continue
 
-                # Filterlogik basierend auf dem Zeitraum
-                if time_period == 'Tag' and selected_date:
-                    if stat_date == selected_date:
-                        filtered_stats.append(stat)
-                
-                elif time_period == 'Woche' and week_start and week_end:
-                    if week_start <= stat_date <= week_end:
-                        filtered_stats.append(stat)
-                
-                elif time_period == 'Monat' and month_start and month_end:
-                    if month_start <= stat_date <= month_end:
-                        filtered_stats.append(stat)
-                
-                elif time_period == 'Benutzerdefiniert' and start and end:
-                    if start <= stat_date <= end:
+                if day_range is None:
+                    if time_period == 'Gesamt':
                         filtered_stats.append(stat)
-                
-                elif time_period == 'Gesamt':
+                elif day_range[0] <= stat_day <= day_range[1]:
                     filtered_stats.append(stat)
 
         except ValueError as e:
@@ -5158,12 +5062,10 @@ class FlashcardApp:
         if not stats:
             return "%d.%m"
             
-        dates = [datetime.datetime.strptime(stat['date'], "%d.%m.%Y").date() for stat in stats]
-        min_date = min(dates)
-        max_date = max(dates)
+        days = [day_of(parse_date(stat['date'])) for stat in stats]
         
         # Berechne die Zeitspanne
-        time_delta = (max_date - min_date).days
+        time_delta = max(days) - min(days)
         
         if time_delta <= 7:  # Weniger als eine Woche
             return "%d.%m"
@@ -5179,55 +5081,37 @@ class FlashcardApp:
     def _draw_heatmap_extended(self, ax, stats, comparison_stats=None, time_period="Gesamt"):
         """Zeichnet ein erweitertes WÃƒÂ¤rmediagramm mit dynamischer Aggregation und angepasster X- und Y-Achse."""
 
-        # Definiere Erfolgsrate-Bins
-        bins = [0, 25, 50, 75, 100]
-        labels = ["0-25%", "25-50%", "50-75%", "75-100%"]
-
-        data = []
+        # Erfolgsrate-Klassen
+        labels = list(SUCCESS_RATE_LABELS)
 
-        if time_period != "Gesamt":
-            # Normalfall: Heatmap mit Binning
-            for stat in stats:
-                if 'date' not in stat or 'details' not in stat:
-                    continue
-                try:
-                    date = datetime.datetime.strptime(stat['date'], "%d.%m.%Y")
-                    correct = stat.get('cards_correct', 0)
-                    total = stat.get('cards_total', 0)
-                    success_rate = (correct / total * 100) if total > 0 else 0
-
-                    # Bestimme den AggregationsschlÃƒÂ¼ssel basierend auf dem Zeitfilter
-                    if time_period == "Tag":
-                        date_key = date.strftime("%d.%m")
-                    elif time_period == "Woche":
-                        # Korrektur für Wochennummer
-                        week = date.isocalendar()[1]
-                        year = date.year
-                        date_key = f"W{week:02}-{year}"  # FÃƒÂ¼ge fÃƒÂ¼hrende Null für Wochennummer hinzu
-                    elif time_period == "Monat":
-                        date_key = date.strftime("%m.%Y")
-                    else:  # Andere Zeitfilter
-                        date_key = date.strftime("%d.%m")  # Behalte das Format für Konsistenz
-
-                    # Weisen Sie die Erfolgsrate einem Bin zu
-                    bin_label = pd.cut([success_rate], bins=bins, labels=labels, include_lowest=True)[0]
-
-                    data.append({
-                        'success_rate_bin': bin_label,
-                        'date': date_key
-                    })
-                except ValueError:
-                    logging.error(f"Ungültiges Datum in Statistik: {stat.get('date', '')}")
-                    continue
-
-            if not data:
-                ax.text(0.5, 0.5, "Keine Daten für Heatmap verfügbar", ha='center', va='center')
-                return
+        # Erfolgsquote je ausgewählter Sitzung
+        session_days, success_rates = stats.session_success_rates()
+        if not len(session_days):
+            ax.text(0.5, 0.5, "Keine Daten für Heatmap verfügbar", ha='center', va='center')
+            return
 
-            df = pd.DataFrame(data)
+        # Bestimme den Aggregationsschlüssel basierend auf dem Zeitfilter (einmal je Tag)
+        unique_days, day_index = np.unique(session_days, return_inverse=True)
+        day_keys = []
+        for day in unique_days:
+            date = to_date(int(day))
+            if time_period == "Woche":
+                # Korrektur für Wochennummer
+                week = date.isocalendar()[1]
+                day_keys.append(f"W{week:02}-{date.year}")  # Führende Null für Wochennummer
+            elif time_period == "Monat":
+                day_keys.append(date.strftime("%m.%Y"))
+            else:  # "Tag", "Gesamt" und andere Zeitfilter
+                day_keys.append(date.strftime("%d.%m"))
+        date_keys = np.array(day_keys, dtype=object)[day_index]
 
-            # Definiere 'success_rate_bin' als Categorical, um sicherzustellen, dass alle Labels vorhanden sind
-            df['success_rate_bin'] = pd.Categorical(df['success_rate_bin'], categories=labels, ordered=True)
+        if time_period != "Gesamt":
+            # Normalfall: Heatmap mit Binning (Klassen für alle Sitzungen auf einmal)
+            df = pd.DataFrame({
+                'success_rate_bin': pd.Categorical.from_codes(success_rate_classes(success_rates),
+                                                              categories=labels, ordered=True),
+                'date': date_keys
+            })
 
             # ZÃƒÂ¤hle Vorkommen pro Erfolgsrate-Bin und Datum
             heatmap_data = df.groupby(['success_rate_bin', 'date']).size().unstack(fill_value=0)
@@ -5295,41 +5179,10 @@ class FlashcardApp:
 
         else:
             # Spezialfall: "Gesamt" - Zeige die Erfolgsrate direkt als Heatmap ohne Binning
-            for stat in stats:
-                if 'date' not in stat or 'details' not in stat:
-                    continue
-                try:
-                    date = datetime.datetime.strptime(stat['date'], "%d.%m.%Y")
-                    correct = stat.get('cards_correct', 0)
-                    total = stat.get('cards_total', 0)
-                    success_rate = (correct / total * 100) if total > 0 else 0
-
-                    # Bestimme den AggregationsschlÃƒÂ¼ssel basierend auf dem Zeitfilter
-                    if time_period == "Tag":
-                        date_key = date.strftime("%d.%m")
-                    elif time_period == "Woche":
-                        # Korrektur für Wochennummer
-                        week = date.isocalendar()[1]
-                        year = date.year
-                        date_key = f"W{week:02}-{year}"  # FÃƒÂ¼ge fÃƒÂ¼hrende Null für Wochennummer hinzu
-                    elif time_period == "Monat":
-                        date_key = date.strftime("%m.%Y")
-                    else:  # "Gesamt" oder andere
-                        date_key = date.strftime("%d.%m")  # Behalte das Format für Konsistenz
-
-                    data.append({
-                        'date': date_key,
-                        'success_rate': success_rate
-                    })
-                except ValueError:
-                    logging.error(f"Ungültiges Datum in Statistik: {stat.get('date', '')}")
-                    continue
-
-            if not data:
-                ax.text(0.5, 0.5, "Keine Daten für Heatmap verfügbar", ha='center', va='center')
-                return
-
-            df = pd.DataFrame(data)
+            df = pd.DataFrame({
+                'date': date_keys,
+                'success_rate': success_rates
+            })
 
             # Gruppiere die Daten nach Datum und berechne den Durchschnitt (falls nötig)
             heatmap_data = df.groupby('date')['success_rate'].mean()
@@ -5405,30 +5258,15 @@ class FlashcardApp:
         main_label, comp_label = self._get_chart_labels()
 
         # ---------- Haupt-Lernzeit pro Tag aggregieren ----------
-        daily_times = defaultdict(float)
-        for stat in stats:
-            if isinstance(stat, dict) and 'date' in stat:
-                date = stat['date']
-                daily_times[date] += stat.get('total_time', 0)
-
-        dates = sorted(daily_times.keys())
-        times = [daily_times[d] for d in dates]
-        x_dates = [datetime.datetime.strptime(d, "%d.%m.%Y") for d in dates]
+        x_dates, times = stats.daily_learning_time()
+        times = times.tolist()
 
         # Zeichne Hauptlinie
         ax.plot(x_dates, times, '-o', label=f"Lernzeit: {main_label}", linewidth=2)
 
         # ---------- Vergleich, falls vorhanden ----------
         if comparison_stats and self.second_category_var.get() != "Keine":
-            comp_daily_times = defaultdict(float)
-            for stat in comparison_stats:
-                if isinstance(stat, dict) and 'date' in stat:
-                    date = stat['date']
-                    comp_daily_times[date] += stat.get('total_time', 0)
-
-            comp_dates = sorted(comp_daily_times.keys())
-            comp_times = [comp_daily_times[d] for d in comp_dates]
-            comp_x = [datetime.datetime.strptime(d, "%d.%m.%Y") for d in comp_dates]
+            comp_x, comp_times = comparison_stats.daily_learning_time()
 
             ax.plot(comp_x, comp_times, '--s', label=f"Lernzeit: {comp_label}", linewidth=2)
 
@@ -5459,21 +5297,8 @@ class FlashcardApp:
 
     def _draw_correct_incorrect(self, ax, stats, comparison_stats=None):
         """Zeichnet die Richtig/Falsch-Statistik."""
-        daily_stats = defaultdict(lambda: {"correct": 0, "total": 0})
-        for stat in stats:
-            if isinstance(stat, dict) and 'date' in stat and 'details' in stat:
-                date = stat['date']
-                details = stat.get('details', [])
-                daily_stats[date]["correct"] += sum(1 for d in details if d.get('correct', False))
-                daily_stats[date]["total"] += len(details)
-
-        # Sortieren
-        dates = sorted(daily_stats.keys())
-        corrects = [daily_stats[d]["correct"] for d in dates]
-        totals = [daily_stats[d]["total"] for d in dates]
-        incorrects = [t - c for t, c in zip(totals, corrects)]
-
-        x_dates = [datetime.datetime.strptime(d, "%d.%m.%Y") for d in dates]
+        x_dates, totals, corrects = stats.daily_counts()
+        incorrects = totals - corrects
         main_label, comp_label = self._get_chart_labels()
 
         # ---------- Balkenplot für richtig/falsch ----------
@@ -5482,19 +5307,7 @@ class FlashcardApp:
 
         # ---------- Vergleich -----------
         if comparison_stats and self.second_category_var.get() != "Keine":
-            # Aggregation
-            comp_daily_stats = defaultdict(lambda: {"correct": 0, "total": 0})
-            for stat in comparison_stats:
-                if isinstance(stat, dict) and 'date' in stat and 'details' in stat:
-                    date = stat['date']
-                    details = stat.get('details', [])
-                    comp_daily_stats[date]["correct"] += sum(1 for d in details if d.get('correct', False))
-                    comp_daily_stats[date]["total"] += len(details)
-
-            comp_dates = sorted(comp_daily_stats.keys())
-            comp_corrects = [comp_daily_stats[d]["correct"] for d in comp_dates]
-            comp_totals = [comp_daily_stats[d]["total"] for d in comp_dates]
-            comp_x = [datetime.datetime.strptime(d, "%d.%m.%Y") for d in comp_dates]
+            comp_x, comp_totals, comp_corrects = comparison_stats.daily_counts()
 
             # Kleine Linien oder Punkte zum Vergleich
             ax.plot(comp_x, comp_corrects, '--s', color='darkgreen',
@@ -5527,8 +5340,8 @@ class FlashcardApp:
 
         # Y-Achse bei 0 starten
         ax.set_ylim(bottom=0)
-        if totals:
-            y_max = max(max(totals), max(corrects))
+        if len(totals):
+            y_max = max(totals.max(), corrects.max())
             ax.set_ylim(top=y_max * 1.1)
         
     def _draw_category_stats(self, ax, stats, comparison_stats=None):
@@ -5536,29 +5349,9 @@ class FlashcardApp:
         if not stats:
             return
         
-        # Sammle Daten pro Kategorie
-        category_data = {}
-        for stat in stats:
-            if 'details' in stat:
-                for detail in stat.get('details', []):
-                    category = detail.get('category', 'Unbekannt')
-                    if category not in category_data:
-                        category_data[category] = {
-                            'total': 0,
-                            'correct': 0
-                        }
-                    category_data[category]['total'] += 1
-                    if detail.get('correct'):
-                        category_data[category]['correct'] += 1
-
-        # Bereite Daten für das Diagramm vor
-        categories = list(category_data.keys())
-        success_rates = []
-        for cat in categories:
-            total = category_data[cat]['total']
-            correct = category_data[cat]['correct']
-            rate = (correct / total * 100) if total > 0 else 0
-            success_rates.append(rate)
+        # Versuche und richtige Antworten pro Kategorie
+        categories, totals, corrects = stats.category_counts()
+        success_rates = corrects / totals * 100
 
         # Erstelle das Balkendiagramm
         bars = ax.bar(categories, success_rates)
@@ -5589,11 +5382,12 @@ class FlashcardApp:
         caption_frame.pack(fill='x', pady=5, padx=10)
 
         # Berechne die Statistiken
-        total_cards = sum(stat.get('cards_total', 0) for stat in stats)
-        correct_cards = sum(stat.get('cards_correct', 0) for stat in stats)
+        summary = stats.summary()
+        total_cards = summary['cards_total']
+        correct_cards = summary['cards_correct']
         success_rate = (correct_cards / total_cards * 100) if total_cards > 0 else 0
-        total_time = sum(stat.get('total_time', 0) for stat in stats)
-        unique_dates = len(set(stat['date'] for stat in stats if 'date' in stat))
+        total_time = summary['total_time']
+        unique_dates = summary['days']
 
         # Hauptstatistiken
         main_stats = (
@@ -5601,7 +5395,7 @@ class FlashcardApp:
             f"Karten: {total_cards}\n"
             f"Korrekt: {correct_cards}\n"
             f"Erfolgsquote: {success_rate:.1f}%\n"
-            f"Lernzeit: {total_time} Min."
+            f"Lernzeit: {total_time:.1f} Min."
         )
 
         ttk.Label(
@@ -5615,17 +5409,18 @@ class FlashcardApp:
 
         # Vergleichsstatistiken, falls vorhanden
         if comparison_stats:
-            comp_total = sum(stat.get('cards_total', 0) for stat in comparison_stats)
-            comp_correct = sum(stat.get('cards_correct', 0) for stat in comparison_stats)
+            comp_summary = comparison_stats.summary()
+            comp_total = comp_summary['cards_total']
+            comp_correct = comp_summary['cards_correct']
             comp_rate = (comp_correct / comp_total * 100) if comp_total > 0 else 0
-            comp_time = sum(stat.get('total_time', 0) for stat in comparison_stats)
+            comp_time = comp_summary['total_time']
 
             comp_stats = (
                 f"Vergleich:\n"
                 f"Karten: {comp_total}\n"
                 f"Korrekt: {comp_correct}\n"
                 f"Erfolgsquote: {comp_rate:.1f}%\n"
-                f"Lernzeit: {comp_time} Min."
+                f"Lernzeit: {comp_time:.1f} Min."
             )
 
             ttk.Label(
@@ -5644,7 +5439,7 @@ class FlashcardApp:
         mit 'year' und 'month' übereinstimmt.
         """
         try:
-            d = datetime.datetime.strptime(date_str, "%d.%m.%Y").date()
+            d = parse_date(date_str)
             return (d.year == year and d.month == month)
         except:
             return False
@@ -7861,11 +7656,12 @@ class FlashcardApp:
         Gibt alle Leitner-Karten zurück, die den Filterkriterien entsprechen.
         Wird für die Vorschau und für die Session genutzt.
         """
-        filtered_cards = list(self.leitner_system.cards.values())
-        if hasattr(self, 'category_var') and self.category_var.get() != "Alle":
-            filtered_cards = [c for c in filtered_cards if c.category.lower() == self.category_var.get().lower()]
-        if hasattr(self, 'subcategory_var') and self.subcategory_var.get() != "Alle":
-            filtered_cards = [c for c in filtered_cards if c.subcategory.lower() == self.subcategory_var.get().lower()]
+        category = self.category_var.get() if hasattr(self, 'category_var') else "Alle"
+        subcategory = self.subcategory_var.get() if hasattr(self, 'subcategory_var') else "Alle"
+        filtered_cards = self.leitner_system.get_cards_in_category(
+            category if category != "Alle" else None,
+            subcategory if subcategory != "Alle" else None
+        )
         if hasattr(self, 'level_var') and self.level_var.get() != "Alle":
             filtered_cards = [c for c in filtered_cards if self.leitner_system.get_level(c.points) == self.level_var.get()]
         
@@ -7901,20 +7697,8 @@ class FlashcardApp:
             # Speichere plan_id für späteres Tracking
             self.current_plan_id = plan_id
 
-            # Filtere nur fällige Karten für diese Kategorie/Unterkategorie
-            today = datetime.datetime.now()
-            all_cards = list(self.leitner_system.cards.values())
-            filtered_cards = []
-
-            for card in all_cards:
-                if card.category.lower() != category.lower():
-                    continue
-                if card.subcategory.lower() != subcategory.lower():
-                    continue
-
-                # Nur fällige Karten
-                if card.next_review_date <= today:
-                    filtered_cards.append(card)
+            # Nur fällige Karten dieser Kategorie/Unterkategorie (Fälligkeits-Index)
+            filtered_cards = self.leitner_system.get_cards_due_by(None, category, subcategory)
 
             if not filtered_cards:
                 messagebox.showinfo(
@@ -8138,11 +7922,8 @@ class FlashcardApp:
             level_after             # 7
         ))
 
-        # Flashcard aktualisieren
-        flashcard_obj = self.data_manager.get_flashcard_by_id(self.current_card.card_id)
-        if flashcard_obj:
-            self._update_flashcard_from_leitner(flashcard_obj, self.current_card)
-            self.data_manager.save_flashcards()
+        # Journal-Eintrag (die LeitnerCard schreibt direkt in ihre Flashcard)
+        self.data_manager.record_review(self.current_card.flashcard, correct=False)
 
         # Karte wieder einfügen
         if self.cards_to_learn:
@@ -8213,11 +7994,12 @@ class FlashcardApp:
             level_after         # 7
         ))
         
-        # Flashcard aktualisieren
-        flashcard_obj = self.data_manager.get_flashcard_by_id(self.current_card.card_id)
-        if flashcard_obj:
-            self._update_flashcard_from_leitner(flashcard_obj, self.current_card)
-            self.data_manager.save_flashcards()
+        # Journal-Eintrag (die LeitnerCard schreibt direkt in ihre Flashcard)
+        self.data_manager.record_review(
+            self.current_card.flashcard,
+            correct=True,
+            was_wrong_in_session=was_wrong_in_session
+        )
 
         # Entferne Karte
         if self.cards_to_learn:
@@ -11472,6 +11254,9 @@ class FlashcardApp:
             self.data_manager.save_categories()
             self.data_manager.save_flashcards()
             self.data_manager.save_stats()
+            # Explizites Speichern: nicht auf den Hintergrund-Thread warten
+            if not self.data_manager.flush():
+                raise IOError("Nicht alle Daten konnten geschrieben werden")
             logging.info("Aktueller Zustand erfolgreich gespeichert.")
             messagebox.showinfo("Erfolg", "Aktueller Zustand erfolgreich gespeichert.")
         except Exception as e:
@@ -11493,6 +11278,10 @@ class FlashcardApp:
                 
                 # Dann weitere Daten speichern
                 self.save_current_state()
+
+                # Ausstehende Schreibvorgänge und Hintergrund-Backups abschließen
+                self.data_manager.flush()
+                self.data_manager.backup_store.wait()
                 
                 logging.info("Anwendung wird beendet.")
                 self.master.quit()
@@ -11551,7 +11340,11 @@ class FlashcardApp:
                         except Exception as reload_error:
                             logging.warning(f"Leitner-System Reload fehlgeschlagen: {reload_error}")
 
-                    messagebox.showinfo("Erfolg", f"{len(imported_cards)} Flashcards wurden erfolgreich importiert.")
+                    report = self.data_manager.last_import_report
+                    messagebox.showinfo("Erfolg", f"{len(imported_cards)} Flashcards wurden erfolgreich importiert."
+                                        f" {len(report['duplicates'])} Duplikate wurden übersprungen.")
+                    if report['similar']:
+                        self.show_import_similarity_report(report)
                     self.backup_flashcards("import") # Backup nach erfolgreichem Import
                     logging.info(f"{len(imported_cards)} Flashcards erfolgreich importiert von {file_path}.")
                     # Optional: Aktualisiere die aktuelle Ansicht, falls nötig
@@ -11566,41 +11359,41 @@ class FlashcardApp:
                 messagebox.showerror("Fehler", f"Fehler beim Import: {e}")
                 logging.error(f"Fehler beim Importieren der Flashcards: {e}")
 
+    def show_import_similarity_report(self, report):
+            """Zeigt die beim Import gefundenen ähnlichen Karten (Beinahe-Duplikate) zur Überprüfung."""
+            report_window = ctk.CTkToplevel(self.master)
+            report_window.title("Ähnliche Karten")
+            report_window.geometry("700x500")
+
+            ctk.CTkLabel(
+                report_window,
+                text=f"{len(report['similar'])} importierte Karten ähneln vorhandenen Karten",
+                font=ctk.CTkFont(size=16, weight="bold")
+            ).pack(pady=10)
+
+            textbox = ctk.CTkTextbox(report_window, wrap="word", font=ctk.CTkFont(size=12))
+            textbox.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+            for entry in report['similar']:
+                card, match = entry['card'], entry['match']
+                textbox.insert("end", f"Neu:       {card.question} -> {card.answer}\n")
+                if match is not None:
+                    textbox.insert("end", f"Vorhanden: {match.question} -> {match.answer}"
+                                          f" ({match.category} > {match.subcategory})\n")
+                textbox.insert("end", f"Ähnlichkeit: {entry['similarity'] * 100:.0f}%\n\n")
+            textbox.configure(state="disabled")
+
     # -----------------------------------------------------------------------------------
     # BACKUP SYSTEME
     # -----------------------------------------------------------------------------------
     def backup_flashcards(self, reason="update"):
-        """Erstellt ein Backup der Flashcards."""
-        timestamp = datetime.datetime.now().strftime("%d.%m.%Y_%H-%M-%S")
-        backup_filename = f"flashcards_backup_{reason}_{timestamp}.json"
-        backup_path = os.path.join(self.flashcards_backup_dir, backup_filename)
-        
-        # Sicherstellen, dass das Backup-Verzeichnis existiert
-        os.makedirs(self.flashcards_backup_dir, exist_ok=True)
-        
-        try:
-            self.data_manager.save_flashcards(backup_path)
-            logging.info(f"Flashcards-Backup erstellt: {backup_path}")
-        except Exception as e:
-            logging.error(f"Fehler beim Erstellen des Flashcards-Backups: {e}")
-            messagebox.showerror("Fehler", f"Beim Erstellen des Flashcards-Backups ist ein Fehler aufgetreten:\n{e}")
+        """Plant ein Backup der Flashcards im Backup-Speicher ein (läuft im Hintergrund)."""
+        if not self.data_manager.backup_flashcards(reason):
+            messagebox.showerror("Fehler", "Beim Erstellen des Flashcards-Backups ist ein Fehler aufgetreten.")
 
     def backup_themes(self, reason="update"):
-        """Erstellt ein Backup der Themes."""
-        # Ãƒâ€žndere das Datumsformat zu "%d.%m.%Y_%H-%M-%S"
-        timestamp = datetime.datetime.now().strftime("%d.%m.%Y_%H-%M-%S")
-        backup_filename = f"theme_backup_{reason}_{timestamp}.json"
-        backup_path = os.path.join(self.theme_backup_dir, backup_filename)
-        
-        # Sicherstellen, dass das Backup-Verzeichnis existiert
-        os.makedirs(self.theme_backup_dir, exist_ok=True)
-        
-        try:
-            self.data_manager.theme_manager.export_themes(backup_path)
-            logging.info(f"Theme-Backup erstellt: {backup_path}")
-        except Exception as e:
-            logging.error(f"Fehler beim Erstellen des Theme-Backups: {e}")
-            messagebox.showerror("Fehler", f"Beim Erstellen des Theme-Backups ist ein Fehler aufgetreten:\n{e}")
+        """Plant ein Backup der Themes im Backup-Speicher ein (läuft im Hintergrund)."""
+        if not self.data_manager.backup_themes(reason):
+            messagebox.showerror("Fehler", "Beim Erstellen des Theme-Backups ist ein Fehler aufgetreten.")
 
 
     # -----------------------------------------------------------------------------------
@@ -11800,26 +11593,91 @@ class FlashcardApp:
         backup_type_dropdown = ModernCombobox(main_frame, textvariable=backup_type_var, values=["flashcards", "themes"], state="readonly")
         backup_type_dropdown.pack(pady=5)
 
+        # Liste der Sicherungen (neueste zuerst)
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill='both', expand=True, pady=10)
+        columns = ("zeitpunkt", "anlass", "groesse", "angeheftet")
+        backup_tree = ttk.Treeview(list_frame, columns=columns, show='headings', height=12)
+        for column, heading, width in (
+            ("zeitpunkt", "Zeitpunkt", 170),
+            ("anlass", "Anlass", 160),
+            ("groesse", "Größe (komprimiert)", 160),
+            ("angeheftet", "Angeheftet", 90),
+        ):
+            backup_tree.heading(column, text=heading)
+            backup_tree.column(column, width=width, anchor='w')
+        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=backup_tree.yview)
+        backup_tree.configure(yscrollcommand=scrollbar.set)
+        backup_tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        def refresh_backup_list(*_):
+            backup_tree.delete(*backup_tree.get_children())
+            for entry in self.data_manager.list_backups(backup_type_var.get()):
+                timestamp = datetime.datetime.fromisoformat(entry['timestamp']).strftime("%d.%m.%Y %H:%M:%S")
+                size_text = f"{entry['size'] / 1024:.1f} KB ({entry['compressed_size'] / 1024:.1f} KB)"
+                backup_tree.insert('', 'end', iid=entry['id'], values=(
+                    timestamp, entry['reason'], size_text, "Ja" if entry.get('pinned') else ""
+                ))
+
+        backup_type_dropdown.bind("<<ComboboxSelected>>", refresh_backup_list)
+
         # Backup-Button
         def backup_selected_type():
             backup_type = backup_type_var.get()
             if backup_type == "flashcards":
                 self.backup_flashcards("manual")
-                messagebox.showinfo("Erfolg", "Flashcards-Backup erstellt.")
             elif backup_type == "themes":
                 self.backup_themes("manual")
-                messagebox.showinfo("Erfolg", "Theme-Backup erstellt.")
             else:
-                messagebox.showwarning("Warnung", "UngÃƒÂ¼ltiger Backup-Typ ausgewÃƒÂ¤hlt.")
+                messagebox.showwarning("Warnung", "Ungültiger Backup-Typ ausgewählt.")
+                return
+            # Sicherung läuft im Hintergrund; Liste danach aktualisieren
+            self.data_manager.backup_store.wait()
+            refresh_backup_list()
+            messagebox.showinfo("Erfolg", "Backup erstellt.")
+
+        def restore_selected_backup():
+            selection = backup_tree.selection()
+            if not selection:
+                messagebox.showwarning("Warnung", "Bitte zuerst ein Backup auswählen.")
+                return
+            if not messagebox.askyesno("Wiederherstellen", "Den aktuellen Stand durch das ausgewählte Backup ersetzen?\n"
+                                       "Der aktuelle Stand wird vorher gesichert."):
+                return
+            if self.data_manager.restore_backup(selection[0]):
+                if backup_type_var.get() == "flashcards" and hasattr(self, 'leitner_system'):
+                    self.leitner_system.reload_cards()
+                refresh_backup_list()
+                messagebox.showinfo("Erfolg", "Backup wurde wiederhergestellt.")
+            else:
+                messagebox.showerror("Fehler", "Backup konnte nicht wiederhergestellt werden.")
 
-        backup_btn = ModernButton(
-            main_frame,
-            text="Backup erstellen",
-            command=backup_selected_type,
-            width=20,
-            style=ButtonStyle.PRIMARY.value
-        )
-        backup_btn.pack(pady=10)
+        def delete_selected_backup():
+            selection = backup_tree.selection()
+            if not selection:
+                messagebox.showwarning("Warnung", "Bitte zuerst ein Backup auswählen.")
+                return
+            if messagebox.askyesno("Löschen", "Ausgewähltes Backup löschen?"):
+                self.data_manager.backup_store.delete(selection[0])
+                refresh_backup_list()
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=10)
+        for text, command, style in (
+            ("Backup erstellen", backup_selected_type, ButtonStyle.PRIMARY.value),
+            ("Wiederherstellen", restore_selected_backup, ButtonStyle.SECONDARY.value),
+            ("Löschen", delete_selected_backup, ButtonStyle.DANGER.value),
+        ):
+            ModernButton(
+                button_frame,
+                text=text,
+                command=command,
+                width=20,
+                style=style
+            ).pack(side='left', padx=5)
+
+        refresh_backup_list()
 
         # Zurück-Button
         back_btn = ModernButton(
@@ -14355,7 +14213,7 @@ Methoden:
                 stat.get('category') == category and 
                 stat.get('subcategory') == subcategory):
                 try:
-                    date = datetime.datetime.strptime(stat['date'], "%d.%m.%Y").date()
+                    date = parse_date(stat['date'])
                     week = date.isocalendar()[1]
                     
                     if week not in weekly_progress:
@@ -14402,8 +14260,8 @@ Methoden:
         main_frame = ttk.Frame(self.content_frame)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
-        # Anzeige aller verfügbaren Tags
-        all_tags = sorted({tag for card in self.data_manager.flashcards for tag in card.tags})
+        # Anzeige aller verfügbaren Tags (mit Anzahl der Karten aus dem Tag-Index)
+        tag_counts = self.data_manager.get_tag_counts()
 
         tk.Label(main_frame, text="VerfÃƒÂ¼gbare Tags:", font=(self.appearance_settings.font_family, 12)).pack(pady=5)
 
@@ -14411,9 +14269,9 @@ Methoden:
         tags_frame.pack(pady=5, fill='x')
 
         self.tag_vars = {}
-        for tag in all_tags:
+        for tag, count in tag_counts.items():
             var = tk.BooleanVar()
-            chk = tk.Checkbutton(tags_frame, text=tag, variable=var, bg=self.appearance_settings.text_bg_color, fg=self.appearance_settings.text_fg_color)
+            chk = tk.Checkbutton(tags_frame, text=f"{tag} ({count})", variable=var, bg=self.appearance_settings.text_bg_color, fg=self.appearance_settings.text_fg_color)
             chk.pack(side=tk.LEFT, padx=5, pady=5)
             self.tag_vars[tag] = var
 
@@ -14815,7 +14673,8 @@ def main():
     """
     setup_logging()
     
-    # Erstelle den DataManager ohne data_path_func
+    # Erstelle den DataManager ohne data_path_func; die Flashcards lädt die App im Hintergrund
+    DataManager.defer_flashcard_loading = True
     data_manager = DataManager()
     
     # Debug: Ausgabe der verfügbaren Attribute
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Memoisierung abgeleiteter Werte für das Flashcard-Projekt.
+Ergebnisse teurer Berechnungen (Scores, Empfehlungen, Set-/Planer-Statistiken) werden in
+einem begrenzten LRU-Cache abgelegt. Der Schlüssel enthält neben den Argumenten die
+Versionszähler der Sammlungen, von denen das Ergebnis abhängt (DataManager.data_versions);
+nach einer Änderung passt der alte Eintrag nicht mehr und fällt mit der Zeit heraus.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+# Maximale Anzahl gespeicherter Ergebnisse
+DEFAULT_MEMO_SIZE = 512
+
+
+class VersionedLRUCache:
+    """
+    Begrenzter LRU-Cache mit Treffer-/Fehlzählern.
+
+    Werte werden beim Ablegen und beim Herausgeben kopiert (deepcopy), damit Aufrufer die
+    zurückgegebenen Dicts verändern dürfen, ohne den Cache zu verfälschen.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE):
+        """
+        Args:
+            maxsize (int): Maximale Anzahl Einträge; der am längsten nicht benutzte fällt heraus.
+        """
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Gibt das gespeicherte Ergebnis zu key zurück oder berechnet und speichert es.
+
+        Args:
+            key (Hashable): Argumente und Versionszähler der Berechnung.
+            compute (Callable[[], Any]): Berechnet das Ergebnis (ohne Lock aufgerufen).
+        """
+        with self.lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(self._entries[key])
+            self._misses += 1
+
+        value = compute()
+        with self.lock:
+            self._entries[key] = copy.deepcopy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict:
+        """
+        Kennzahlen für die Diagnose.
+
+        Returns:
+            Dict: size, maxsize, hits, misses, evictions, hit_rate (0-1).
+        """
+        with self.lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+            }
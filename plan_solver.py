@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Optimale Tageszuordnung für die Wochenplanung (Min-Cost-Flow).
+Jede Kategorie/Unterkategorie wird höchstens einem Tag zugeordnet. Das Netz:
+
+    Quelle -> Kategorie   je Unterkategorie eine Kante (Kapazität 1, Kosten -(Belohnung + Score))
+    Kategorie -> Tag      Kante je weiterer Session derselben Kategorie am Tag (Wiederholungskosten steigen)
+    Tag -> Senke          Kante je Session des Tages (Kapazität des Tages, konvexe Abweichung vom Tagesziel)
+
+Der Fluss wird mit kürzesten Wegen (Bellman-Ford/SPFA) erhöht, solange ein Weg die Kosten
+senkt. Alle Kosten sind ganzzahlig und die Kanten werden in fester Reihenfolge angelegt,
+das Ergebnis ist daher deterministisch. Höchstens so viele Erhöhungen wie Sessions in die
+Woche passen (z.B. 7 × 5), daher auch bei vielen Lernsets schnell genug zum interaktiven Planen.
+
+Vergleich mit der Greedy-Planung: python plan_solver.py benchmark [Anzahl Kategorien] [Unterkategorien je Kategorie]
+"""
+
+import logging
+import random
+import statistics
+import sys
+import time
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+PLAN_SOLVER_GREEDY = 'greedy'
+PLAN_SOLVER_FLOW = 'flow'
+
+# Kostengewichte (ganzzahlig; Scores gehen mit zwei Nachkommastellen ein)
+ASSIGN_REWARD = 10_000_000   # Jede zugeordnete Session lohnt sich, solange Kapazität frei ist
+REPEAT_COST = 100_000        # Je weiterer Session derselben Kategorie am selben Tag
+BALANCE_COST = 1_000         # Je Einheit der quadratischen Abweichung vom Tagesziel (in Sessions)
+SCORE_SCALE = 100
+
+# Grenzen einer Session (wie in WeeklyPlanner.auto_plan_week_with_preferences)
+MIN_SESSION_CARDS = 5
+MAX_SESSION_CARDS = 50
+
+
+class MinCostFlow:
+    """Min-Cost-Flow mit sukzessiven kürzesten Wegen auf dem Residualnetz (Kanten als Listen)."""
+
+    def __init__(self, node_count: int):
+        self.graph: List[List[int]] = [[] for _ in range(node_count)]
+        self.to: List[int] = []
+        self.capacity: List[int] = []
+        self.cost: List[int] = []
+
+    def add_edge(self, source: int, target: int, capacity: int, cost: int) -> int:
+        """Fügt eine Kante und ihre Rückkante hinzu und gibt den Index der Kante zurück."""
+        index = len(self.to)
+        for node, other, cap, edge_cost in ((source, target, capacity, cost), (target, source, 0, -cost)):
+            self.graph[node].append(len(self.to))
+            self.to.append(other)
+            self.capacity.append(cap)
+            self.cost.append(edge_cost)
+        return index
+
+    def flow(self, edge: int) -> int:
+        """Fluss über eine mit add_edge angelegte Kante."""
+        return self.capacity[edge ^ 1]
+
+    def solve(self, source: int, sink: int) -> Tuple[int, int]:
+        """
+        Erhöht den Fluss entlang kürzester Wege, solange dadurch die Gesamtkosten sinken.
+
+        Returns:
+            Tuple[int, int]: (Fluss, Kosten)
+        """
+        total_flow = total_cost = 0
+        node_count = len(self.graph)
+        while True:
+            distance = [None] * node_count
+            parent_edge = [-1] * node_count
+            queued = [False] * node_count
+            distance[source] = 0
+            queue = deque([source])
+            while queue:
+                node = queue.popleft()
+                queued[node] = False
+                for edge in self.graph[node]:
+                    if self.capacity[edge] <= 0:
+                        continue
+                    target = self.to[edge]
+                    candidate = distance[node] + self.cost[edge]
+                    if distance[target] is None or candidate < distance[target]:
+                        distance[target] = candidate
+                        parent_edge[target] = edge
+                        if not queued[target]:
+                            queued[target] = True
+                            queue.append(target)
+
+            if distance[sink] is None or distance[sink] >= 0:
+                return total_flow, total_cost
+
+            # Engpass entlang des Weges
+            amount = None
+            node = sink
+            while node != source:
+                edge = parent_edge[node]
+                amount = self.capacity[edge] if amount is None else min(amount, self.capacity[edge])
+                node = self.to[edge ^ 1]
+            node = sink
+            while node != source:
+                edge = parent_edge[node]
+                self.capacity[edge] -= amount
+                self.capacity[edge ^ 1] += amount
+                node = self.to[edge ^ 1]
+            total_flow += amount
+            total_cost += amount * distance[sink]
+
+
+def solve_day_assignment(items: Sequence[Tuple[Hashable, Hashable, float]],
+                         day_sessions: Sequence[int],
+                         day_weights: Optional[Sequence[float]] = None,
+                         allow_repeats: bool = True) -> Dict[Hashable, int]:
+    """
+    Ordnet Einträge (z.B. Kategorie/Unterkategorie) kostenminimal Tagen zu.
+
+    Args:
+        items (Sequence[Tuple[Hashable, Hashable, float]]): (Schlüssel, Gruppe, Score) je Eintrag; Einträge
+            derselben Gruppe (Kategorie) am selben Tag kosten REPEAT_COST je Wiederholung.
+        day_sessions (Sequence[int]): Maximale Anzahl Sessions je Tag (0 = freier Tag).
+        day_weights (Optional[Sequence[float]]): Relatives Tagesziel (Standard: gleichmäßig).
+        allow_repeats (bool): False verbietet mehrere Einträge derselben Gruppe an einem Tag.
+
+    Returns:
+        Dict[Hashable, int]: Tag-Index je zugeordnetem Schlüssel; Einträge ohne Platz fehlen.
+            Bei Platzmangel bleiben die Einträge mit dem niedrigsten Score übrig.
+    """
+    days = len(day_sessions)
+    weights = list(day_weights) if day_weights is not None else [1.0] * days
+    weights = [weight if day_sessions[day] > 0 else 0.0 for day, weight in enumerate(weights)]
+    weight_sum = sum(weights)
+    expected_sessions = min(len(items), sum(day_sessions))
+    targets = [expected_sessions * weight / weight_sum if weight_sum else 0.0 for weight in weights]
+
+    # Gruppen in der Reihenfolge des ersten Auftretens
+    group_index: Dict[Hashable, int] = {}
+    members: List[List[Tuple[Hashable, float]]] = []
+    for key, group, score in items:
+        if group not in group_index:
+            group_index[group] = len(members)
+            members.append([])
+        members[group_index[group]].append((key, score))
+
+    source = 0
+    sink = 1
+    first_group = 2
+    first_day = first_group + len(members)
+    network = MinCostFlow(first_day + days)
+
+    entry_edges = []
+    for index, group_members in enumerate(members):
+        # Bei gleichem Score entscheidet die Eingabereihenfolge
+        group_members.sort(key=lambda member: -member[1])
+        for key, score in group_members:
+            edge = network.add_edge(source, first_group + index, 1,
+                                    -(ASSIGN_REWARD + int(round(score * SCORE_SCALE))))
+            entry_edges.append((index, key, edge))
+
+    day_edges = []
+    for index, group_members in enumerate(members):
+        repeats = len(group_members) if allow_repeats else 1
+        for day in range(days):
+            for repeat in range(min(repeats, day_sessions[day])):
+                edge = network.add_edge(first_group + index, first_day + day, 1, repeat * REPEAT_COST)
+                day_edges.append((index, day, edge))
+
+    for day in range(days):
+        for session in range(1, day_sessions[day] + 1):
+            marginal = (session - targets[day]) ** 2 - (session - 1 - targets[day]) ** 2
+            network.add_edge(first_day + day, sink, 1, int(round(BALANCE_COST * marginal)))
+
+    network.solve(source, sink)
+
+    # Die Einträge einer Gruppe sind für die Tageskosten gleichwertig: die stärksten zuerst, Tage aufsteigend
+    days_per_group: List[List[int]] = [[] for _ in members]
+    for index, day, edge in day_edges:
+        days_per_group[index].extend([day] * network.flow(edge))
+    assignment: Dict[Hashable, int] = {}
+    for index, key, edge in entry_edges:
+        if network.flow(edge):
+            assignment[key] = days_per_group[index].pop(0)
+    return assignment
+
+
+def session_capacities(day_card_limits: Sequence[int], max_sessions: int, min_session_cards: int) -> List[int]:
+    """Maximale Sessions je Tag aus den Kartengrenzen (freie Tage: 0)."""
+    return [max(0, min(max_sessions, int(limit) // min_session_cards)) for limit in day_card_limits]
+
+
+def typical_session_cards(card_estimates: Sequence[int]) -> int:
+    """Durchschnittliche Sessiongröße der Kandidaten (auf MIN_SESSION_CARDS..MAX_SESSION_CARDS begrenzt)."""
+    if not card_estimates:
+        return MIN_SESSION_CARDS
+    clamped = [max(MIN_SESSION_CARDS, min(int(cards), MAX_SESSION_CARDS)) for cards in card_estimates]
+    return int(round(statistics.mean(clamped)))
+
+
+def flow_session_cards(card_estimate: int, day_budget: float, day_sessions: int) -> int:
+    """
+    Karten einer vom Flow zugeordneten Session: gleicher Anteil am Tagesbudget für jede
+    Session des Tages, mindestens MIN_SESSION_CARDS. Da die Tageskapazität aus
+    session_capacities mit mindestens MIN_SESSION_CARDS je Session stammt, bleibt die
+    Summe eines Tages innerhalb seiner Kartengrenze.
+    """
+    share = int(day_budget / max(1, day_sessions))
+    return max(MIN_SESSION_CARDS, min(int(card_estimate), share, MAX_SESSION_CARDS))
+
+
+# -----------------------------------------------------------------------------
+# BENCHMARK
+# -----------------------------------------------------------------------------
+
+def _plan_quality(assignment: Dict[Tuple[str, str], int], total: int, weights: Sequence[float],
+                  cards: Sequence[int], day_card_limits: Sequence[int]) -> Dict:
+    """Kennzahlen einer Zuordnung: Sessions, Karten, Grenzüberschreitung, Wiederholungen, Spitze und Abweichung."""
+    sessions = [0] * 7
+    groups = set()
+    repeats = 0
+    for (category, _), day in assignment.items():
+        sessions[day] += 1
+        if (category, day) in groups:
+            repeats += 1
+        groups.add((category, day))
+    weight_sum = sum(weights) or 1.0
+    targets = [len(assignment) * weight / weight_sum for weight in weights]
+    return {
+        'geplant': f"{len(assignment)}/{total}",
+        'wiederholungen': repeats,
+        'spitze': max(sessions),
+        'abweichung': round(statistics.pstdev(s - t for s, t in zip(sessions, targets)), 2),
+        'sessions': sessions,
+        'karten_geplant': sum(cards),
+        'karten_über_grenze': sum(max(0, day_cards - limit) for day_cards, limit in zip(cards, day_card_limits)),
+        'karten': list(cards),
+    }
+
+
+def _greedy_plan(planner, items: Sequence[Tuple[Tuple[str, str], str, float]], card_estimates: Dict[Tuple[str, str], int],
+                 day_card_limits: Sequence[int], target_cards_per_day: Sequence[float]
+                 ) -> Tuple[Dict[Tuple[str, str], int], List[int]]:
+    """Zuordnung und Karten je Tag wie WeeklyPlanner.auto_plan_week_with_preferences (Greedy, Score absteigend)."""
+    preferences = {'day_card_limits': list(day_card_limits)}
+    used_categories_per_day = {day: set() for day in range(7)}
+    cards_per_day = {day: 0 for day in range(7)}
+    assignment = {}
+    for key, category, score in sorted(items, key=lambda item: -item[2]):
+        day = planner._find_best_day_with_weights(category, used_categories_per_day, cards_per_day,
+                                                  target_cards_per_day, {}, preferences)
+        if day is not None:
+            used_categories_per_day[day].add(category)
+            cards = min(card_estimates[key], int(target_cards_per_day[day] - cards_per_day[day]),
+                        int(day_card_limits[day] - cards_per_day[day]), MAX_SESSION_CARDS)
+            cards_per_day[day] += max(cards, MIN_SESSION_CARDS)
+            assignment[key] = day
+    return assignment, [cards_per_day[day] for day in range(7)]
+
+
+def _flow_plan(items: Sequence[Tuple[Tuple[str, str], str, float]], card_estimates: Dict[Tuple[str, str], int],
+               day_card_limits: Sequence[int], target_cards_per_day: Sequence[float], day_weights: Sequence[float]
+               ) -> Tuple[Dict[Tuple[str, str], int], List[int]]:
+    """Zuordnung und Karten je Tag wie der Flow-Modus von WeeklyPlanner.auto_plan_week_with_preferences."""
+    capacities = session_capacities(day_card_limits, 5, typical_session_cards(list(card_estimates.values())))
+    assignment = solve_day_assignment(items, capacities, day_weights, allow_repeats=False)
+    sessions = [0] * 7
+    for day in assignment.values():
+        sessions[day] += 1
+    cards_per_day = [0] * 7
+    for key, day in assignment.items():
+        day_budget = min(target_cards_per_day[day], day_card_limits[day])
+        cards_per_day[day] += flow_session_cards(card_estimates[key], day_budget, sessions[day])
+    return assignment, cards_per_day
+
+
+def run_benchmark(category_count: int = 40, subcategories: int = 5, total_cards: int = 250,
+                  seed: int = 1) -> List[Dict]:
+    """
+    Vergleicht Greedy- und Flow-Zuordnung auf zufälligen Lernsets (zufällige Anzahl
+    fälliger Karten je Unterkategorie, dieselben Tagesgrenzen für beide Verfahren).
+
+    Returns:
+        List[Dict]: Je Verfahren Laufzeit und Qualitätskennzahlen.
+    """
+    from calendar_system import WeeklyPlanner
+
+    planner = WeeklyPlanner.__new__(WeeklyPlanner)  # Nur die Tageswahl wird benutzt
+    rng = random.Random(seed)
+    items = [((f"Kategorie {c}", f"Thema {s}"), f"Kategorie {c}", round(rng.uniform(0, 100), 1))
+             for c in range(category_count) for s in range(rng.randint(1, subcategories))]
+    card_estimates = {key: rng.randint(1, 40) for key, _, _ in items}
+    day_card_limits = [35, 35, 20, 35, 35, 999, 0]
+    day_weights = [1.2, 1.2, 0.6, 1.2, 1.2, 1.6, 0.0]
+    target_cards_per_day = [total_cards * weight / 7.0 for weight in day_weights]
+
+    results = []
+    for name, solve in (
+            (PLAN_SOLVER_GREEDY, lambda: _greedy_plan(planner, items, card_estimates, day_card_limits,
+                                                      target_cards_per_day)),
+            (PLAN_SOLVER_FLOW, lambda: _flow_plan(items, card_estimates, day_card_limits, target_cards_per_day,
+                                                  day_weights))):
+        start = time.perf_counter()
+        assignment, cards = solve()
+        elapsed = time.perf_counter() - start
+        results.append({'verfahren': name, 'laufzeit_ms': round(elapsed * 1000, 1),
+                        **_plan_quality(assignment, len(items), day_weights, cards, day_card_limits)})
+    return results
+
+
+def main(argv: List[str]) -> int:
+    if not argv or argv[0] != 'benchmark':
+        print("Verwendung: python plan_solver.py benchmark [Anzahl Kategorien] [Unterkategorien je Kategorie]")
+        return 2
+    category_count = int(argv[1]) if len(argv) > 1 else 40
+    subcategories = int(argv[2]) if len(argv) > 2 else 5
+    for result in run_benchmark(category_count, subcategories):
+        print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv[1:]))
@@ -116,7 +116,7 @@ class PlannerManager:
 
         Args:
             planner_id: ID des Planers
-            **kwargs: Zu aktualisierende Felder (name, lernset_ids, farbe, icon)
+            **kwargs: Zu aktualisierende Felder (name, lernset_ids, farbe, icon, day_card_limits)
 
         Returns:
             bool: True wenn erfolgreich
@@ -140,6 +140,10 @@ class PlannerManager:
             if 'icon' in kwargs:
                 planner['icon'] = kwargs['icon']
 
+            if 'day_card_limits' in kwargs:
+                # Kartengrenze je Wochentag (Montag-Sonntag) aus den zuletzt gewählten Präferenzen
+                planner['day_card_limits'] = [int(limit) for limit in kwargs['day_card_limits']]
+
             self.data_manager.save_data()
             logging.info(f"Planer {planner_id} aktualisiert.")
             return True
@@ -302,6 +306,12 @@ class PlannerManager:
         Returns:
             Dict: Statistiken
         """
+        return self.data_manager.memoize(
+            'planner_statistics', (planner_id,), ('planners', 'learning_sets'),
+            lambda: self._compute_planner_statistics(planner_id))
+
+    def _compute_planner_statistics(self, planner_id: str) -> Dict:
+        """Berechnet die Planer-Statistiken ohne Cache (siehe get_planner_statistics)."""
         planner = self.get_planner(planner_id)
         if not planner:
             return {}
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Wiederholtes Abspielen der Lernhistorie unter anderen Leitner-Regeln.
+Die Antworten jeder Karte (Zeitpunkt, richtig/falsch, bereits in der Session falsch) werden
+ab einer neuen Karte mit den Regeln von LeitnerCard nachgerechnet, wobei Punkte-, Level-,
+Intervall- und Straftabellen aus einer LeitnerRules-Konfiguration stammen. Ergebnis je
+Konfiguration: Level-Verteilung und Fälligkeiten der nächsten Tage.
+
+Für Vergleiche vieler Konfigurationen verteilt replay_sweep die Karten auf Shards und rechnet
+jeden Shard in einem eigenen Prozess für alle Konfigurationen (die Karten werden nur einmal
+je Shard übertragen). Unter Windows muss der Aufruf hinter `if __name__ == "__main__":` stehen.
+"""
+
+import datetime
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from day_numbers import day_of_seconds, parse_day, seconds_of, today
+from leitner_system import LEVEL_INTERVALS, LEVEL_PENALTY_FACTORS, LEVEL_POINT_LIMITS
+
+# Eine Antwort: (Sekunden seit der Epoche, richtig, bereits in dieser Session falsch)
+ReviewEvent = Tuple[int, bool, bool]
+
+SUCCESS_HISTORY_SIZE = 10
+_SECONDS_PER_DAY = 86400
+
+
+@dataclass(frozen=True)
+class LeitnerRules:
+    """
+    Tabellen des Leitner-Systems; die Standardwerte entsprechen LeitnerCard.
+
+    Erfolgsquoten-Multiplikator (Quote in Prozent): bis multiplier_breakpoints[0] steigt er mit
+    multiplier_exponents[0] von 0 auf multiplier_values[0], bis multiplier_breakpoints[1] auf
+    multiplier_values[1], bis 100% auf multiplier_values[2]. streak_bonus und streak_loss sind
+    (Mindest-Streak, Faktor)-Paare, absteigend sortiert; darunter gilt 1.0.
+    """
+    name: str = "Standard"
+    level_point_limits: Tuple[int, ...] = LEVEL_POINT_LIMITS
+    level_intervals: Tuple[int, ...] = tuple(LEVEL_INTERVALS[level] for level in range(1, 11))
+    level_penalty_factors: Tuple[float, ...] = tuple(LEVEL_PENALTY_FACTORS[level] for level in range(1, 11))
+    streak_bonus: Tuple[Tuple[int, float], ...] = ((20, 3.0), (15, 2.5), (10, 2.0), (5, 1.5))
+    streak_loss: Tuple[Tuple[int, float], ...] = ((20, 4.0), (15, 3.0), (10, 2.0), (5, 1.5))
+    multiplier_breakpoints: Tuple[float, float] = (50.0, 85.0)
+    multiplier_values: Tuple[float, float, float] = (1.0, 2.0, 3.0)
+    multiplier_exponents: Tuple[float, float, float] = (2.0, 1.5, 1.2)
+
+    def __post_init__(self):
+        if len(self.level_point_limits) != 9:
+            raise ValueError("level_point_limits braucht 9 Obergrenzen (Level 1-9).")
+        if len(self.level_intervals) != 10 or len(self.level_penalty_factors) != 10:
+            raise ValueError("level_intervals und level_penalty_factors brauchen je 10 Werte (Level 1-10).")
+
+    def level_for(self, points: int) -> int:
+        """Level zu einem Punktestand (LeitnerSystem.get_level)."""
+        for level, limit in enumerate(self.level_point_limits, start=1):
+            if points <= limit:
+                return level
+        return 10
+
+    def success_multiplier(self, rate: float) -> float:
+        """Multiplikator zu einer Erfolgsquote in Prozent (LeitnerCard._get_exponential_multiplier)."""
+        low, high = self.multiplier_breakpoints
+        first, second, third = self.multiplier_values
+        if rate <= 0:
+            return 0.0
+        if rate <= low:
+            return first * (rate / low) ** self.multiplier_exponents[0]
+        if rate <= high:
+            return first + (second - first) * ((rate - low) / (high - low)) ** self.multiplier_exponents[1]
+        return second + (third - second) * ((rate - high) / (100 - high)) ** self.multiplier_exponents[2]
+
+    @staticmethod
+    def _factor(table: Tuple[Tuple[int, float], ...], streak: int) -> float:
+        for minimum, factor in table:
+            if streak >= minimum:
+                return factor
+        return 1.0
+
+
+@dataclass
+class ReplayResult:
+    """Ergebnis einer Konfiguration: Karten je Level (1-10) und Fälligkeiten je Tag ab as_of."""
+    rules: LeitnerRules
+    cards: int = 0
+    events: int = 0
+    level_distribution: Dict[int, int] = field(default_factory=lambda: {level: 0 for level in range(1, 11)})
+    load: List[int] = field(default_factory=list)
+    later: int = 0
+
+    def merge(self, other: 'ReplayResult'):
+        self.cards += other.cards
+        self.events += other.events
+        for level, count in other.level_distribution.items():
+            self.level_distribution[level] += count
+        self.load = [a + b for a, b in zip(self.load, other.load)] if self.load else list(other.load)
+        self.later += other.later
+
+
+def replay_card(events: Sequence[ReviewEvent], rules: LeitnerRules) -> Tuple[int, int, Optional[int]]:
+    """
+    Spielt die Antworten einer neuen Karte nach (Regeln wie LeitnerCard.answer_correct/answer_incorrect).
+
+    Returns:
+        Tuple[int, int, Optional[int]]: (Punkte, Level, nächste Wiederholung in Sekunden oder None)
+    """
+    points = streak = incorrect_sessions = 0
+    level = 1
+    in_recovery = False
+    recovery_interval = 1
+    history: List[bool] = []
+    next_review = None
+    streak_bonus = rules.streak_bonus
+    streak_loss = rules.streak_loss
+    factor = LeitnerRules._factor
+
+    for seconds, correct, was_wrong_in_session in events:
+        if correct and was_wrong_in_session:
+            # Richtig nach Fehler in derselben Session: keine Punkte, heute erneut
+            history.append(True)
+            del history[:-SUCCESS_HISTORY_SIZE]
+            next_review = seconds
+            continue
+
+        if correct:
+            streak += 1
+            incorrect_sessions = 0
+            history.append(True)
+            del history[:-SUCCESS_HISTORY_SIZE]
+            rate = sum(history) / len(history) * 100
+            points += max(1, int(streak * rules.success_multiplier(rate) * factor(streak_bonus, streak)))
+            level = rules.level_for(points)
+            interval = rules.level_intervals[level - 1]
+            if in_recovery:
+                recovery_interval = min(recovery_interval * 2, interval)
+                if recovery_interval >= interval:
+                    in_recovery = False
+                next_review = seconds + recovery_interval * _SECONDS_PER_DAY
+            else:
+                next_review = seconds + interval * _SECONDS_PER_DAY
+        else:
+            broken_streak = streak
+            streak = 0
+            incorrect_sessions += 1
+            history.append(False)
+            del history[:-SUCCESS_HISTORY_SIZE]
+            penalty = int(incorrect_sessions * rules.level_penalty_factors[level - 1]
+                          * factor(streak_loss, broken_streak))
+            points = max(0, points - penalty)
+            level = rules.level_for(points)
+            in_recovery = True
+            recovery_interval = 1
+            next_review = seconds
+
+    return points, level, next_review
+
+
+def replay_cards(streams: Dict[str, Sequence[ReviewEvent]], rules: LeitnerRules,
+                 as_of_day: Optional[int] = None, days: int = 30) -> ReplayResult:
+    """
+    Spielt alle Karten unter einer Konfiguration nach.
+
+    Args:
+        streams (Dict[str, Sequence[ReviewEvent]]): card_id -> nach Zeit sortierte Antworten
+            (leere Liste: nie gelernte Karte, Level 1 und ab heute fällig).
+        rules (LeitnerRules): Die zu prüfende Konfiguration.
+        as_of_day (Optional[int]): Epochentag von Tag 0 der Fälligkeiten (Standard: heute).
+        days (int): Anzahl Tage der Fälligkeitsvorschau; frühere Termine zählen zu Tag 0.
+    """
+    as_of_day = today() if as_of_day is None else as_of_day
+    result = ReplayResult(rules, load=[0] * days)
+    for events in streams.values():
+        _, level, next_review = replay_card(events, rules)
+        result.cards += 1
+        result.events += len(events)
+        result.level_distribution[level] += 1
+        offset = 0 if next_review is None else max(0, day_of_seconds(next_review) - as_of_day)
+        if offset < days:
+            result.load[offset] += 1
+        else:
+            result.later += 1
+    return result
+
+
+def _replay_shard(shard: Dict[str, Sequence[ReviewEvent]], configurations: Sequence[LeitnerRules],
+                  as_of_day: int, days: int) -> List[ReplayResult]:
+    """Ein Shard unter allen Konfigurationen (läuft im Worker-Prozess)."""
+    return [replay_cards(shard, rules, as_of_day, days) for rules in configurations]
+
+
+def replay_sweep(streams: Dict[str, Sequence[ReviewEvent]], configurations: Sequence[LeitnerRules],
+                 days: int = 30, workers: Optional[int] = None, shards: Optional[int] = None,
+                 as_of_day: Optional[int] = None) -> List[ReplayResult]:
+    """
+    Vergleicht mehrere Konfigurationen über dieselbe Historie.
+
+    Args:
+        streams (Dict[str, Sequence[ReviewEvent]]): card_id -> Antworten (siehe events_from_stats).
+        configurations (Sequence[LeitnerRules]): Die Konfigurationen.
+        days (int): Anzahl Tage der Fälligkeitsvorschau.
+        workers (Optional[int]): Anzahl Prozesse (Standard: CPU-Anzahl); 1 rechnet im aktuellen Prozess.
+        shards (Optional[int]): Anzahl Karten-Shards (Standard: 4 je Prozess).
+        as_of_day (Optional[int]): Epochentag von Tag 0 (Standard: heute).
+
+    Returns:
+        List[ReplayResult]: Ein Ergebnis je Konfiguration, in deren Reihenfolge.
+    """
+    as_of_day = today() if as_of_day is None else as_of_day
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(streams) < 2:
+        return _replay_shard(streams, configurations, as_of_day, days)
+
+    shard_count = max(1, min(len(streams), shards or workers * 4))
+    card_ids = list(streams)
+    parts = [{card_id: streams[card_id] for card_id in card_ids[index::shard_count]}
+             for index in range(shard_count)]
+
+    results = [ReplayResult(rules, load=[0] * days) for rules in configurations]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_replay_shard, part, configurations, as_of_day, days) for part in parts]
+        for future in futures:
+            for total, partial in zip(results, future.result()):
+                total.merge(partial)
+    logging.info(f"Replay: {len(configurations)} Konfigurationen über {len(streams)} Karten "
+                 f"({shard_count} Shards, {workers} Prozesse).")
+    return results
+
+
+# -----------------------------------------------------------------------------
+# HISTORIE
+# -----------------------------------------------------------------------------
+
+def _card_key(question, category, subcategory) -> Tuple[str, str, str]:
+    return (str(question or '').strip().lower(), str(category or '').strip().lower(),
+            str(subcategory or '').strip().lower())
+
+
+def _session_seconds(session: Dict) -> Optional[int]:
+    day = parse_day(session.get('date'))
+    if day is None:
+        return None
+    seconds = day * _SECONDS_PER_DAY
+    try:
+        hours, minutes = str(session.get('time') or '').split(':')[:2]
+        seconds += int(hours) * 3600 + int(minutes) * 60
+    except ValueError:
+        pass
+    return seconds
+
+
+def events_from_stats(sessions: Iterable[Dict], flashcards: Iterable) -> Dict[str, List[ReviewEvent]]:
+    """
+    Antwortfolgen je Karte aus den Sitzungsstatistiken.
+
+    Die Details enthalten keine card_id; sie werden über Frage, Kategorie und Subkategorie
+    (ohne Groß-/Kleinschreibung) den Karten zugeordnet. Innerhalb einer Sitzung zählt die
+    Reihenfolge der Details; eine richtige Antwort nach einem Fehler in derselben Sitzung gilt
+    als was_wrong_in_session. Nicht zuordenbare Details werden übersprungen.
+
+    Returns:
+        Dict[str, List[ReviewEvent]]: card_id -> Antworten (auch leer für nie gelernte Karten).
+    """
+    streams: Dict[str, List[Tuple[int, int, bool, bool]]] = {}
+    card_ids: Dict[Tuple[str, str, str], str] = {}
+    for card in flashcards:
+        streams[card.id] = []
+        card_ids.setdefault(_card_key(card.question, card.category, card.subcategory), card.id)
+
+    unmatched = 0
+    for position, session in enumerate(sessions):
+        if not isinstance(session, dict) or not session.get('details'):
+            continue
+        seconds = _session_seconds(session)
+        if seconds is None:
+            continue
+        wrong_in_session = set()
+        for index, detail in enumerate(session['details']):
+            if not isinstance(detail, dict):
+                continue
+            card_id = card_ids.get(_card_key(detail.get('question'), detail.get('category'), detail.get('subcategory')))
+            if card_id is None:
+                unmatched += 1
+                continue
+            correct = bool(detail.get('correct', False))
+            # Sortierschlüssel: Sitzungszeit, dann Position der Sitzung und des Details
+            streams[card_id].append((seconds, position * 100_000 + index, correct,
+                                     correct and card_id in wrong_in_session))
+            if not correct:
+                wrong_in_session.add(card_id)
+
+    if unmatched:
+        logging.info(f"Replay: {unmatched} Antworten ohne passende Karte übersprungen.")
+    return {card_id: [(seconds, correct, was_wrong) for seconds, _, correct, was_wrong in sorted(events)]
+            for card_id, events in streams.items()}
+
+
+def events_from_reviews(reviews: Iterable[Tuple[str, bool, object, bool]],
+                        card_ids: Optional[Iterable[str]] = None) -> Dict[str, List[ReviewEvent]]:
+    """
+    Antwortfolgen je Karte aus (card_id, correct, timestamp, was_wrong_in_session)-Tupeln,
+    wie sie LeitnerSystem.apply_reviews annimmt (timestamp als datetime oder ISO-String).
+
+    Args:
+        card_ids (Optional[Iterable[str]]): Karten, die auch ohne Antworten enthalten sein sollen.
+    """
+    streams: Dict[str, List[Tuple[int, int, bool, bool]]] = {card_id: [] for card_id in card_ids or ()}
+    for position, (card_id, correct, timestamp, was_wrong_in_session) in enumerate(reviews):
+        if isinstance(timestamp, str):
+            try:
+                timestamp = datetime.datetime.fromisoformat(timestamp)
+            except ValueError:
+                continue
+        if not isinstance(timestamp, datetime.datetime):
+            continue
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone().replace(tzinfo=None)
+        streams.setdefault(card_id, []).append((seconds_of(timestamp), position, bool(correct),
+                                                bool(was_wrong_in_session)))
+    return {card_id: [(seconds, correct, was_wrong) for seconds, _, correct, was_wrong in sorted(events)]
+            for card_id, events in streams.items()}
+
+
+def load_history(data_manager) -> Dict[str, List[ReviewEvent]]:
+    """Antwortfolgen aller Karten aus den Statistiken des DataManagers."""
+    return events_from_stats(data_manager.stats, data_manager.flashcards)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Write-behind Speicherplanung für das Flashcard-Projekt.
+Änderungen markieren eine Sammlung nur als geändert; ein Hintergrund-Thread fasst
+schnelle Folgen von Änderungen zusammen und schreibt jede Sammlung einmal.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Wartezeit nach der ersten Änderung, in der weitere Änderungen gesammelt werden (Sekunden)
+DEFAULT_COALESCE_DELAY = 1.0
+# Wartezeit nach einem fehlgeschlagenen Schreibvorgang, bevor erneut versucht wird (Sekunden)
+FAILED_WRITE_RETRY_DELAY = 30.0
+
+
+class SaveScheduler:
+    """
+    Verwaltet Versionszähler pro Sammlung und schreibt geänderte Sammlungen im Hintergrund.
+
+    Jede Sammlung hat einen Versionszähler (erhöht bei mark_dirty) und die zuletzt
+    geschriebene Version. Eine Sammlung ist geändert, solange beide abweichen.
+    """
+
+    def __init__(self, coalesce_delay: float = DEFAULT_COALESCE_DELAY):
+        """
+        Initialisiert den Scheduler.
+
+        Args:
+            coalesce_delay (float): Sammelzeit nach der ersten Änderung in Sekunden.
+        """
+        self.coalesce_delay = coalesce_delay
+        self.condition = threading.Condition()
+        self._writers: Dict[str, Callable[[], bool]] = {}
+        self._versions: Dict[str, int] = {}
+        self._saved_versions: Dict[str, int] = {}
+        # Ein Lock pro Sammlung, damit Worker und flush() nie gleichzeitig dieselbe Datei schreiben
+        self._write_locks: Dict[str, threading.Lock] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # Metriken
+        self._mutations = 0
+        self._writes = 0
+        self._failed_writes = 0
+        self._total_write_time = 0.0
+        self._last_write_duration: Dict[str, float] = {}
+        self._last_error: Optional[str] = None
+
+    def register(self, name: str, writer: Callable[[], bool]):
+        """
+        Registriert eine Sammlung und die Funktion, die sie tatsächlich schreibt.
+
+        Args:
+            name (str): Name der Sammlung (z.B. "flashcards").
+            writer (Callable[[], bool]): Schreibfunktion; False signalisiert einen Fehler.
+        """
+        with self.condition:
+            self._writers[name] = writer
+            self._versions.setdefault(name, 0)
+            self._saved_versions.setdefault(name, 0)
+            self._write_locks.setdefault(name, threading.Lock())
+
+    def version(self, name: str) -> int:
+        """Aktueller Versionszähler einer Sammlung."""
+        with self.condition:
+            return self._versions.get(name, 0)
+
+    def is_dirty(self, name: str) -> bool:
+        with self.condition:
+            return self._versions.get(name, 0) != self._saved_versions.get(name, 0)
+
+    def mark_dirty(self, name: str) -> bool:
+        """
+        Markiert eine Sammlung als geändert und weckt den Hintergrund-Thread.
+
+        Returns:
+            bool: True wenn die Sammlung registriert ist, False sonst.
+        """
+        with self.condition:
+            if name not in self._writers:
+                logging.error(f"SaveScheduler: Unbekannte Sammlung '{name}'.")
+                return False
+            self._versions[name] += 1
+            self._mutations += 1
+            self._ensure_worker()
+            self.condition.notify()
+        return True
+
+    def _ensure_worker(self):
+        if self._stopped:
+            return
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run_worker, name="SaveScheduler", daemon=True)
+            self._worker.start()
+
+    def _dirty_names(self) -> List[str]:
+        return [name for name in self._writers if self._versions[name] != self._saved_versions[name]]
+
+    def _run_worker(self):
+        while True:
+            with self.condition:
+                while not self._stopped and not self._dirty_names():
+                    self.condition.wait()
+                if self._stopped:
+                    return
+            # Weitere Änderungen sammeln, bevor geschrieben wird
+            time.sleep(self.coalesce_delay)
+            if not self._write_dirty():
+                time.sleep(FAILED_WRITE_RETRY_DELAY)
+
+    def _write_dirty(self, names: Optional[List[str]] = None) -> bool:
+        with self.condition:
+            dirty = [name for name in self._dirty_names() if names is None or name in names]
+        success = True
+        for name in dirty:
+            success = self._write(name) and success
+        return success
+
+    def _write(self, name: str) -> bool:
+        with self._write_locks[name]:
+            with self.condition:
+                version = self._versions[name]
+                if version == self._saved_versions[name]:
+                    return True
+                writer = self._writers[name]
+
+            start = time.perf_counter()
+            try:
+                ok = writer() is not False
+                error = None if ok else f"Schreiben von '{name}' fehlgeschlagen"
+            except Exception as e:
+                ok = False
+                error = f"Schreiben von '{name}' fehlgeschlagen: {e}"
+            duration = time.perf_counter() - start
+
+            with self.condition:
+                self._last_write_duration[name] = duration
+                self._total_write_time += duration
+                if ok:
+                    # Änderungen während des Schreibens lassen die Sammlung geändert
+                    self._saved_versions[name] = max(self._saved_versions[name], version)
+                    self._writes += 1
+                else:
+                    self._failed_writes += 1
+                    self._last_error = error
+        if ok:
+            logging.debug(f"SaveScheduler: '{name}' (Version {version}) in {duration * 1000:.1f} ms geschrieben.")
+        else:
+            logging.error(f"SaveScheduler: {error}")
+        return ok
+
+    def flush(self, names: Optional[List[str]] = None) -> bool:
+        """
+        Schreibt alle (oder die angegebenen) geänderten Sammlungen sofort im aufrufenden Thread.
+
+        Args:
+            names (Optional[List[str]]): Nur diese Sammlungen schreiben.
+
+        Returns:
+            bool: True wenn alle Schreibvorgänge erfolgreich waren.
+        """
+        return self._write_dirty(names)
+
+    def stop(self, flush: bool = True) -> bool:
+        """Beendet den Hintergrund-Thread, optional nach einem abschließenden flush()."""
+        success = self.flush() if flush else True
+        with self.condition:
+            self._stopped = True
+            self.condition.notify_all()
+        return success
+
+    def metrics(self) -> Dict:
+        """
+        Kennzahlen für ausstehende und erledigte Schreibvorgänge.
+
+        Returns:
+            Dict: pending (geänderte Sammlungen), pending_versions (ungeschriebene Versionen
+            je Sammlung), mutations, writes, coalesced (eingesparte Schreibvorgänge),
+            failed_writes, total_write_time, last_write_duration, last_error.
+        """
+        with self.condition:
+            pending = self._dirty_names()
+            return {
+                'pending': pending,
+                'pending_versions': {name: self._versions[name] - self._saved_versions[name] for name in pending},
+                'mutations': self._mutations,
+                'writes': self._writes,
+                'coalesced': max(0, self._mutations - self._writes - sum(
+                    self._versions[name] - self._saved_versions[name] for name in pending)),
+                'failed_writes': self._failed_writes,
+                'total_write_time': self._total_write_time,
+                'last_write_duration': dict(self._last_write_duration),
+                'last_error': self._last_error,
+            }
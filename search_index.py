@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Volltext-Suchindex für das Flashcard-Projekt.
+Invertierter Index über die Wörter mehrerer Textfelder mit Präfix- und Teilwortsuche
+(über Trigramme des Vokabulars) sowie optionaler unscharfer Suche für Tippfehler.
+Umlaute werden vereinheitlicht: "Müll", "Muell" und "Mull" finden dieselben Karten.
+Suchwörter mit weniger als MIN_PREFIX_LENGTH Zeichen finden nur ganze Wörter, da ein so
+kurzes Präfix auf einen großen Teil des Vokabulars passen würde.
+"""
+
+import bisect
+import heapq
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Gewichtung der Felder beim Ranking
+DEFAULT_FIELD_WEIGHTS = {
+    'question': 3.0,
+    'tags': 2.5,
+    'answer': 1.0,
+    'hint': 1.0,
+    'source': 0.5,
+}
+
+# Gewichtung der Trefferart eines Suchworts
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.8
+INFIX_MATCH = 0.5
+FUZZY_MATCH = 0.4
+
+# Mindestähnlichkeit (Jaccard über Trigramme) für unscharfe Treffer
+FUZZY_MIN_SIMILARITY = 0.45
+# Höchstzahl an Vokabular-Wörtern, auf die ein kurzes Präfix erweitert wird
+MAX_PREFIX_EXPANSION = 2000
+# Kürzere Suchwörter werden nicht als Präfix erweitert (nur exakte Treffer)
+MIN_PREFIX_LENGTH = 3
+
+_TOKEN_RE = re.compile(r'\w+')
+# Umschreibungen von Umlauten in Suchbegriffen ("muell" -> "mull", wie "müll" im Index)
+_UMLAUT_SPELLINGS = (('ae', 'a'), ('oe', 'o'), ('ue', 'u'))
+
+FieldValue = Union[str, List[str], None]
+
+
+def normalize(text: str) -> str:
+    """Kleinschreibung, ß -> ss und Entfernen diakritischer Zeichen (ä -> a)."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Zerlegt einen Text in normalisierte Wörter."""
+    return _TOKEN_RE.findall(normalize(text)) if text else []
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """
+    Invertierter Index: Wort -> {doc_id: Gewicht}.
+
+    Das Gewicht eines Worts in einem Dokument ist die Summe der Feldgewichte der Felder,
+    in denen es vorkommt. Zusätzlich gibt es ein sortiertes Vokabular (Präfixsuche per
+    bisect) und einen Trigramm-Index über das Vokabular (Teilwort- und unscharfe Suche).
+    """
+
+    def __init__(self, field_weights: Optional[Dict[str, float]] = None):
+        """
+        Initialisiert einen leeren Index.
+
+        Args:
+            field_weights (Optional[Dict[str, float]]): Feldname -> Gewicht.
+        """
+        self.field_weights = field_weights or DEFAULT_FIELD_WEIGHTS
+        self.lock = threading.RLock()
+        self.built = False
+        self.clear()
+
+    def clear(self):
+        """Leert den Index (built wird False)."""
+        with self.lock:
+            self._postings: Dict[str, Dict[str, float]] = {}
+            self._vocabulary: List[str] = []
+            self._trigram_tokens: Dict[str, Set[str]] = {}
+            self._doc_tokens: Dict[str, Dict[str, float]] = {}
+            self._doc_order: Dict[str, int] = {}
+            self._next_order = 0
+            self.built = False
+
+    def build(self, documents: Iterable[Tuple[str, Dict[str, FieldValue]]]):
+        """
+        Baut den Index aus (doc_id, Felder)-Paaren komplett neu auf.
+        Vokabular und Trigramm-Index werden einmal am Ende erstellt statt je neuem Wort.
+        """
+        with self.lock:
+            self.clear()
+            for doc_id, fields in documents:
+                weights = self._token_weights(fields)
+                if doc_id in self._doc_tokens:
+                    self.remove(doc_id)  # Vokabular ist noch leer, nur die Postings werden entfernt
+                self._doc_tokens[doc_id] = weights
+                self._doc_order[doc_id] = self._next_order
+                self._next_order += 1
+                for token, weight in weights.items():
+                    self._postings.setdefault(token, {})[doc_id] = weight
+            self._vocabulary = sorted(self._postings)
+            for token in self._vocabulary:
+                for trigram in _trigrams(token):
+                    self._trigram_tokens.setdefault(trigram, set()).add(token)
+            self.built = True
+        logging.info(f"Suchindex aufgebaut: {len(self._doc_tokens)} Dokumente, {len(self._vocabulary)} Wörter.")
+
+    # -------------------------------------------------------------------------
+    # PFLEGE
+    # -------------------------------------------------------------------------
+
+    def _token_weights(self, fields: Dict[str, FieldValue]) -> Dict[str, float]:
+        """Wort -> Summe der Feldgewichte der Felder, in denen es vorkommt."""
+        weights: Dict[str, float] = {}
+        for field_name, value in fields.items():
+            field_weight = self.field_weights.get(field_name, 0.0)
+            if not value or field_weight <= 0:
+                continue
+            text = ' '.join(value) if isinstance(value, (list, tuple)) else str(value)
+            for token in set(tokenize(text)):
+                weights[token] = weights.get(token, 0.0) + field_weight
+        return weights
+
+    def add(self, doc_id: str, fields: Dict[str, FieldValue]):
+        """Nimmt ein Dokument auf (ein vorhandenes mit derselben ID wird ersetzt)."""
+        weights = self._token_weights(fields)
+
+        with self.lock:
+            self.remove(doc_id)
+            self._doc_tokens[doc_id] = weights
+            self._doc_order[doc_id] = self._next_order
+            self._next_order += 1
+            for token, weight in weights.items():
+                posting = self._postings.get(token)
+                if posting is None:
+                    posting = self._postings[token] = {}
+                    self._add_to_vocabulary(token)
+                posting[doc_id] = weight
+
+    def remove(self, doc_id: str):
+        """Entfernt ein Dokument (ohne Wirkung, wenn es nicht im Index ist)."""
+        with self.lock:
+            weights = self._doc_tokens.pop(doc_id, None)
+            if weights is None:
+                return
+            self._doc_order.pop(doc_id, None)
+            for token in weights:
+                posting = self._postings.get(token)
+                if posting is None:
+                    continue
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[token]
+                    self._remove_from_vocabulary(token)
+
+    def _add_to_vocabulary(self, token: str):
+        bisect.insort(self._vocabulary, token)
+        for trigram in _trigrams(token):
+            self._trigram_tokens.setdefault(trigram, set()).add(token)
+
+    def _remove_from_vocabulary(self, token: str):
+        position = bisect.bisect_left(self._vocabulary, token)
+        if position < len(self._vocabulary) and self._vocabulary[position] == token:
+            del self._vocabulary[position]
+        for trigram in _trigrams(token):
+            tokens = self._trigram_tokens.get(trigram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._trigram_tokens[trigram]
+
+    # -------------------------------------------------------------------------
+    # SUCHE
+    # -------------------------------------------------------------------------
+
+    def _prefix_matches(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        matches = []
+        for token in self._vocabulary[start:start + MAX_PREFIX_EXPANSION]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+    def _infix_matches(self, fragment: str) -> Set[str]:
+        trigram_sets = [self._trigram_tokens.get(trigram) for trigram in _trigrams(fragment)]
+        if not trigram_sets or any(tokens is None for tokens in trigram_sets):
+            return set()
+        trigram_sets.sort(key=len)
+        candidates = set(trigram_sets[0])
+        for tokens in trigram_sets[1:]:
+            candidates &= tokens
+        return {token for token in candidates if fragment in token}
+
+    def _fuzzy_matches(self, token: str) -> Dict[str, float]:
+        query_trigrams = _trigrams(token)
+        if len(query_trigrams) < 2:
+            return {}
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._trigram_tokens.get(trigram, ()))
+        matches = {}
+        for candidate, common in shared.items():
+            similarity = common / (len(query_trigrams) + max(len(candidate) - 2, 0) - common)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                matches[candidate] = similarity
+        return matches
+
+    def _match_token(self, token: str, fuzzy: bool) -> Dict[str, float]:
+        """Vokabular-Wörter, die zu einem Suchwort passen -> Trefferqualität."""
+        matches: Dict[str, float] = {}
+        variants = {token}
+        for spelling, folded in _UMLAUT_SPELLINGS:
+            if spelling in token:
+                variants.add(token.replace(spelling, folded))
+        for variant in variants:
+            if len(variant) < MIN_PREFIX_LENGTH:
+                if variant in self._postings:
+                    matches[variant] = EXACT_MATCH
+                continue
+            for candidate in self._prefix_matches(variant):
+                quality = EXACT_MATCH if candidate == variant else PREFIX_MATCH
+                matches[candidate] = max(matches.get(candidate, 0.0), quality)
+            for candidate in self._infix_matches(variant):
+                matches.setdefault(candidate, INFIX_MATCH)
+        if not matches and fuzzy and len(token) >= 4:
+            for variant in variants:
+                for candidate, similarity in self._fuzzy_matches(variant).items():
+                    matches[candidate] = max(matches.get(candidate, 0.0), FUZZY_MATCH * similarity)
+        return matches
+
+    def search(self, query: str, fuzzy: bool = True, limit: Optional[int] = None,
+               candidates: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Sucht Dokumente, die alle Wörter der Anfrage enthalten (als Wort, Präfix oder Teilwort).
+
+        Args:
+            query (str): Suchbegriff(e).
+            fuzzy (bool): Bei Wörtern ohne Treffer ähnliche Wörter (Tippfehler) zulassen.
+            limit (Optional[int]): Maximale Anzahl Ergebnisse.
+            candidates (Optional[Set[str]]): Nur diese Dokumente berücksichtigen.
+
+        Returns:
+            List[Tuple[str, float]]: (doc_id, Punktzahl), beste Treffer zuerst.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self.lock:
+            scores: Optional[Dict[str, float]] = None
+            for token in tokens:
+                token_scores: Dict[str, float] = {}
+                for vocabulary_token, quality in self._match_token(token, fuzzy).items():
+                    for doc_id, weight in self._postings[vocabulary_token].items():
+                        score = quality * weight
+                        if score > token_scores.get(doc_id, 0.0):
+                            token_scores[doc_id] = score
+                if scores is None:
+                    scores = token_scores
+                    if candidates is not None:
+                        scores = {doc_id: score for doc_id, score in scores.items() if doc_id in candidates}
+                else:
+                    scores = {doc_id: score + token_scores[doc_id]
+                              for doc_id, score in scores.items() if doc_id in token_scores}
+                if not scores:
+                    return []
+
+            order = self._doc_order
+            rank_key = lambda item: (-item[1], order.get(item[0], 0))
+            if limit and limit < len(scores):
+                # Nur die besten limit Treffer sortieren
+                return heapq.nsmallest(limit, scores.items(), key=rank_key)
+            return sorted(scores.items(), key=rank_key)
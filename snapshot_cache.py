@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Binärer Schnellstart-Cache für das Flashcard-Projekt.
+Legt neben flashcards.json und stats.json einen kompakten Snapshot (marshal, spaltenweise
+für gleichförmige Listen) ab. Die JSON-Dateien bleiben maßgeblich: ein Snapshot wird nur
+verwendet, wenn Änderungszeit, Größe und SHA-256 der JSON-Datei übereinstimmen.
+
+Aufruf zum Neuaufbau der Caches:
+    python snapshot_cache.py rebuild-cache [JSON-Datei ...]
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import logging
+import shutil
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+SNAPSHOT_MAGIC = b'FCSNAP01'
+SNAPSHOT_SUFFIX = '.snapshot'
+# Header: mtime_ns, Größe, SHA-256 der JSON-Datei
+_HEADER = struct.Struct('<qq32s')
+
+_LAYOUT_ROWS = 0
+_LAYOUT_COLUMNS = 1
+
+# Zuletzt berechnete Prüfsumme je JSON-Datei: Pfad -> (mtime_ns, Größe, SHA-256).
+# main.ensure_initial_files und das Laden im DataManager prüfen dieselbe Datei beim Start,
+# gehasht wird sie dabei nur einmal.
+_digest_cache: Dict[str, Tuple[int, int, bytes]] = {}
+
+
+def snapshot_path_for(source_path: str) -> str:
+    """Pfad des Snapshots zu einer JSON-Datei (z.B. flashcards.json -> flashcards.snapshot)."""
+    return os.path.splitext(source_path)[0] + SNAPSHOT_SUFFIX
+
+
+def _file_digest(path: str, stat: os.stat_result) -> bytes:
+    key = os.path.abspath(path)
+    cached = _digest_cache.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    digest = sha.digest()
+    _digest_cache[key] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def _encode(data: Any) -> bytes:
+    """Listen gleichartiger Dictionaries werden spaltenweise abgelegt, alles andere direkt."""
+    if isinstance(data, list) and data and all(type(row) is dict for row in data):
+        keys = tuple(data[0])
+        if all(tuple(row) == keys for row in data):
+            columns = [[row[key] for row in data] for key in keys]
+            return marshal.dumps((_LAYOUT_COLUMNS, keys, columns))
+    return marshal.dumps((_LAYOUT_ROWS, data))
+
+
+def _decode(payload: bytes) -> Any:
+    decoded = marshal.loads(payload)
+    if decoded[0] == _LAYOUT_COLUMNS:
+        _, keys, columns = decoded
+        return [dict(zip(keys, values)) for values in zip(*columns)]
+    return decoded[1]
+
+
+def write_snapshot(source_path: str, data: Any) -> bool:
+    """
+    Schreibt den Snapshot zu einer gerade gespeicherten JSON-Datei.
+
+    Args:
+        source_path (str): Die JSON-Datei, deren Inhalt data entspricht.
+        data (Any): Der Inhalt (nur JSON-Typen).
+
+    Returns:
+        bool: True wenn erfolgreich, False sonst.
+    """
+    cache_path = snapshot_path_for(source_path)
+    try:
+        payload = _encode(data)
+        stat = os.stat(source_path)
+        header = _HEADER.pack(stat.st_mtime_ns, stat.st_size, _file_digest(source_path, stat))
+        temp_file_path = cache_path + ".tmp"
+        with open(temp_file_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(header)
+            f.write(payload)
+        shutil.move(temp_file_path, cache_path)
+        logging.debug(f"Snapshot {cache_path} geschrieben ({len(payload)} Bytes).")
+        return True
+    except (OSError, ValueError) as e:
+        # ValueError: Inhalt enthält Typen, die marshal nicht kennt
+        logging.warning(f"Snapshot {cache_path} konnte nicht geschrieben werden: {e}")
+        invalidate_snapshot(source_path)
+        return False
+
+
+def _header_matches(f, source_path: str, cache_path: str) -> bool:
+    """Prüft Kennung und Header eines geöffneten Snapshots gegen den Stand der JSON-Datei."""
+    if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+        logging.info(f"Snapshot {cache_path} hat ein unbekanntes Format, wird ignoriert.")
+        return False
+    mtime_ns, size, digest = _HEADER.unpack(f.read(_HEADER.size))
+    stat = os.stat(source_path)
+    if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+        logging.info(f"Snapshot {cache_path} ist veraltet (Zeitstempel/Größe).")
+        return False
+    if _file_digest(source_path, stat) != digest:
+        logging.info(f"Snapshot {cache_path} ist veraltet (Prüfsumme).")
+        return False
+    return True
+
+
+def has_valid_snapshot(source_path: str) -> bool:
+    """
+    Prüft, ob zu einer JSON-Datei ein aktueller Snapshot existiert, ohne ihn zu dekodieren.
+    Die JSON-Datei ist dann lesbar gespeichert worden und muss nicht erneut geprüft werden.
+    """
+    cache_path = snapshot_path_for(source_path)
+    if not os.path.exists(cache_path) or not os.path.exists(source_path):
+        return False
+    try:
+        with open(cache_path, 'rb') as f:
+            return _header_matches(f, source_path, cache_path)
+    except (OSError, struct.error) as e:
+        logging.warning(f"Snapshot {cache_path} konnte nicht gelesen werden: {e}")
+        return False
+
+
+def read_snapshot(source_path: str) -> Optional[Any]:
+    """
+    Liest den Snapshot zu einer JSON-Datei, falls er zu deren aktuellem Stand passt.
+
+    Returns:
+        Optional[Any]: Der Inhalt oder None, wenn kein gültiger Snapshot existiert.
+    """
+    cache_path = snapshot_path_for(source_path)
+    if not os.path.exists(cache_path) or not os.path.exists(source_path):
+        return None
+    try:
+        with open(cache_path, 'rb') as f:
+            if not _header_matches(f, source_path, cache_path):
+                return None
+            return _decode(f.read())
+    except (OSError, ValueError, EOFError, TypeError, IndexError, struct.error) as e:
+        logging.warning(f"Snapshot {cache_path} konnte nicht gelesen werden: {e}")
+        return None
+
+
+def invalidate_snapshot(source_path: str):
+    """Entfernt den Snapshot zu einer JSON-Datei."""
+    cache_path = snapshot_path_for(source_path)
+    try:
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+    except OSError as e:
+        logging.warning(f"Snapshot {cache_path} konnte nicht entfernt werden: {e}")
+
+
+def rebuild_snapshot(source_path: str) -> bool:
+    """Baut den Snapshot einer JSON-Datei aus ihrem aktuellen Inhalt neu auf."""
+    invalidate_snapshot(source_path)
+    if not os.path.exists(source_path):
+        return False
+    try:
+        with open(source_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.error(f"Snapshot für {source_path} nicht erstellt, JSON nicht lesbar: {e}")
+        return False
+    return write_snapshot(source_path, data)
+
+
+def main(argv: List[str]) -> int:
+    if not argv or argv[0] != 'rebuild-cache':
+        print("Verwendung: python snapshot_cache.py rebuild-cache [JSON-Datei ...]")
+        return 2
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    sources = argv[1:] or [os.path.join(base_dir, name) for name in ('flashcards.json', 'stats.json')]
+    failed = 0
+    for source_path in sources:
+        if rebuild_snapshot(source_path):
+            print(f"Snapshot neu erstellt: {snapshot_path_for(source_path)}")
+        else:
+            print(f"Snapshot konnte nicht erstellt werden: {source_path}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv[1:]))
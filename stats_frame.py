@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Spaltenorientierte Sicht auf die Sitzungsstatistik für die Diagramme.
+Die Sitzungsliste wird einmal in NumPy-Arrays (eine Zeile je Kartendetail bzw. je Sitzung)
+umgewandelt. Zeit- und Kategoriefilter sind danach boolesche Masken bzw. Bereichsgrenzen
+(searchsorted), Summen je Tag, Sitzung und Kategorie werden mit bincount gebildet.
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from day_numbers import parse_day, to_date
+
+DayRange = Tuple[int, int]
+
+# Grenzen der Erfolgsquoten-Klassen der Heatmap (rechts geschlossen, 0 gehört zur ersten Klasse)
+SUCCESS_RATE_BINS = (25, 50, 75)
+SUCCESS_RATE_LABELS = ("0-25%", "25-50%", "50-75%", "75-100%")
+
+UNKNOWN_CATEGORY = "Unbekannt"
+
+
+def _number(value, default: float) -> float:
+    try:
+        return float(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def success_rate_classes(rates: np.ndarray) -> np.ndarray:
+    """Index der Erfolgsquoten-Klasse (SUCCESS_RATE_LABELS) je Quote in Prozent."""
+    return np.searchsorted(SUCCESS_RATE_BINS, rates, side='left')
+
+
+class _Interner:
+    """Vergibt fortlaufende Ids für Texte (in der Reihenfolge des ersten Auftretens)."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def __call__(self, name: str) -> int:
+        index = self.ids.get(name)
+        if index is None:
+            index = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+
+class StatsFrame:
+    """
+    Spalten über alle Sitzungen mit Details und gültigem Datum, nach Tag sortiert.
+
+    Sitzungsspalten: session_day, session_total_time
+    Detailspalten: day, session, category (Anzeigename), category_key / subcategory_key
+    (kleingeschrieben, für Filter), correct, learning_time, points_change,
+    level_before, level_after (NaN, wenn nicht erfasst)
+    """
+
+    def __init__(self, sessions: Sequence[Dict]):
+        self.source = sessions
+        self.source_length = len(sessions)
+
+        category_names = _Interner()
+        category_keys = _Interner()
+        subcategory_keys = _Interner()
+
+        rows = []
+        session_rows = []
+        for session in sessions:
+            if not isinstance(session, dict) or 'details' not in session:
+                continue
+            day = parse_day(session.get('date'))
+            if day is None:
+                logging.error(f"Ungültiges Datum in Statistik: {session.get('date', '')}")
+                continue
+            session_index = len(session_rows)
+            session_rows.append((day, _number(session.get('total_time'), 0.0)))
+            for detail in session.get('details') or ():
+                if not isinstance(detail, dict):
+                    continue
+                category = detail.get('category') or ''
+                rows.append((
+                    day,
+                    session_index,
+                    category_names(str(category) or UNKNOWN_CATEGORY),
+                    category_keys(str(category).lower()),
+                    subcategory_keys(str(detail.get('subcategory') or '').lower()),
+                    bool(detail.get('correct', False)),
+                    _number(detail.get('learning_time'), 0.0),
+                    _number(detail.get('points_change'), 0.0),
+                    _number(detail.get('level_before'), np.nan),
+                    _number(detail.get('level_after'), np.nan),
+                ))
+
+        self.category_names = category_names.names
+        self._category_key_ids = category_keys.ids
+        self._subcategory_key_ids = subcategory_keys.ids
+
+        # Sitzungen stabil nach Tag sortieren; die Details folgen der Sitzungsreihenfolge
+        session_array = np.array(session_rows, dtype=float).reshape(-1, 2)
+        session_order = np.argsort(session_array[:, 0], kind='stable')
+        self.session_day = session_array[session_order, 0].astype(np.int64)
+        self.session_total_time = session_array[session_order, 1]
+        session_rank = np.empty(len(session_order), dtype=np.int64)
+        session_rank[session_order] = np.arange(len(session_order))
+
+        columns = np.array(rows, dtype=float).reshape(-1, 10)
+        session = session_rank[columns[:, 1].astype(np.int64)] if len(columns) else np.empty(0, np.int64)
+        detail_order = np.argsort(session, kind='stable')
+        columns = columns[detail_order]
+        self.session = session[detail_order]
+        self.day = columns[:, 0].astype(np.int64)
+        self.category = columns[:, 2].astype(np.int64)
+        self.category_key = columns[:, 3].astype(np.int64)
+        self.subcategory_key = columns[:, 4].astype(np.int64)
+        self.correct = columns[:, 5].astype(bool)
+        self.learning_time = columns[:, 6]
+        self.points_change = columns[:, 7]
+        self.level_before = columns[:, 8]
+        self.level_after = columns[:, 9]
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def is_current(self, sessions: Sequence[Dict]) -> bool:
+        """True, solange die Sitzungsliste dieselbe ist und nicht gewachsen ist."""
+        return sessions is self.source and len(sessions) == self.source_length
+
+    def _key_id(self, ids: Dict[str, int], name: Optional[str]) -> int:
+        return ids.get(name.lower(), -1)
+
+    def select(self, day_range: Optional[DayRange] = None, category: Optional[str] = None,
+               subcategory: Optional[str] = None) -> 'StatsSelection':
+        """
+        Auswahl der Details im Zeitraum und in der Kategorie/Subkategorie.
+
+        Args:
+            day_range (Optional[DayRange]): Erster und letzter Epochentag (einschließlich); None für alle Tage.
+            category (Optional[str]): Kategorie (Groß-/Kleinschreibung egal); None für alle.
+            subcategory (Optional[str]): Subkategorie (Groß-/Kleinschreibung egal); None für alle.
+        """
+        # Die Details sind nach Tag sortiert: der Zeitraum ist ein zusammenhängender Abschnitt
+        if day_range is None:
+            start, stop = 0, len(self.day)
+        else:
+            start = int(np.searchsorted(self.day, day_range[0], side='left'))
+            stop = int(np.searchsorted(self.day, day_range[1], side='right'))
+        mask = np.zeros(len(self.day), dtype=bool)
+        mask[start:stop] = True
+        if category is not None:
+            mask[start:stop] &= self.category_key[start:stop] == self._key_id(self._category_key_ids, category)
+        if subcategory is not None:
+            mask[start:stop] &= self.subcategory_key[start:stop] == self._key_id(self._subcategory_key_ids, subcategory)
+        return StatsSelection(self, mask)
+
+
+class StatsSelection:
+    """
+    Gefilterte Sicht auf einen StatsFrame.
+    Eine Sitzung gilt als ausgewählt, wenn mindestens eines ihrer Details ausgewählt ist;
+    ihre Kartenzahlen zählen dann nur die ausgewählten Details, die Lernzeit die ganze Sitzung.
+    """
+
+    def __init__(self, frame: StatsFrame, mask: np.ndarray):
+        self.frame = frame
+        self.mask = mask
+        self._session_cards = np.bincount(frame.session[mask], minlength=len(frame.session_day))
+        self._session_correct = np.bincount(frame.session[mask], weights=frame.correct[mask],
+                                            minlength=len(frame.session_day))
+        self.session_mask = self._session_cards > 0
+
+    def __len__(self) -> int:
+        """Anzahl der ausgewählten Sitzungen."""
+        return int(np.count_nonzero(self.session_mask))
+
+    @staticmethod
+    def _sum_per_day(days: np.ndarray, weights: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Summen je Tag für aufsteigend sortierte Epochentage (nur Tage mit Einträgen)."""
+        if not len(days):
+            return days, np.zeros(0)
+        offset = days[0]
+        counts = np.bincount(days - offset)
+        sums = np.bincount(days - offset, weights=weights) if weights is not None else counts
+        present = np.flatnonzero(counts)
+        return present + offset, sums[present]
+
+    def daily_counts(self) -> Tuple[List, np.ndarray, np.ndarray]:
+        """
+        Kartenzahl und richtige Antworten je Tag.
+
+        Returns:
+            Tuple[List, np.ndarray, np.ndarray]: (date-Objekte, Karten, richtige)
+        """
+        days = self.frame.day[self.mask]
+        present, totals = self._sum_per_day(days)
+        _, corrects = self._sum_per_day(days, self.frame.correct[self.mask])
+        return [to_date(int(day)) for day in present], totals.astype(int), corrects.astype(int)
+
+    def daily_sum(self, column: np.ndarray) -> Tuple[List, np.ndarray]:
+        """Summe einer Detailspalte (z.B. points_change) je Tag."""
+        present, sums = self._sum_per_day(self.frame.day[self.mask], np.nan_to_num(column[self.mask]))
+        return [to_date(int(day)) for day in present], sums
+
+    def daily_learning_time(self) -> Tuple[List, np.ndarray]:
+        """Lernzeit (Minuten, ganze Sitzungen) je Tag."""
+        present, times = self._sum_per_day(self.frame.session_day[self.session_mask],
+                                           self.frame.session_total_time[self.session_mask])
+        return [to_date(int(day)) for day in present], times
+
+    def session_success_rates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Epochentage und Erfolgsquoten (Prozent, ausgewählte Details) der ausgewählten Sitzungen."""
+        cards = self._session_cards[self.session_mask]
+        correct = self._session_correct[self.session_mask]
+        return self.frame.session_day[self.session_mask], correct / cards * 100
+
+    def category_counts(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Versuche und richtige Antworten je Kategorie (Anzeigename).
+
+        Returns:
+            Tuple[List[str], np.ndarray, np.ndarray]: (Kategorien, Versuche, richtige), nur Kategorien mit Versuchen.
+        """
+        categories = self.frame.category[self.mask]
+        size = len(self.frame.category_names)
+        totals = np.bincount(categories, minlength=size)
+        corrects = np.bincount(categories, weights=self.frame.correct[self.mask], minlength=size)
+        present = np.flatnonzero(totals)
+        names = [self.frame.category_names[index] for index in present]
+        return names, totals[present], corrects[present].astype(int)
+
+    def summary(self) -> Dict:
+        """Kartenzahl, richtige Antworten, Lernzeit und Anzahl Lerntage der Auswahl."""
+        return {
+            'cards_total': int(self._session_cards.sum()),
+            'cards_correct': int(self._session_correct.sum()),
+            'total_time': float(self.frame.session_total_time[self.session_mask].sum()),
+            'days': int(len(np.unique(self.frame.session_day[self.session_mask]))),
+        }
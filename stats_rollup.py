@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vorberechnete Statistik-Summen für das Flashcard-Projekt.
+Die Sitzungsliste (stats.json) wird einmal beim Laden zu Summen je (Tag, Kategorie,
+Subkategorie) verdichtet und danach bei jeder neuen Sitzung fortgeschrieben. Abfragen
+nach Kategorie, Tag oder Monat werden so zu Dictionary-Zugriffen statt Durchläufen
+über alle Sitzungen und Details.
+"""
+
+import datetime
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from day_numbers import day_of, parse_day, to_date
+
+RollupKey = Tuple[str, str]
+
+
+class RollupTotals:
+    """Summen für eine Zelle: Versuche, richtige Antworten und anteilige Lernzeit."""
+
+    __slots__ = ('attempts', 'correct', 'learning_time')
+
+    def __init__(self):
+        self.attempts = 0
+        self.correct = 0
+        self.learning_time = 0.0
+
+    def add(self, other: 'RollupTotals'):
+        self.attempts += other.attempts
+        self.correct += other.correct
+        self.learning_time += other.learning_time
+
+    @property
+    def success_rate(self) -> float:
+        """Erfolgsquote in Prozent (0, wenn es keine Versuche gibt)."""
+        return self.correct / self.attempts * 100 if self.attempts else 0
+
+
+class DayTotals(RollupTotals):
+    """Summen eines Tages über alle Sitzungen mit Details."""
+
+    __slots__ = ('sessions',)
+
+    def __init__(self):
+        super().__init__()
+        self.sessions = 0
+
+
+def _detail_key(detail: Dict) -> RollupKey:
+    return (detail.get('category') or '').lower(), (detail.get('subcategory') or '').lower()
+
+
+class StatsRollup:
+    """
+    Summen über die Sitzungsliste.
+
+    - Zellen (Tag, Kategorie, Subkategorie) -> Versuche/richtig/Lernzeit
+    - (Kategorie, Subkategorie) -> Gesamtsummen, Sitzungsdaten, letzter Lerntag, Sitzungen
+    - Tag -> Summen der Sitzungen mit Details und Indizes aller Sitzungen des Tages
+    Kategorie und Subkategorie sind kleingeschrieben. Tage sind Epochentage (day_numbers),
+    Sitzungen ohne gültiges Datum stehen unter Tag None.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._invalid_dates: Set[str] = set()
+        self.rebuild([])
+
+    def rebuild(self, sessions: List[Dict]):
+        """Baut alle Summen aus der Sitzungsliste neu auf (die Liste wird referenziert, nicht kopiert)."""
+        with self.lock:
+            self._sessions = sessions
+            self._processed = 0
+            self._cells: Dict[Tuple[Optional[int], str, str], RollupTotals] = {}
+            self._key_totals: Dict[RollupKey, RollupTotals] = {}
+            self._key_dates: Dict[RollupKey, Set[str]] = {}
+            self._key_last_day: Dict[RollupKey, int] = {}
+            self._key_sessions: Dict[RollupKey, List[int]] = {}
+            self._day_totals: Dict[int, DayTotals] = {}
+            self._day_sessions: Dict[int, List[int]] = {}
+            self.sync()
+
+    def sync(self) -> int:
+        """
+        Übernimmt Sitzungen, die seit dem letzten Aufruf an die Liste angehängt wurden.
+
+        Returns:
+            int: Anzahl der neu übernommenen Sitzungen.
+        """
+        with self.lock:
+            start = self._processed
+            for index in range(start, len(self._sessions)):
+                self._add(index, self._sessions[index])
+            self._processed = len(self._sessions)
+            return self._processed - start
+
+    def day_number(self, date_str: str) -> Optional[int]:
+        """Epochentag eines Sitzungsdatums (None, wenn ungültig)."""
+        day = parse_day(date_str)
+        if day is None and date_str not in self._invalid_dates:
+            self._invalid_dates.add(date_str)
+            logging.error(f"Ungültiges Datumsformat in Statistik: {date_str}")
+        return day
+
+    def _add(self, index: int, session: Dict):
+        if not isinstance(session, dict):
+            return
+        date_str = session.get('date')
+        day = self.day_number(date_str) if date_str is not None else None
+        if day is not None:
+            self._day_sessions.setdefault(day, []).append(index)
+
+        details = session.get('details')
+        if details is None:
+            return
+        total_time = session.get('total_time')
+        # Anteilige Lernzeit: Zeit der Sitzung * Anteil der Karten je Kategorie
+        time_per_card = total_time / len(details) if total_time is not None and details else 0.0
+
+        session_cells: Dict[RollupKey, RollupTotals] = {}
+        for detail in details:
+            if not isinstance(detail, dict):
+                continue
+            key = _detail_key(detail)
+            cell = session_cells.get(key)
+            if cell is None:
+                cell = session_cells[key] = RollupTotals()
+            cell.attempts += 1
+            if detail.get('correct', False):
+                cell.correct += 1
+            cell.learning_time += time_per_card
+
+        if day is not None:
+            day_totals = self._day_totals.get(day)
+            if day_totals is None:
+                day_totals = self._day_totals[day] = DayTotals()
+            day_totals.sessions += 1
+            day_totals.learning_time += total_time or 0
+            for cell in session_cells.values():
+                day_totals.attempts += cell.attempts
+                day_totals.correct += cell.correct
+
+        for key, cell in session_cells.items():
+            stored = self._cells.get((day,) + key)
+            if stored is None:
+                stored = self._cells[(day,) + key] = RollupTotals()
+            stored.add(cell)
+            totals = self._key_totals.get(key)
+            if totals is None:
+                totals = self._key_totals[key] = RollupTotals()
+            totals.add(cell)
+            self._key_sessions.setdefault(key, []).append(index)
+            if date_str is not None:
+                self._key_dates.setdefault(key, set()).add(date_str)
+            if day is not None and day > self._key_last_day.get(key, day - 1):
+                self._key_last_day[key] = day
+
+    # -------------------------------------------------------------------------
+    # ABFRAGEN
+    # -------------------------------------------------------------------------
+
+    def _matching_keys(self, category: Optional[str], subcategory: Optional[str]) -> Iterable[RollupKey]:
+        """Schlüssel passend zu den Filtern; None bedeutet keinen Filter."""
+        category = category.lower() if category is not None else None
+        subcategory = subcategory.lower() if subcategory is not None else None
+        if category is not None and subcategory is not None:
+            key = (category, subcategory)
+            return [key] if key in self._key_totals else []
+        return [key for key in self._key_totals
+                if (category is None or key[0] == category)
+                and (subcategory is None or key[1] == subcategory)]
+
+    def totals(self, category: Optional[str] = None, subcategory: Optional[str] = None) -> RollupTotals:
+        """Gesamtsummen einer Kategorie und/oder Subkategorie über alle Tage."""
+        result = RollupTotals()
+        with self.lock:
+            self.sync()
+            for key in self._matching_keys(category, subcategory):
+                result.add(self._key_totals[key])
+        return result
+
+    def totals_between(self, start: datetime.date, end: datetime.date,
+                       category: Optional[str] = None, subcategory: Optional[str] = None) -> RollupTotals:
+        """Summen einer Kategorie und/oder Subkategorie für die Tage start bis end (einschließlich)."""
+        result = RollupTotals()
+        with self.lock:
+            self.sync()
+            keys = list(self._matching_keys(category, subcategory))
+            for day in range(day_of(start), day_of(end) + 1):
+                for key in keys:
+                    cell = self._cells.get((day,) + key)
+                    if cell is not None:
+                        result.add(cell)
+        return result
+
+    def session_dates(self, category: Optional[str] = None, subcategory: Optional[str] = None) -> Set[str]:
+        """Datumsangaben der Sitzungen, in denen die Kategorie/Subkategorie vorkam."""
+        dates: Set[str] = set()
+        with self.lock:
+            self.sync()
+            for key in self._matching_keys(category, subcategory):
+                dates |= self._key_dates.get(key, set())
+        return dates
+
+    def last_day(self, category: Optional[str] = None, subcategory: Optional[str] = None) -> Optional[datetime.date]:
+        """Letzter Tag (mit gültigem Datum), an dem die Kategorie/Subkategorie gelernt wurde."""
+        with self.lock:
+            self.sync()
+            days = [self._key_last_day[key] for key in self._matching_keys(category, subcategory)
+                    if key in self._key_last_day]
+        return to_date(max(days)) if days else None
+
+    def session_indices(self, category: Optional[str] = None, subcategory: Optional[str] = None) -> List[int]:
+        """Indizes (aufsteigend) der Sitzungen, in denen die Kategorie/Subkategorie vorkam."""
+        with self.lock:
+            self.sync()
+            indices: Set[int] = set()
+            for key in self._matching_keys(category, subcategory):
+                indices.update(self._key_sessions[key])
+        return sorted(indices)
+
+    def day_totals(self, date: datetime.date) -> DayTotals:
+        """Summen eines Tages über alle Sitzungen mit Details."""
+        with self.lock:
+            self.sync()
+            return self._day_totals.get(day_of(date)) or DayTotals()
+
+    def sessions_on(self, date: datetime.date) -> List[Dict]:
+        """Alle Sitzungen (mit gültigem Datum) eines Tages."""
+        with self.lock:
+            self.sync()
+            return [self._sessions[index] for index in self._day_sessions.get(day_of(date), ())]
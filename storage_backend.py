@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Speicher-Backends für den DataManager.
+Neben den klassischen JSON-Dateien steht ein SQLite-Backend zur Verfügung, das
+Karten, Statistiken, Wochenplan, Lernsets und Planer in indizierten Tabellen hält.
+Der DataManager verwendet es, sobald die Datenbank im Datenverzeichnis existiert.
+
+Aufruf zur einmaligen Migration der JSON-Daten (DataManager.migrate_to_sqlite):
+    python storage_backend.py migrate-sqlite
+"""
+
+import json
+import os
+import logging
+import sqlite3
+import sys
+import threading
+import datetime
+from typing import Dict, Iterable, List, Optional
+
+from day_numbers import parse_day, to_date
+
+# Dokumente ohne eigene Tabelle (werden als JSON-Blob gespeichert)
+DOCUMENT_CATEGORIES = 'categories'
+DOCUMENT_ALGORITHM_SETTINGS = 'algorithm_settings'
+DOCUMENT_LEARNING_SETS_META = 'learning_sets_meta'
+DOCUMENT_PLANNERS_META = 'planners_meta'
+
+# 2: plan_entries ohne Primärschlüssel auf id (Einträge mit gleicher oder fehlender id blieben nicht erhalten)
+SCHEMA_VERSION = 2
+
+# Planeinträge über die rowid; die id aus dem Eintrag muss nicht eindeutig oder vorhanden sein
+PLAN_ENTRIES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plan_entries (
+    id TEXT,
+    date TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    kategorie_norm TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_plan_entries_date ON plan_entries (date, position);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS flashcards (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    category_norm TEXT NOT NULL,
+    subcategory_norm TEXT NOT NULL,
+    next_review_iso TEXT,
+    leitner_next_review_date TEXT,
+    consecutive_correct INTEGER NOT NULL DEFAULT 0,
+    difficulty_rating REAL NOT NULL DEFAULT 3.0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_flashcards_category ON flashcards (category_norm, subcategory_norm);
+CREATE INDEX IF NOT EXISTS idx_flashcards_next_review ON flashcards (next_review_iso);
+CREATE INDEX IF NOT EXISTS idx_flashcards_leitner_due ON flashcards (leitner_next_review_date);
+CREATE TABLE IF NOT EXISTS stats_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date_iso TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stats_sessions_date ON stats_sessions (date_iso);
+CREATE TABLE IF NOT EXISTS stats_details (
+    session_id INTEGER NOT NULL REFERENCES stats_sessions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    category_norm TEXT NOT NULL,
+    subcategory_norm TEXT NOT NULL,
+    correct INTEGER NOT NULL DEFAULT 0,
+    learning_time REAL NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_stats_details_category ON stats_details (category_norm, subcategory_norm);
+CREATE TABLE IF NOT EXISTS learning_sets (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS planners (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _de_date_to_iso(date_str: Optional[str]) -> Optional[str]:
+    """Wandelt 'dd.mm.yyyy' (oder ein ISO-Datum) in 'yyyy-mm-dd' um (sortier- und vergleichbar)."""
+    day = parse_day(date_str)
+    return to_date(day).isoformat() if day is not None else None
+
+
+class StorageBackend:
+    """
+    Schnittstelle für Speicher-Backends des DataManagers.
+
+    Ein Backend liefert beim Laden dieselben Python-Strukturen, die der DataManager
+    bisher aus den JSON-Dateien gelesen hat (Listen/Dicts), und nimmt sie beim
+    Speichern wieder entgegen. Zusätzlich gibt es feingranulare Operationen für
+    einzelne Karten und Sitzungen.
+    """
+    name = 'base'
+
+    def load_flashcards(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def save_flashcards(self, cards: List[Dict]) -> bool:
+        raise NotImplementedError
+
+    def upsert_flashcards(self, cards: Iterable[Dict]) -> bool:
+        raise NotImplementedError
+
+    def delete_flashcards(self, card_ids: Iterable[str]) -> bool:
+        raise NotImplementedError
+
+    def query_flashcard_ids(self, category: Optional[str] = None, subcategory: Optional[str] = None,
+                            due_on_or_before: Optional[datetime.date] = None,
+                            progress: Optional[str] = None,
+                            difficulty_range: Optional[tuple] = None) -> List[str]:
+        raise NotImplementedError
+
+    def load_stats(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def save_stats(self, stats: List[Dict]) -> bool:
+        raise NotImplementedError
+
+    def append_session(self, session: Dict) -> bool:
+        raise NotImplementedError
+
+    def load_weekly_plan(self) -> Dict:
+        raise NotImplementedError
+
+    def save_weekly_plan(self, plan: Dict) -> bool:
+        raise NotImplementedError
+
+    def load_learning_sets(self) -> Dict:
+        raise NotImplementedError
+
+    def save_learning_sets(self, learning_sets: Dict) -> bool:
+        raise NotImplementedError
+
+    def load_planners(self) -> Dict:
+        raise NotImplementedError
+
+    def save_planners(self, planners: Dict) -> bool:
+        raise NotImplementedError
+
+    def load_document(self, name: str, default=None):
+        raise NotImplementedError
+
+    def save_document(self, name: str, data) -> bool:
+        raise NotImplementedError
+
+    def is_empty(self) -> bool:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SQLiteStorageBackend(StorageBackend):
+    """
+    SQLite-Implementierung des Speicher-Backends.
+
+    Jede Karte, Sitzung, Sitzungsdetail, Planeintrag, jedes Lernset und jeder Planer
+    ist eine eigene Zeile. Einzelne Kartenänderungen sind damit ein UPDATE statt
+    eines kompletten Datei-Neuschreibens, und Filterabfragen laufen über Indizes.
+    """
+    name = 'sqlite'
+
+    def __init__(self, db_path: str):
+        """
+        Öffnet (oder erstellt) die SQLite-Datenbank.
+
+        Args:
+            db_path (str): Pfad zur Datenbankdatei.
+        """
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),)
+            )
+        self._upgrade_schema()
+        self.connection.executescript(PLAN_ENTRIES_SCHEMA)
+        logging.info(f"SQLite-Speicher geöffnet: {db_path}")
+
+    def _upgrade_schema(self):
+        """Bringt eine Datenbank älterer Schema-Versionen auf SCHEMA_VERSION."""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        version = int(row[0]) if row else SCHEMA_VERSION
+        if version >= SCHEMA_VERSION:
+            return
+        logging.info(f"SQLite-Schema wird von Version {version} auf {SCHEMA_VERSION} aktualisiert.")
+        # executescript schließt offene Transaktionen ab, daher BEGIN/COMMIT im Skript
+        self.connection.executescript(f"""
+            BEGIN;
+            ALTER TABLE plan_entries RENAME TO plan_entries_v1;
+            DROP INDEX IF EXISTS idx_plan_entries_date;
+            {PLAN_ENTRIES_SCHEMA}
+            INSERT INTO plan_entries (id, date, position, kategorie_norm, data)
+                SELECT id, date, position, kategorie_norm, data FROM plan_entries_v1 ORDER BY date, position;
+            DROP TABLE plan_entries_v1;
+            UPDATE meta SET value = '{SCHEMA_VERSION}' WHERE key = 'schema_version';
+            COMMIT;
+        """)
+
+    def close(self):
+        with self.lock:
+            try:
+                self.connection.close()
+            except sqlite3.Error as e:
+                logging.error(f"Fehler beim Schließen der SQLite-Datenbank: {e}")
+
+    def is_empty(self) -> bool:
+        """True, wenn noch keine Karten und keine Statistiken gespeichert sind."""
+        with self.lock:
+            cards = self.connection.execute("SELECT COUNT(*) FROM flashcards").fetchone()[0]
+            sessions = self.connection.execute("SELECT COUNT(*) FROM stats_sessions").fetchone()[0]
+            return cards == 0 and sessions == 0
+
+    # -----------------------------------------------------------------------------
+    # FLASHCARDS
+    # ------------------------------------------------------------------------------
+
+    @staticmethod
+    def _card_row(card: Dict, position: int) -> tuple:
+        return (
+            card['id'],
+            position,
+            (card.get('category') or '').lower(),
+            (card.get('subcategory') or '').lower(),
+            _de_date_to_iso(card.get('next_review')),
+            card.get('leitner_next_review_date'),
+            int(card.get('consecutive_correct') or 0),
+            float(card.get('difficulty_rating') if card.get('difficulty_rating') is not None else 3.0),
+            _dumps(card)
+        )
+
+    def load_flashcards(self) -> List[Dict]:
+        with self.lock:
+            rows = self.connection.execute("SELECT data FROM flashcards ORDER BY position").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save_flashcards(self, cards: List[Dict]) -> bool:
+        """Ersetzt alle Karten (Upsert + Löschen nicht mehr vorhandener IDs) in einer Transaktion."""
+        try:
+            with self.lock, self.connection:
+                self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (id TEXT PRIMARY KEY)")
+                self.connection.execute("DELETE FROM keep_ids")
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO keep_ids (id) VALUES (?)",
+                    ((card['id'],) for card in cards)
+                )
+                self.connection.execute("DELETE FROM flashcards WHERE id NOT IN (SELECT id FROM keep_ids)")
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO flashcards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self._card_row(card, position) for position, card in enumerate(cards))
+                )
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"SQLite: Fehler beim Speichern der Flashcards: {e}")
+            return False
+
+    def upsert_flashcards(self, cards: Iterable[Dict]) -> bool:
+        """Aktualisiert bzw. ergänzt einzelne Karten (Position bleibt bei Updates erhalten)."""
+        try:
+            with self.lock, self.connection:
+                next_position = self.connection.execute(
+                    "SELECT COALESCE(MAX(position), -1) + 1 FROM flashcards"
+                ).fetchone()[0]
+                for card in cards:
+                    row = self._card_row(card, next_position)
+                    cursor = self.connection.execute(
+                        "UPDATE flashcards SET category_norm = ?, subcategory_norm = ?, next_review_iso = ?, "
+                        "leitner_next_review_date = ?, consecutive_correct = ?, difficulty_rating = ?, data = ? "
+                        "WHERE id = ?",
+                        row[2:] + (row[0],)
+                    )
+                    if cursor.rowcount == 0:
+                        self.connection.execute(
+                            "INSERT INTO flashcards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+                        )
+                        next_position += 1
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"SQLite: Fehler beim Aktualisieren von Flashcards: {e}")
+            return False
+
+    def delete_flashcards(self, card_ids: Iterable[str]) -> bool:
+        try:
+            with self.lock, self.connection:
+                self.connection.executemany(
+                    "DELETE FROM flashcards WHERE id = ?", ((card_id,) for card_id in card_ids)
+                )
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"SQLite: Fehler beim Löschen von Flashcards: {e}")
+            return False
+
+    def query_flashcard_ids(self, category: Optional[str] = None, subcategory: Optional[str] = None,
+                            due_on_or_before: Optional[datetime.date] = None,
+                            progress: Optional[str] = None,
+                            difficulty_range: Optional[tuple] = None) -> List[str]:
+        """
+        Führt einen Kartenfilter direkt in SQL aus.
+
+        Args:
+            category: Kategorie (case-insensitiv, "alle" = kein Filter)
+            subcategory: Unterkategorie (case-insensitiv, "alle" = kein Filter)
+            due_on_or_before: Nur Karten, deren SRS-Wiederholung bis zu diesem Datum fällig ist
+            progress: "gekonnt" / "nicht gekonnt"
+            difficulty_range: (min, max) der difficulty_rating
+
+        Returns:
+            List[str]: Karten-IDs in Speicherreihenfolge.
+        """
+        clauses = []
+        params = []
+        if category and category.lower() != "alle":
+            clauses.append("category_norm = ?")
+            params.append(category.lower())
+        if subcategory and subcategory.lower() != "alle":
+            clauses.append("subcategory_norm = ?")
+            params.append(subcategory.lower())
+        if due_on_or_before is not None:
+            clauses.append("(next_review_iso IS NULL OR next_review_iso <= ?)")
+            params.append(due_on_or_before.isoformat())
+        if progress:
+            if progress.lower() == "gekonnt":
+                clauses.append("consecutive_correct > 0")
+            elif progress.lower() == "nicht gekonnt":
+                clauses.append("consecutive_correct <= 0")
+        if difficulty_range:
+            clauses.append("difficulty_rating BETWEEN ? AND ?")
+            params.extend(difficulty_range)
+
+        sql = "SELECT id FROM flashcards"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY position"
+        with self.lock:
+            return [row[0] for row in self.connection.execute(sql, params)]
+
+    # -----------------------------------------------------------------------------
+    # STATISTIKEN
+    # ------------------------------------------------------------------------------
+
+    def _insert_session(self, session: Dict):
+        header = {k: v for k, v in session.items() if k != 'details'}
+        cursor = self.connection.execute(
+            "INSERT INTO stats_sessions (date_iso, data) VALUES (?, ?)",
+            (_de_date_to_iso(session.get('date')), _dumps(header))
+        )
+        session_id = cursor.lastrowid
+        details = session.get('details')
+        if isinstance(details, list):
+            self.connection.executemany(
+                "INSERT INTO stats_details VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        session_id,
+                        position,
+                        str(detail.get('category', '')).lower() if isinstance(detail, dict) else '',
+                        str(detail.get('subcategory', '')).lower() if isinstance(detail, dict) else '',
+                        1 if isinstance(detail, dict) and detail.get('correct') else 0,
+                        float(detail.get('learning_time', 0) or 0) if isinstance(detail, dict) else 0.0,
+                        _dumps(detail)
+                    )
+                    for position, detail in enumerate(details)
+                )
+            )
+
+    def load_stats(self) -> List[Dict]:
+        with self.lock:
+            sessions = self.connection.execute(
+                "SELECT id, data FROM stats_sessions ORDER BY id"
+            ).fetchall()
+            detail_rows = self.connection.execute(
+                "SELECT session_id, data FROM stats_details ORDER BY session_id, position"
+            ).fetchall()
+
+        details_by_session: Dict[int, List] = {}
+        for session_id, data in detail_rows:
+            details_by_session.setdefault(session_id, []).append(json.loads(data))
+
+        stats = []
+        for session_id, data in sessions:
+            session = json.loads(data)
+            if session.pop('_has_details', False):
+                session['details'] = details_by_session.get(session_id, [])
+            stats.append(session)
+        return stats
+
+    def save_stats(self, stats: List[Dict]) -> bool:
+        try:
+            with self.lock, self.connection:
+                self.connection.execute("DELETE FROM stats_details")
+                self.connection.execute("DELETE FROM stats_sessions")
+                for session in stats:
+                    if not isinstance(session, dict):
+                        logging.warning(f"SQLite: Ungültiger Statistik-Eintrag übersprungen: {session!r}")
+                        continue
+                    self._insert_session(self._mark_details(session))
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"SQLite: Fehler beim Speichern der Statistiken: {e}")
+            return False
+
+    def append_session(self, session: Dict) -> bool:
+        """Fügt genau eine Sitzung (inkl. Details) hinzu."""
+        try:
+            with self.lock, self.connection:
+                self._insert_session(self._mark_details(session))
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"SQLite: Fehler beim Anhängen einer Sitzung: {e}")
+            return False
+
+    @staticmethod
+    def _mark_details(session: Dict) -> Dict:
+        """Merkt sich, ob die Sitzung ein 'details'-Feld hatte (auch wenn es leer war)."""
+        marked = dict(session)
+        marked['_has_details'] = 'details' in session
+        return marked
+
+    # -----------------------------------------------------------------------------
+    # WOCHENPLAN
+    # ------------------------------------------------------------------------------
+
+    def load_weekly_plan(self) -> Dict:
+        plan: Dict[str, List[Dict]] = {}
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT date, data FROM plan_entries ORDER BY date, position"
+            ).fetchall()
+        for date_str, data in rows:
+            plan.setdefault(date_str, []).append(json.loads(data))
+        return plan
+
+    def save_weekly_plan(self, plan: Dict) -> bool:
+        try:
+            with self.lock, self.connection:
+                self.connection.execute("DELETE FROM plan_entries")
+                self.connection.executemany(
+                    "INSERT INTO plan_entries (id, date, position, kategorie_norm, data) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (
+                            entry.get('id'),
+                            date_str,
+                            position,
+                            str(entry.get('kategorie', '')).lower(),
+                            _dumps(entry)
+                        )
+                        for date_str, entries in plan.items()
+                        for position, entry in enumerate(entries)
+                    )
+                )
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"SQLite: Fehler beim Speichern des Wochenplans: {e}")
+            return False
+
+    # -----------------------------------------------------------------------------
+    # LERNSETS & PLANER
+    # ------------------------------------------------------------------------------
+
+    def _load_keyed_table(self, table: str) -> Dict[str, Dict]:
+        with self.lock:
+            rows = self.connection.execute(f"SELECT id, data FROM {table} ORDER BY rowid").fetchall()
+        return {row_id: json.loads(data) for row_id, data in rows}
+
+    def _save_keyed_table(self, table: str, items: Dict[str, Dict]):
+        self.connection.execute(f"DELETE FROM {table}")
+        self.connection.executemany(
+            f"INSERT INTO {table} (id, data) VALUES (?, ?)",
+            ((item_id, _dumps(item)) for item_id, item in items.items())
+        )
+
+    def load_learning_sets(self) -> Dict:
+        meta = self.load_document(DOCUMENT_LEARNING_SETS_META, {'aktives_set': None})
+        result = dict(meta)
+        result['lernsets'] = self._load_keyed_table('learning_sets')
+        return result
+
+    def save_learning_sets(self, learning_sets: Dict) -> bool:
+        try:
+            with self.lock, self.connection:
+                self._save_keyed_table('learning_sets', learning_sets.get('lernsets', {}))
+                meta = {k: v for k, v in learning_sets.items() if k != 'lernsets'}
+                self._save_document_row(DOCUMENT_LEARNING_SETS_META, meta)
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"SQLite: Fehler beim Speichern der Lernsets: {e}")
+            return False
+
+    def load_planners(self) -> Dict:
+        meta = self.load_document(DOCUMENT_PLANNERS_META, {'active_planner': None})
+        result = dict(meta)
+        result['planners'] = self._load_keyed_table('planners')
+        return result
+
+    def save_planners(self, planners: Dict) -> bool:
+        try:
+            with self.lock, self.connection:
+                self._save_keyed_table('planners', planners.get('planners', {}))
+                meta = {k: v for k, v in planners.items() if k != 'planners'}
+                self._save_document_row(DOCUMENT_PLANNERS_META, meta)
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"SQLite: Fehler beim Speichern der Planer: {e}")
+            return False
+
+    # -----------------------------------------------------------------------------
+    # DOKUMENTE (Kategorien, Algorithmus-Einstellungen, ...)
+    # ------------------------------------------------------------------------------
+
+    def load_document(self, name: str, default=None):
+        with self.lock:
+            row = self.connection.execute("SELECT data FROM documents WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return default
+        return json.loads(row[0])
+
+    def save_document(self, name: str, data) -> bool:
+        try:
+            with self.lock, self.connection:
+                self._save_document_row(name, data)
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"SQLite: Fehler beim Speichern des Dokuments '{name}': {e}")
+            return False
+
+    def _save_document_row(self, name: str, data):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO documents (name, data) VALUES (?, ?)", (name, _dumps(data))
+        )
+
+
+def main(argv: List[str]) -> int:
+    if argv != ['migrate-sqlite']:
+        print("Verwendung: python storage_backend.py migrate-sqlite")
+        return 2
+    # Erst hier importieren: data_manager importiert dieses Modul
+    from data_manager import DataManager
+    data_manager = DataManager()
+    if data_manager.storage is not None:
+        print(f"Es wird bereits eine SQLite-Datenbank verwendet: {data_manager.sqlite_db_file}")
+        return 0
+    if not data_manager.migrate_to_sqlite():
+        print("Migration nach SQLite fehlgeschlagen, Details im Log.")
+        return 1
+    print(f"Daten nach SQLite migriert: {data_manager.sqlite_db_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Prognose der Wiederholungslast für Planer- und Kalenderansichten.
+Der Leitner-Zustand aller Karten (Punkte, Level, Streaks, Recovery, Erfolgsverlauf) wird
+einmal in NumPy-Arrays übernommen und Tag für Tag nach den Regeln von LeitnerCard
+fortgeschrieben: Jede fällige Karte wird an ihrem Fälligkeitstag einmal beantwortet, richtig
+mit der Erfolgswahrscheinlichkeit der Karte. Eine falsch beantwortete Karte ist am nächsten
+Tag wieder fällig. Mit runs > 1 werden mehrere Durchläufe gemittelt.
+"""
+
+import datetime
+import logging
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from day_numbers import day_of, parse_day, to_date, today
+from leitner_system import LEVEL_INTERVALS, LEVEL_PENALTY_FACTORS, LEVEL_POINT_LIMITS
+
+# Erfolgswahrscheinlichkeit für Karten ohne Verlauf und Gewicht dieses Werts (in Antworten)
+DEFAULT_SUCCESS_PROBABILITY = 0.8
+PRIOR_ANSWERS = 2
+
+SUCCESS_HISTORY_SIZE = 10
+
+# Tabellen nach Level (Index 0 unbenutzt) bzw. nach Streak-Grenzen, wie in LeitnerCard
+_INTERVALS = np.array([1] + [LEVEL_INTERVALS[level] for level in range(1, 11)], dtype=np.int64)
+_PENALTY_FACTORS = np.array([1.0] + [LEVEL_PENALTY_FACTORS[level] for level in range(1, 11)])
+_POINT_LIMITS = np.array(LEVEL_POINT_LIMITS, dtype=np.int64)
+_STREAK_BONUS_LIMITS = np.array([5, 10, 15, 20])
+_STREAK_BONUS = np.array([1.0, 1.5, 2.0, 2.5, 3.0])
+_STREAK_LOSS = np.array([1.0, 1.5, 2.0, 3.0, 4.0])
+
+
+def _levels(points: np.ndarray) -> np.ndarray:
+    """Level je Punktestand (LeitnerCard._update_level)."""
+    return np.searchsorted(_POINT_LIMITS, points, side='left') + 1
+
+
+def _success_multiplier(rates: np.ndarray) -> np.ndarray:
+    """Exponentieller Multiplikator je Erfolgsquote in Prozent (LeitnerCard._get_exponential_multiplier)."""
+    low = (rates / 50) ** 2
+    middle = 1.0 + np.clip((rates - 50) / 35, 0, 1) ** 1.5
+    high = 2.0 + np.clip((rates - 85) / 15, 0, 1) ** 1.2
+    return np.where(rates <= 0, 0.0, np.where(rates <= 50, low, np.where(rates <= 85, middle, high)))
+
+
+def _as_int(value, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class WorkloadForecast:
+    """
+    Erwartete Anzahl fälliger Wiederholungen je Tag, gesamt und je Kategorie.
+
+    Attribute: start_day (Epochentag von Tag 0), totals (Array je Tag),
+    categories (Anzeigenamen), by_category (Array Tage × Kategorien)
+    """
+
+    def __init__(self, start_day: int, totals: np.ndarray, categories: List[str], by_category: np.ndarray):
+        self.start_day = start_day
+        self.totals = totals
+        self.categories = categories
+        self.by_category = by_category
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    @property
+    def dates(self) -> List[datetime.date]:
+        return [to_date(self.start_day + offset) for offset in range(len(self.totals))]
+
+    def for_category(self, category: str) -> np.ndarray:
+        """Lastkurve einer Kategorie (Groß-/Kleinschreibung egal); Nullen, wenn unbekannt."""
+        key = category.lower()
+        for index, name in enumerate(self.categories):
+            if name.lower() == key:
+                return self.by_category[:, index]
+        return np.zeros(len(self.totals))
+
+    def on(self, date: Union[datetime.date, datetime.datetime]) -> float:
+        """Erwartete Wiederholungen an einem Datum (0 außerhalb des Zeitraums)."""
+        offset = day_of(date) - self.start_day
+        return float(self.totals[offset]) if 0 <= offset < len(self.totals) else 0.0
+
+    def as_dict(self) -> Dict:
+        """Daten für die Anzeige: ISO-Daten, Summen und Kurven je Kategorie."""
+        return {
+            'dates': [date.isoformat() for date in self.dates],
+            'total': self.totals.tolist(),
+            'categories': {name: self.by_category[:, index].tolist()
+                           for index, name in enumerate(self.categories)},
+        }
+
+
+class WorkloadForecaster:
+    """Leitner-Zustand aller Karten als Arrays; run() simuliert die Last ab start_day."""
+
+    def __init__(self, flashcards: Iterable, start_day: Optional[int] = None):
+        self.start_day = today() if start_day is None else start_day
+
+        category_ids: Dict[str, int] = {}
+        self.categories: List[str] = []
+        rows = []
+        histories = []
+        for card in flashcards:
+            category = getattr(card, 'category', '') or ''
+            key = category.lower()
+            if key not in category_ids:
+                category_ids[key] = len(self.categories)
+                self.categories.append(category)
+            due = parse_day(getattr(card, 'leitner_next_review_date', None))
+            points = max(0, _as_int(getattr(card, 'leitner_points', 0)))
+            rows.append((
+                category_ids[key],
+                0 if due is None else max(0, due - self.start_day),
+                points,
+                _as_int(getattr(card, 'leitner_positive_streak', 0)),
+                _as_int(getattr(card, 'leitner_consecutive_incorrect_sessions', 0)),
+                bool(getattr(card, 'leitner_in_recovery_mode', False)),
+                max(1, _as_int(getattr(card, 'leitner_recovery_interval', 1), 1)),
+            ))
+            history = getattr(card, 'leitner_success_history', None) or []
+            histories.append([bool(answer) for answer in history[-SUCCESS_HISTORY_SIZE:]])
+
+        columns = np.array(rows, dtype=np.int64).reshape(-1, 7)
+        self.category = columns[:, 0]
+        self.due = columns[:, 1]
+        self.points = columns[:, 2]
+        self.streak = columns[:, 3]
+        self.incorrect_sessions = columns[:, 4]
+        self.in_recovery = columns[:, 5].astype(bool)
+        self.recovery_interval = columns[:, 6]
+
+        # Erfolgsverlauf als Ringpuffer: Quote = Summe / Länge, die Reihenfolge spielt keine Rolle
+        self.history = np.zeros((len(rows), SUCCESS_HISTORY_SIZE), dtype=bool)
+        self.history_length = np.array([len(history) for history in histories], dtype=np.int64)
+        for index, history in enumerate(histories):
+            self.history[index, :len(history)] = history
+
+        successes = self.history.sum(axis=1)
+        self.success_probability = ((successes + PRIOR_ANSWERS * DEFAULT_SUCCESS_PROBABILITY)
+                                    / (self.history_length + PRIOR_ANSWERS))
+
+    def __len__(self) -> int:
+        return len(self.due)
+
+    def run(self, days: int = 30, runs: int = 1,
+            success_probability: Optional[Union[float, np.ndarray]] = None,
+            seed: Optional[int] = 0) -> WorkloadForecast:
+        """
+        Simuliert die Wiederholungen der nächsten Tage.
+
+        Args:
+            days (int): Anzahl Tage ab start_day.
+            runs (int): Anzahl gemittelter Durchläufe.
+            success_probability (Optional[Union[float, np.ndarray]]): Erfolgswahrscheinlichkeit für alle
+                bzw. je Karte; None nimmt die Quote aus dem Erfolgsverlauf der Karte.
+            seed (Optional[int]): Startwert des Zufallsgenerators (None: zufällig).
+        """
+        cards = len(self)
+        totals = np.zeros(days)
+        by_category = np.zeros((days, len(self.categories)))
+        if not cards or days <= 0 or runs <= 0:
+            return WorkloadForecast(self.start_day, totals, self.categories, by_category)
+
+        if success_probability is None:
+            probability = self.success_probability
+        else:
+            probability = np.broadcast_to(np.asarray(success_probability, dtype=float), (cards,))
+        rng = np.random.default_rng(seed)
+
+        # Alle Durchläufe nebeneinander: Zustand i gehört zu Karte i % cards
+        points = np.tile(self.points, runs)
+        streak = np.tile(self.streak, runs)
+        incorrect_sessions = np.tile(self.incorrect_sessions, runs)
+        in_recovery = np.tile(self.in_recovery, runs)
+        recovery_interval = np.tile(self.recovery_interval, runs)
+        history = np.tile(self.history, (runs, 1))
+        history_length = np.tile(self.history_length, runs)
+        history_position = history_length % SUCCESS_HISTORY_SIZE
+
+        # Je Tag die Indizes der dann fälligen Zustände
+        pending: List[List[np.ndarray]] = [[] for _ in range(days)]
+        self._schedule(pending, np.arange(cards * runs), np.tile(self.due, runs))
+
+        for day in range(days):
+            if not pending[day]:
+                continue
+            states = np.concatenate(pending[day]) if len(pending[day]) > 1 else pending[day][0]
+            pending[day] = []
+            card = states % cards
+            totals[day] = len(states)
+            by_category[day] = np.bincount(self.category[card], minlength=len(self.categories))
+
+            correct = rng.random(len(states)) < probability[card]
+
+            # Erfolgsverlauf
+            history[states, history_position[states]] = correct
+            history_position[states] = (history_position[states] + 1) % SUCCESS_HISTORY_SIZE
+            history_length[states] = np.minimum(history_length[states] + 1, SUCCESS_HISTORY_SIZE)
+
+            # Richtig: Punkte nach Streak, Erfolgsquote und Streak-Bonus, Intervall nach Level/Recovery
+            right = states[correct]
+            streak[right] += 1
+            incorrect_sessions[right] = 0
+            rates = history[right].sum(axis=1) / history_length[right] * 100
+            bonus = _STREAK_BONUS[np.searchsorted(_STREAK_BONUS_LIMITS, streak[right], side='right')]
+            gained = np.floor(streak[right] * _success_multiplier(rates) * bonus).astype(np.int64)
+            points[right] += np.maximum(1, gained)
+            level_interval = _INTERVALS[_levels(points[right])]
+            recovering = in_recovery[right]
+            grown = np.minimum(recovery_interval[right] * 2, level_interval)
+            recovery_interval[right] = np.where(recovering, grown, recovery_interval[right])
+            in_recovery[right] = recovering & (grown < level_interval)
+            interval = np.where(recovering, grown, level_interval)
+
+            # Falsch: Abzug nach Sitzungszähler, Level und verlorenem Streak, morgen wieder fällig
+            wrong = states[~correct]
+            incorrect_sessions[wrong] += 1
+            loss = _STREAK_LOSS[np.searchsorted(_STREAK_BONUS_LIMITS, streak[wrong], side='right')]
+            penalty = np.floor(incorrect_sessions[wrong] * _PENALTY_FACTORS[_levels(points[wrong])] * loss)
+            points[wrong] = np.maximum(0, points[wrong] - penalty.astype(np.int64))
+            streak[wrong] = 0
+            in_recovery[wrong] = True
+            recovery_interval[wrong] = 1
+
+            self._schedule(pending, right, day + interval)
+            self._schedule(pending, wrong, np.full(len(wrong), day + 1))
+
+        return WorkloadForecast(self.start_day, totals / runs, self.categories, by_category / runs)
+
+    @staticmethod
+    def _schedule(pending: List[List[np.ndarray]], states: np.ndarray, due: np.ndarray):
+        """Ordnet Zustände ihren Fälligkeitstagen zu; Termine nach dem Zeitraum entfallen."""
+        inside = due < len(pending)
+        states, due = states[inside], due[inside]
+        if not len(states):
+            return
+        order = np.argsort(due, kind='stable')
+        states, due = states[order], due[order]
+        days, starts = np.unique(due, return_index=True)
+        for day, start, stop in zip(days, starts, np.append(starts[1:], len(due))):
+            pending[day].append(states[start:stop])
+
+
+def forecast_workload(data_manager, days: int = 30, runs: int = 1,
+                      success_probability: Optional[float] = None, seed: Optional[int] = 0) -> WorkloadForecast:
+    """
+    Lastprognose über alle Karten ab heute (zwischengespeichert, solange sich die Karten nicht ändern).
+
+    Args:
+        data_manager: Der DataManager mit den Karten.
+        days (int): Anzahl Tage ab heute.
+        runs (int): Anzahl gemittelter Durchläufe.
+        success_probability (Optional[float]): Einheitliche Erfolgswahrscheinlichkeit; None nimmt die Quote je Karte.
+        seed (Optional[int]): Startwert des Zufallsgenerators.
+    """
+    start_day = today()
+
+    def compute() -> WorkloadForecast:
+        forecaster = WorkloadForecaster(data_manager.flashcards, start_day)
+        forecast = forecaster.run(days, runs, success_probability, seed)
+        logging.debug(f"Lastprognose für {len(forecaster)} Karten über {days} Tage ({runs} Durchläufe) berechnet.")
+        return forecast
+
+    return data_manager.memoize('workload_forecast', (start_day, days, runs, success_probability, seed),
+                                ('flashcards',), compute)